@@ -0,0 +1,894 @@
+"""
+💾 SNAPSHOT COLONNAIRE - Cache binaire pour load_data
+
+Features:
+- Un fichier binaire brut par colonne (mappable en mémoire via numpy)
+- Petit fichier schema.json (dtypes, catégories, empreinte de la source)
+- Empreinte du contenu (taille, date, hash de blocs échantillonnés)
+- Reconstruction automatique quand le CSV source change
+- Écriture atomique (répertoire temporaire puis renommage)
+- ColumnStore: colonnes memory-mappées, chargées à la première lecture
+- Fusion de fichiers delta par CustomerID dans une nouvelle génération du
+  snapshot (jamais de modification en place d'une génération publiée)
+- Échecs de conversion comptés au parsing conservés dans le schéma,
+  cumulés à chaque delta fusionné
+- Jeton par groupe de colonnes (columns_token): un cache qui ne lit que
+  des colonnes non modifiées par un delta garde sa version
+- Artefacts dérivés (agrégats, cube, profil) persistés à côté du snapshot
+  sous le jeton de leur version: écriture atomique, relecture validée
+
+Author: EthicalDataBoost
+Date: 2026-10-17
+Version: 1.0
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# ========================================
+# CONSTANTES
+# ========================================
+
+# À incrémenter aussi quand le contenu préparé change (colonnes projetées...):
+# snapshots, partitions et caches dérivés sont alors reconstruits
+SNAPSHOT_FORMAT_VERSION = 4
+SCHEMA_FILENAME = 'schema.json'
+SNAPSHOT_ROOT_DIRNAME = '.telco_snapshot'
+
+# Au-delà de ce ratio valeurs distinctes / lignes, une colonne texte est
+# stockée en largeur fixe plutôt qu'en dictionnaire (ex: CustomerID)
+DICTIONARY_MAX_RATIO = 0.5
+
+# Empreinte du contenu: quelques blocs répartis sur le fichier (début et fin inclus)
+FINGERPRINT_SAMPLES = 8
+FINGERPRINT_BLOCK_SIZE = 4096
+
+# Journal des deltas fusionnés, à côté du snapshot (survit à une reconstruction)
+DELTA_LOG_SUFFIX = '.deltas.json'
+
+# Compteurs de conversion posés par build_fn dans DataFrame.attrs
+# ({colonne: {'nulls': n, 'failures': n}}): persistés dans le schéma,
+# additionnés à chaque delta fusionné, restitués par ColumnStore.to_frame
+COERCION_ATTR = 'coercion'
+
+
+class DeltaReplayError(RuntimeError):
+    """Deltas du journal impossibles à rejouer: données fusionnées indisponibles"""
+
+
+# ========================================
+# EMPREINTE DE LA SOURCE
+# ========================================
+
+def _sampled_hash(path: str, size: int) -> str:
+    """Hash de quelques blocs répartis régulièrement (fichier entier s'il est petit)"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        if size <= FINGERPRINT_SAMPLES * FINGERPRINT_BLOCK_SIZE:
+            digest.update(f.read())
+        else:
+            for i in range(FINGERPRINT_SAMPLES):
+                f.seek((size - FINGERPRINT_BLOCK_SIZE) * i // (FINGERPRINT_SAMPLES - 1))
+                digest.update(f.read(FINGERPRINT_BLOCK_SIZE))
+    return digest.hexdigest()
+
+
+def source_fingerprint(path: str) -> Dict:
+    """
+    Empreinte bon marché du fichier source
+
+    Taille + date de modification + hash d'un échantillon de blocs: lit
+    au plus FINGERPRINT_SAMPLES * FINGERPRINT_BLOCK_SIZE octets, et détecte
+    aussi un fichier remplacé en conservant sa date de modification.
+    """
+    stat = os.stat(path)
+    return {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sample_hash': _sampled_hash(path, stat.st_size)
+    }
+
+
+def default_snapshot_dir(csv_path: str) -> str:
+    """Répertoire du snapshot associé à un CSV (à côté du fichier source)"""
+    csv_path = os.path.abspath(csv_path)
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(os.path.dirname(csv_path), SNAPSHOT_ROOT_DIRNAME, stem)
+
+
+# ========================================
+# ENCODAGE DES COLONNES
+# ========================================
+
+def _to_json_list(values) -> List:
+    """Convertir des catégories numpy/pandas en liste JSON-sérialisable"""
+    return [v.item() if isinstance(v, np.generic) else v for v in values]
+
+
+def _encode_column(series: pd.Series, file_prefix: str, out_dir: str) -> Dict:
+    """Écrire une colonne sur disque et retourner son entrée de schéma"""
+    entry = {'name': series.name}
+    data_file = f'{file_prefix}.bin'
+
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = np.ascontiguousarray(series.cat.codes.to_numpy())
+        entry.update({
+            'kind': 'category',
+            'dtype': codes.dtype.str,
+            'categories': _to_json_list(series.cat.categories),
+            'ordered': bool(series.cat.ordered)
+        })
+        codes.tofile(os.path.join(out_dir, data_file))
+
+    elif series.dtype.kind in 'biuf':
+        values = np.ascontiguousarray(series.to_numpy())
+        entry.update({'kind': 'numeric', 'dtype': values.dtype.str})
+        values.tofile(os.path.join(out_dir, data_file))
+
+    elif series.dtype == object and pd.api.types.infer_dtype(series, skipna=True) in ('string', 'empty'):
+        n_unique = series.nunique(dropna=True)
+
+        if n_unique <= max(1, int(len(series) * DICTIONARY_MAX_RATIO)):
+            # Texte à faible cardinalité: codes entiers + dictionnaire
+            codes, uniques = pd.factorize(series, sort=True)
+            codes = codes.astype(_smallest_code_dtype(len(uniques)))
+            entry.update({
+                'kind': 'dictionary',
+                'dtype': codes.dtype.str,
+                'categories': _to_json_list(uniques)
+            })
+            codes.tofile(os.path.join(out_dir, data_file))
+        else:
+            # Texte à forte cardinalité: unicode largeur fixe + masque des nuls
+            mask = series.isna().to_numpy()
+            values = series.fillna('').to_numpy(dtype=str)
+            entry.update({'kind': 'fixed', 'dtype': values.dtype.str})
+            values.tofile(os.path.join(out_dir, data_file))
+            if mask.any():
+                mask_file = f'{file_prefix}.mask.bin'
+                mask.tofile(os.path.join(out_dir, mask_file))
+                entry['mask_file'] = mask_file
+
+    else:
+        raise TypeError(f"Colonne '{series.name}' non supportée par le snapshot ({series.dtype})")
+
+    entry['file'] = data_file
+    return entry
+
+
+def _smallest_code_dtype(n_categories: int) -> np.dtype:
+    """Plus petit entier signé capable de stocker les codes (-1 = manquant)"""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def _map_array(path: str, dtype: np.dtype, n_rows: int, mmap: bool = True) -> np.ndarray:
+    """
+    Mapper un fichier binaire en lecture seule (aucune page lue d'avance)
+
+    Avec mmap=False le fichier est lu en mémoire: utile quand les colonnes
+    seront de toute façon copiées (concaténation de nombreuses partitions),
+    chaque mapping gardant un descripteur de fichier ouvert.
+    """
+    expected = n_rows * dtype.itemsize
+    actual = os.path.getsize(path)
+    if actual != expected:
+        raise ValueError(f"Fichier tronqué: {path} ({actual} != {expected} octets)")
+    if n_rows == 0:
+        return np.empty(0, dtype=dtype)
+    if not mmap:
+        return np.fromfile(path, dtype=dtype, count=n_rows)
+    # Vue ndarray simple: pandas ne voit pas la sous-classe memmap, mais
+    # le mapping reste vivant tant que la vue est référencée
+    return np.memmap(path, dtype=dtype, mode='r', shape=(n_rows,)).view(np.ndarray)
+
+
+def _decode_column(entry: Dict, snapshot_dir: str, n_rows: int, mmap: bool = True,
+                   positions: Optional[np.ndarray] = None) -> pd.Series:
+    """
+    Reconstruire une colonne au-dessus de son fichier memory-mappé
+
+    Les colonnes numériques et les codes catégoriels restent adossés au
+    fichier: le système ne charge les pages qu'au premier accès. Les textes
+    à faible cardinalité sont exposés en `category` (codes mappés + dictionnaire).
+
+    Avec positions, seules ces lignes sont lues et décodées (copie).
+    """
+    path = os.path.join(snapshot_dir, entry['file'])
+    values = _map_array(path, np.dtype(entry['dtype']), n_rows, mmap)
+    if positions is not None:
+        values = values[positions]
+
+    kind = entry['kind']
+    if kind == 'numeric':
+        return pd.Series(values, name=entry['name'], copy=False)
+
+    if kind in ('category', 'dictionary'):
+        categorical = pd.Categorical.from_codes(
+            values,
+            categories=entry['categories'],
+            ordered=entry.get('ordered', False),
+            validate=False
+        )
+        return pd.Series(categorical, name=entry['name'], copy=False)
+
+    if kind == 'fixed':
+        # Identifiants uniques: pas de gain à rester mappé, décodage en objets
+        decoded = values.astype(object)
+        if 'mask_file' in entry:
+            mask = _map_array(os.path.join(snapshot_dir, entry['mask_file']), np.dtype(bool), n_rows, mmap)
+            decoded[mask if positions is None else mask[positions]] = np.nan
+        return pd.Series(decoded, name=entry['name'])
+
+    raise ValueError(f"Type de colonne inconnu: {kind}")
+
+
+# ========================================
+# COLUMN STORE (LECTURE PARESSEUSE)
+# ========================================
+
+class ColumnStore:
+    """Accès colonne par colonne à un snapshot, via memory-mapping"""
+
+    def __init__(self, snapshot_dir: str, schema: Optional[Dict] = None, mmap: bool = True):
+        self.snapshot_dir = snapshot_dir
+        self.mmap = mmap
+        self.schema = schema or read_schema(snapshot_dir)
+        if self.schema is None:
+            raise ValueError(f"Snapshot invalide: {snapshot_dir}")
+
+        self.n_rows = self.schema['n_rows']
+        self._entries = {entry['name']: entry for entry in self.schema['columns']}
+        self._series: Dict[str, pd.Series] = {}
+
+    @property
+    def columns(self) -> List[str]:
+        """Noms des colonnes dans l'ordre du snapshot"""
+        return [entry['name'] for entry in self.schema['columns']]
+
+    def column(self, name: str) -> pd.Series:
+        """Colonne adossée au fichier (mappée à la première demande)"""
+        if name not in self._series:
+            if name not in self._entries:
+                raise KeyError(name)
+            self._series[name] = _decode_column(self._entries[name], self.snapshot_dir,
+                                                self.n_rows, self.mmap)
+        return self._series[name]
+
+    def take(self, positions: np.ndarray, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Quelques lignes du snapshot, sans décoder les colonnes entières
+
+        Args:
+            positions: Positions des lignes à lire
+            columns: Sous-ensemble de colonnes (défaut: toutes)
+
+        Returns:
+            DataFrame des lignes demandées (index 0..len(positions)-1)
+        """
+        columns = self.columns if columns is None else columns
+        positions = np.asarray(positions, dtype=np.int64)
+        data = {name: _decode_column(self._entries[name], self.snapshot_dir, self.n_rows,
+                                     self.mmap, positions)
+                for name in columns}
+        return pd.DataFrame(data, index=pd.RangeIndex(len(positions)))
+
+    def to_frame(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        DataFrame sans copie au-dessus des fichiers mappés
+
+        Args:
+            columns: Sous-ensemble de colonnes (défaut: toutes)
+
+        Returns:
+            DataFrame dont les colonnes partagent la mémoire du snapshot
+        """
+        columns = self.columns if columns is None else columns
+        data = {name: self.column(name) for name in columns}
+        # copy=False: pas de consolidation en blocs, chaque colonne reste mappée
+        df = pd.DataFrame(data, index=pd.RangeIndex(self.n_rows), copy=False)
+        df.attrs[COERCION_ATTR] = _add_counts({}, self.schema.get(COERCION_ATTR, {}))
+        return df
+
+
+# ========================================
+# LECTURE / ÉCRITURE DU SNAPSHOT
+# ========================================
+
+def read_schema(snapshot_dir: str) -> Optional[Dict]:
+    """Lire le schéma d'un snapshot (None si absent ou illisible)"""
+    try:
+        with open(os.path.join(snapshot_dir, SCHEMA_FILENAME), encoding='utf-8') as f:
+            schema = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if schema.get('format_version') != SNAPSHOT_FORMAT_VERSION:
+        return None
+    return schema
+
+
+def write_snapshot(df: pd.DataFrame, snapshot_dir: str, fingerprint: Dict,
+                   prepare: Optional[Callable[[str], None]] = None) -> None:
+    """
+    Écrire un DataFrame en snapshot colonnaire
+
+    Args:
+        df: DataFrame préparé (sortie de load_data)
+        snapshot_dir: Répertoire cible (remplacé atomiquement)
+        fingerprint: Empreinte du fichier source
+        prepare: Étape appliquée à la génération avant sa publication
+            (rejeu des deltas); une exception annule la publication
+    """
+    parent = os.path.dirname(os.path.abspath(snapshot_dir))
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix='.tmp-', dir=parent)
+
+    try:
+        columns = [
+            _encode_column(df[col], f'col_{i:03d}', tmp_dir)
+            for i, col in enumerate(df.columns)
+        ]
+        schema = {
+            'format_version': SNAPSHOT_FORMAT_VERSION,
+            'source': fingerprint,
+            'n_rows': len(df),
+            'columns': columns,
+            COERCION_ATTR: _add_counts({}, df.attrs.get(COERCION_ATTR, {}))
+        }
+        with open(os.path.join(tmp_dir, SCHEMA_FILENAME), 'w', encoding='utf-8') as f:
+            json.dump(schema, f, ensure_ascii=False)
+
+        if prepare is not None:
+            prepare(tmp_dir)
+        _swap_directory(tmp_dir, snapshot_dir)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+
+def _add_counts(total: Dict, counts: Dict) -> Dict:
+    """Additionner des compteurs par colonne ({colonne: {nom: n}}) dans total"""
+    for column, values in counts.items():
+        target = total.setdefault(column, {})
+        for name, count in values.items():
+            target[name] = target.get(name, 0) + int(count)
+    return total
+
+
+def _swap_directory(new_dir: str, target_dir: str) -> None:
+    """Remplacer target_dir par new_dir (l'ancien est supprimé après bascule)"""
+    old_dir = None
+    if os.path.exists(target_dir):
+        old_dir = tempfile.mkdtemp(prefix='.old-', dir=os.path.dirname(target_dir))
+        os.rmdir(old_dir)
+        os.rename(target_dir, old_dir)
+    os.rename(new_dir, target_dir)
+    if old_dir:
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+
+def read_snapshot(snapshot_dir: str, schema: Optional[Dict] = None,
+                  mmap: bool = True) -> pd.DataFrame:
+    """Reconstruire le DataFrame complet (memory-mappé) depuis un snapshot"""
+    return ColumnStore(snapshot_dir, schema, mmap).to_frame()
+
+
+def load_or_build(csv_path: str, build_fn: Callable[[str], pd.DataFrame],
+                  snapshot_dir: Optional[str] = None) -> pd.DataFrame:
+    """
+    Charger le dataset depuis le snapshot s'il est à jour, sinon le reconstruire
+
+    Args:
+        csv_path: Fichier CSV source
+        build_fn: Fonction de parsing complet (appelée seulement si nécessaire)
+        snapshot_dir: Répertoire du snapshot (défaut: à côté du CSV)
+
+    Returns:
+        DataFrame préparé
+
+    Raises:
+        DeltaReplayError: Deltas fusionnés impossibles à rejouer (le
+            snapshot publié n'est pas touché, l'erreur est journalisée)
+    """
+    snapshot_dir = snapshot_dir or default_snapshot_dir(csv_path)
+    fingerprint = source_fingerprint(csv_path)
+
+    schema = read_schema(snapshot_dir)
+    if schema is not None and schema.get('source') == fingerprint:
+        try:
+            return read_snapshot(snapshot_dir, schema)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Snapshot illisible, reconstruction: %s", e)
+
+    df = build_fn(csv_path)
+
+    try:
+        # Deltas rejoués avant publication: jamais de génération sans eux
+        write_snapshot(df, snapshot_dir, fingerprint,
+                       lambda generation_dir: _replay_deltas(snapshot_dir, generation_dir,
+                                                             fingerprint, build_fn))
+        # Relire le snapshot: mêmes dtypes qu'aux démarrages suivants, et la
+        # version parsée (entièrement en RAM) peut être libérée
+        return read_snapshot(snapshot_dir)
+    except (OSError, TypeError, ValueError) as e:
+        if _pending_deltas(snapshot_dir, fingerprint):
+            # Le CSV seul ne contient pas les deltas fusionnés: ne pas le
+            # servir pour la version annoncée par snapshot_token
+            logger.error("Snapshot avec deltas impossible à écrire: %s", e)
+            raise DeltaReplayError(f"Snapshot avec deltas impossible à écrire ({e})") from e
+        # Le snapshot est une optimisation: on sert quand même les données parsées
+        logger.warning("Écriture du snapshot impossible: %s", e)
+
+    return df
+
+
+# ========================================
+# FUSION DE DELTAS (INGESTION INCRÉMENTALE)
+# ========================================
+
+def delta_log_path(snapshot_dir: str) -> str:
+    """Chemin du journal des deltas d'un snapshot"""
+    return os.path.normpath(snapshot_dir) + DELTA_LOG_SUFFIX
+
+
+def read_delta_log(snapshot_dir: str) -> Dict:
+    """Lire le journal des deltas (vide si absent)"""
+    try:
+        with open(delta_log_path(snapshot_dir), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'source': None, 'deltas': []}
+
+
+def _write_json_atomic(path: str, data: Dict) -> None:
+    """Écrire un fichier JSON via un fichier temporaire puis renommage"""
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def _encode_values(entry: Dict, series: pd.Series) -> Tuple[np.ndarray, Optional[np.ndarray], Dict]:
+    """
+    Encoder des valeurs delta dans le format stocké d'une colonne
+
+    Returns:
+        (valeurs au dtype du fichier, masque des nuls ou None, champs de
+        schéma modifiés). ValueError si les valeurs ne tiennent pas dans le
+        format existant (une reconstruction complète est alors nécessaire).
+    """
+    kind = entry['kind']
+    dtype = np.dtype(entry['dtype'])
+
+    if kind == 'numeric':
+        if dtype.kind in 'biu' and series.isna().any():
+            raise ValueError(f"Valeurs manquantes dans la colonne entière '{entry['name']}'")
+        raw = series.to_numpy()
+        values = raw.astype(dtype)
+        if not np.array_equal(values.astype('float64'), raw.astype('float64'), equal_nan=True):
+            raise ValueError(f"Valeurs hors du type {dtype} pour '{entry['name']}'")
+        return values, None, {}
+
+    if kind in ('category', 'dictionary'):
+        categories = list(entry['categories'])
+        raw = series.astype(object)
+        known = set(categories)
+        new = [v for v in pd.unique(raw.dropna()) if v not in known]
+        if new and entry.get('ordered', False):
+            raise ValueError(f"Nouvelle modalité dans la colonne ordonnée '{entry['name']}'")
+        categories += _to_json_list(new)
+        if len(categories) >= np.iinfo(dtype).max:
+            raise ValueError(f"Trop de modalités pour '{entry['name']}'")
+        codes = pd.Categorical(raw, categories=categories).codes.astype(dtype)
+        return codes, None, ({'categories': categories} if new else {})
+
+    if kind == 'fixed':
+        mask = series.isna().to_numpy()
+        text = series.fillna('').astype(str).to_numpy()
+        width = dtype.itemsize // np.dtype('<U1').itemsize
+        if len(text) and max(len(v) for v in text) > width:
+            raise ValueError(f"Texte trop long pour la colonne '{entry['name']}'")
+        return text.astype(dtype), (mask if mask.any() else None), {}
+
+    raise ValueError(f"Type de colonne inconnu: {kind}")
+
+
+def _derive_file(source: Optional[str], target: str, dtype: np.dtype, n_rows: int,
+                 positions: np.ndarray, updates: np.ndarray, appended: np.ndarray) -> None:
+    """
+    Fichier d'une colonne dans la nouvelle génération du snapshot
+
+    Colonne inchangée: lien physique vers le fichier publié (copie si le
+    système de fichiers ne le permet pas). Sinon copie, réécriture de
+    quelques lignes puis ajout des nouvelles en fin de fichier: le fichier
+    publié n'est jamais modifié.
+
+    Args:
+        source: Fichier de la génération publiée (None: colonne de zéros)
+        target: Fichier de la nouvelle génération
+    """
+    if source is None:
+        np.zeros(n_rows, dtype=dtype).tofile(target)
+    elif not len(positions) and not len(appended):
+        try:
+            os.link(source, target)
+        except OSError:
+            shutil.copyfile(source, target)
+        return
+    else:
+        shutil.copyfile(source, target)
+
+    if len(positions):
+        patched = np.memmap(target, dtype=dtype, mode='r+', shape=(n_rows,))
+        patched[positions] = updates
+        patched.flush()
+        del patched
+    if len(appended):
+        with open(target, 'ab') as f:
+            np.ascontiguousarray(appended).tofile(f)
+
+
+def apply_delta(snapshot_dir: str, delta: pd.DataFrame, key: str = 'CustomerID',
+                previous_columns: Optional[List[str]] = None) -> Dict:
+    """
+    Fusionner un delta normalisé dans le snapshot, par clé client
+
+    Le delta est écrit dans une nouvelle génération du snapshot, publiée
+    par renommage atomique: les colonnes inchangées y sont des liens
+    physiques, les autres des copies où les clients connus sont réécrits et
+    les nouveaux ajoutés en fin de fichier. La génération publiée n'est
+    jamais modifiée: un DataFrame déjà chargé reste lisible et inchangé.
+
+    Args:
+        snapshot_dir: Répertoire du snapshot
+        delta: Lignes nouvelles ou modifiées, déjà normalisées
+        key: Colonne identifiant un client
+        previous_columns: Colonnes des lignes remplacées à renvoyer (mise
+            à jour incrémentale des agrégats; absentes du snapshot ignorées)
+
+    Returns:
+        Résumé: lignes mises à jour, insérées, colonnes modifiées, échecs
+        de conversion du delta ('coercion', ajoutés à ceux du schéma); avec
+        previous_columns, aussi 'previous_rows' (lignes remplacées, avant
+        fusion) et 'delta_rows' (lignes fusionnées, sans doublon de clé)
+    """
+    schema = read_schema(snapshot_dir)
+    if schema is None:
+        raise ValueError(f"Snapshot invalide: {snapshot_dir}")
+
+    store = ColumnStore(snapshot_dir, schema)
+    missing = [col for col in store.columns if col not in delta.columns]
+    if missing:
+        raise ValueError(f"Colonnes absentes du delta: {missing}")
+
+    coercion = delta.attrs.get(COERCION_ATTR, {})
+    delta = delta.drop_duplicates(subset=key, keep='last')
+    keys = pd.Index(store.column(key))
+    if not keys.is_unique:
+        raise ValueError(f"Clé '{key}' non unique dans le snapshot")
+
+    positions = keys.get_indexer(delta[key])
+    is_update = positions >= 0
+    positions = positions[is_update]
+    n_rows = store.n_rows
+    n_inserted = int((~is_update).sum())
+
+    previous = None
+    if previous_columns is not None:
+        # Lues avant toute écriture: état des clients remplacés
+        previous_columns = [col for col in previous_columns if col in store.columns]
+        previous = store.take(positions, previous_columns)
+
+    # 1) Tout encoder avant d'écrire: un delta incompatible ne touche à rien
+    plans = []
+    for entry in schema['columns']:
+        values, mask, changes = _encode_values(entry, delta[entry['name']])
+        dtype = np.dtype(entry['dtype'])
+        data_path = os.path.join(snapshot_dir, entry['file'])
+        current = _map_array(data_path, dtype, n_rows)[positions]
+        changed = not np.array_equal(current, values[is_update])
+
+        mask_file = entry.get('mask_file')
+        if mask_file:
+            current_mask = _map_array(os.path.join(snapshot_dir, mask_file), np.dtype(bool), n_rows)
+            new_mask = mask if mask is not None else np.zeros(len(values), dtype=bool)
+            changed = changed or not np.array_equal(current_mask[positions], new_mask[is_update])
+        elif mask is not None:
+            mask_file = f"{os.path.splitext(entry['file'])[0]}.mask.bin"
+            changed = changed or bool(mask[is_update].any())
+        plans.append((entry, values, mask, mask_file, changes, changed))
+
+    # 2) Nouvelle génération à côté du snapshot publié: les DataFrame déjà
+    #    chargés gardent leurs fichiers mappés, jamais modifiés sur place
+    parent = os.path.dirname(os.path.abspath(snapshot_dir))
+    generation_dir = tempfile.mkdtemp(prefix='.tmp-', dir=parent)
+
+    try:
+        changed_columns = []
+        for entry, values, mask, mask_file, changes, changed in plans:
+            dtype = np.dtype(entry['dtype'])
+            updated = positions if changed else positions[:0]
+            _derive_file(os.path.join(snapshot_dir, entry['file']),
+                         os.path.join(generation_dir, entry['file']), dtype, n_rows,
+                         updated, values[is_update], values[~is_update])
+
+            if mask_file:
+                source = (os.path.join(snapshot_dir, mask_file) if 'mask_file' in entry else None)
+                entry['mask_file'] = mask_file
+                mask = mask if mask is not None else np.zeros(len(values), dtype=bool)
+                _derive_file(source, os.path.join(generation_dir, mask_file), np.dtype(bool), n_rows,
+                             updated, mask[is_update], mask[~is_update])
+
+            entry.update(changes)
+            if changed:
+                changed_columns.append(entry['name'])
+
+        schema['n_rows'] = n_rows + n_inserted
+        # Comptés par extrait chargé: un client mis à jour compte dans
+        # chaque extrait où sa valeur n'était pas convertible
+        schema[COERCION_ATTR] = _add_counts(schema.get(COERCION_ATTR, {}), coercion)
+        _write_json_atomic(os.path.join(generation_dir, SCHEMA_FILENAME), schema)
+
+        # 3) Publication atomique (renommage), l'ancienne génération est retirée
+        _swap_directory(generation_dir, snapshot_dir)
+    except Exception:
+        shutil.rmtree(generation_dir, ignore_errors=True)
+        raise
+
+    summary = {
+        'updated': int(is_update.sum()),
+        'inserted': n_inserted,
+        'changed_columns': changed_columns,
+        'coercion': coercion
+    }
+    if previous is not None:
+        summary['previous_rows'] = previous
+        summary['delta_rows'] = delta[previous_columns].reset_index(drop=True)
+    return summary
+
+
+def _replay_deltas(snapshot_dir: str, generation_dir: str, fingerprint: Dict,
+                   build_fn: Callable[[str], pd.DataFrame]) -> None:
+    """
+    Rejouer le journal des deltas dans une génération en cours de construction
+
+    Un journal établi sur une autre version du CSV est périmé (nouvel
+    extrait complet): il est supprimé.
+
+    Args:
+        snapshot_dir: Snapshot publié (emplacement du journal)
+        generation_dir: Génération reconstruite, pas encore publiée
+
+    Raises:
+        DeltaReplayError: Delta illisible ou incompatible (la génération
+            n'est pas publiée, la génération précédente reste en place)
+    """
+    log = read_delta_log(snapshot_dir)
+    if not log['deltas']:
+        return
+
+    if log.get('source') != fingerprint:
+        os.remove(delta_log_path(snapshot_dir))
+        return
+
+    for record in log['deltas']:
+        try:
+            apply_delta(generation_dir, build_fn(record['path']), record.get('key', 'CustomerID'))
+        except Exception as e:
+            logger.error("Rejeu du delta %s impossible: %s", record['path'], e)
+            raise DeltaReplayError(
+                f"Delta {record['path']} non rejouable: les données fusionnées ne "
+                f"peuvent pas être reconstruites ({e})"
+            ) from e
+
+
+def _pending_deltas(snapshot_dir: str, fingerprint: Dict) -> List[Dict]:
+    """Deltas du journal qui s'appliquent à cette version du CSV"""
+    log = read_delta_log(snapshot_dir)
+    return log['deltas'] if log.get('source') == fingerprint else []
+
+
+def snapshot_token(csv_path: str, snapshot_dir: Optional[str] = None) -> str:
+    """
+    Jeton bon marché de l'état des données, clé des caches du dashboard
+
+    Version du format + empreinte du CSV source + deltas fusionnés: change
+    exactement quand les données changent, qu'un snapshot existe déjà ou non.
+    """
+    snapshot_dir = snapshot_dir or default_snapshot_dir(csv_path)
+    deltas = [record['fingerprint'] for record in read_delta_log(snapshot_dir)['deltas']]
+    return json.dumps([SNAPSHOT_FORMAT_VERSION, source_fingerprint(csv_path), deltas],
+                      sort_keys=True)
+
+
+def _delta_changes(records: Optional[List[Dict]], columns: frozenset) -> bool:
+    """Un delta du journal modifie-t-il l'une des colonnes? (oui dans le doute)"""
+    if not records:
+        # Delta absent du journal (version plus ancienne): compté
+        return True
+    return any(record.get('inserted', 1) or 'changed_columns' not in record
+               or not columns.isdisjoint(record['changed_columns'])
+               for record in records)
+
+
+def columns_token(csv_path: str, columns: Sequence[str], token: Optional[str] = None,
+                  snapshot_dir: Optional[str] = None) -> str:
+    """
+    Jeton de l'état de quelques colonnes, clé des caches qui ne lisent qu'elles
+
+    Comme snapshot_token, mais seuls comptent les deltas qui ont modifié
+    l'une de ces colonnes ou ajouté des clients (nouvelles lignes: toutes
+    les colonnes changent). Un delta qui ne touche que d'autres colonnes
+    laisse ce jeton, et donc ces caches, inchangés.
+
+    Args:
+        csv_path: CSV source
+        columns: Colonnes lues par le cache
+        token: Version de référence (snapshot_token, défaut: état actuel):
+            seuls ses deltas comptent, même si le journal a avancé depuis
+        snapshot_dir: Répertoire du snapshot (défaut: à côté du CSV)
+
+    Returns:
+        Jeton JSON (format, empreinte du CSV, deltas concernés, colonnes)
+    """
+    snapshot_dir = snapshot_dir or default_snapshot_dir(csv_path)
+    version, fingerprint, deltas = json.loads(token or snapshot_token(csv_path, snapshot_dir))
+
+    # Enregistrements du journal par empreinte (dictionnaire: clé JSON)
+    records: Dict[str, List[Dict]] = {}
+    for record in read_delta_log(snapshot_dir)['deltas']:
+        records.setdefault(json.dumps(record['fingerprint'], sort_keys=True), []).append(record)
+
+    wanted = frozenset(columns)
+    kept = [delta for delta in deltas
+            if _delta_changes(records.get(json.dumps(delta, sort_keys=True)), wanted)]
+    # Colonnes comprises: un cache dont l'ensemble de colonnes change est reconstruit
+    return json.dumps([version, fingerprint, kept, sorted(wanted)], sort_keys=True)
+
+
+def ingest_delta(csv_path: str, delta_path: str,
+                 build_fn: Callable[[str], pd.DataFrame],
+                 snapshot_dir: Optional[str] = None,
+                 key: str = 'CustomerID',
+                 previous_columns: Optional[List[str]] = None) -> Dict:
+    """
+    Intégrer un fichier delta mensuel dans le dataset en cache
+
+    Seules les lignes du delta sont parsées et normalisées (colonnes
+    calculées comprises). Un même fichier delta n'est appliqué qu'une fois.
+
+    Args:
+        csv_path: Extrait complet de référence
+        delta_path: Fichier des clients nouveaux ou modifiés (même format)
+        build_fn: Parsing + normalisation d'un fichier (celui de load_data)
+        snapshot_dir: Répertoire du snapshot (défaut: à côté du CSV)
+        key: Colonne identifiant un client
+        previous_columns: Colonnes des lignes remplacées et fusionnées à
+            renvoyer (voir apply_delta)
+
+    Returns:
+        Résumé de la fusion (skipped=True si le delta était déjà appliqué)
+    """
+    snapshot_dir = snapshot_dir or default_snapshot_dir(csv_path)
+
+    # Snapshot à jour (reconstruit et journal rejoué si nécessaire)
+    load_or_build(csv_path, build_fn, snapshot_dir)
+    if read_schema(snapshot_dir) is None:
+        raise ValueError(f"Snapshot indisponible pour {csv_path}")
+
+    delta_path = os.path.abspath(delta_path)
+    delta_fingerprint = source_fingerprint(delta_path)
+    log = read_delta_log(snapshot_dir)
+    for record in log['deltas']:
+        if record['path'] == delta_path and record['fingerprint'] == delta_fingerprint:
+            return {'skipped': True, 'updated': 0, 'inserted': 0, 'changed_columns': [],
+                    'coercion': {}}
+
+    summary = apply_delta(snapshot_dir, build_fn(delta_path), key, previous_columns)
+
+    log['source'] = source_fingerprint(csv_path)
+    log['deltas'].append({
+        'path': delta_path,
+        'fingerprint': delta_fingerprint,
+        'key': key,
+        'updated': summary['updated'],
+        'inserted': summary['inserted'],
+        'changed_columns': summary['changed_columns']
+    })
+    _write_json_atomic(delta_log_path(snapshot_dir), log)
+
+    logger.info("Delta %s: %d mis à jour, %d ajoutés", delta_path,
+                summary['updated'], summary['inserted'])
+    return dict(summary, skipped=False)
+
+
+# ========================================
+# ARTEFACTS DÉRIVÉS (PERSISTANCE PAR JETON)
+# ========================================
+
+def artifact_path(csv_path: str, suffix: str) -> str:
+    """Fichier d'un artefact dérivé d'un CSV (à côté de son snapshot)"""
+    return default_snapshot_dir(csv_path) + suffix
+
+
+def write_artifact(path: str, token: str, format_version: int, fields: Dict) -> None:
+    """
+    Écrire un artefact dérivé sur disque (pickle, remplacement atomique)
+
+    Args:
+        path: Fichier cible
+        token: Jeton de l'état des données dont l'artefact est dérivé
+        format_version: Version du format de l'artefact
+        fields: Contenu propre à l'artefact
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix='.tmp-', dir=os.path.dirname(os.path.abspath(path)))
+    os.close(fd)
+
+    try:
+        pd.to_pickle(dict(fields, format_version=format_version, token=token), tmp_path)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def read_artifact(path: str, token: Optional[str], format_version: int) -> Optional[Dict]:
+    """
+    Contenu d'un artefact persisté (None si absent, illisible ou périmé)
+
+    token None: dernière version écrite, quel que soit son jeton (point de
+    départ d'une mise à jour incrémentale)
+    """
+    try:
+        payload = pd.read_pickle(path)
+    except Exception:
+        return None
+
+    if (not isinstance(payload, dict)
+            or payload.get('format_version') != format_version
+            or (token is not None and payload.get('token') != token)):
+        return None
+    return payload
+
+
+def load_or_build_artifact(path: str, token: str,
+                           read_fn: Callable[[str, str], Optional[object]],
+                           write_fn: Callable[[object, str, str], None],
+                           build_fn: Callable[[], object]):
+    """
+    Artefact persisté à jour, recalculé si les données ont changé
+
+    Args:
+        path: Fichier de l'artefact
+        token: Jeton de l'état des données (snapshot_token)
+        read_fn: Relecture (path, jeton) -> artefact ou None
+        write_fn: Écriture (artefact, path, jeton)
+        build_fn: Calcul complet (appelé seulement si nécessaire)
+
+    Returns:
+        Artefact de cette version des données
+    """
+    artifact = read_fn(path, token)
+    if artifact is None:
+        artifact = build_fn()
+        try:
+            write_fn(artifact, path, token)
+        except OSError:
+            # Persistance optionnelle: l'artefact calculé reste servi
+            pass
+    return artifact
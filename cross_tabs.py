@@ -0,0 +1,161 @@
+"""
+🔀 CROISEMENTS PRÉCALCULÉS - Tables churn de toutes les paires de variables
+
+Features:
+- Variables de l'explorateur comportemental (Contract, Internet Service,
+  Tech Support, ...) complétées par les autres colonnes catégorielles à
+  peu de modalités
+- Chaque variable factorisée une fois en codes entiers, à sa première lecture
+- Clients et churnés d'une paire par un seul np.bincount sur les codes
+  combinés (paire, indicateur de churn), sans groupby pandas
+- Paires calculées à la demande et conservées dans le magasin de l'état
+  des filtres: seules les paires affichées sont comptées, et revenir à une
+  paire déjà vue n'est qu'une lecture de dictionnaire
+
+Author: EthicalDataBoost
+Date: 2026-10-17
+Version: 1.0
+"""
+
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from groupby_kernels import factorize, group_rate, valid_codes
+
+# ========================================
+# CONSTANTES
+# ========================================
+
+# Variables proposées en premier par l'explorateur (ordre des selectbox)
+EXPLORER_VARIABLES = ['Contract', 'Internet Service', 'Tech Support',
+                      'Online Security', 'Payment Method', 'Phone Service']
+
+# Autres colonnes catégorielles retenues jusqu'à ce nombre de modalités
+MAX_CROSS_VALUES = 12
+
+# Colonnes dérivées du churn: leur croisement avec le churn n'apprend rien
+TARGET_COLUMNS = ['Churn', 'Churn Label', 'Customer Status']
+
+
+def explorer_variables(df: pd.DataFrame) -> List[str]:
+    """
+    Variables croisables d'un dataset
+
+    Variables de l'explorateur présentes, puis les autres colonnes
+    catégorielles d'au plus MAX_CROSS_VALUES modalités (ordre des colonnes).
+    """
+    variables = [var for var in EXPLORER_VARIABLES if var in df.columns]
+    for col in df.columns:
+        if (col in variables or col in TARGET_COLUMNS
+                or not isinstance(df[col].dtype, pd.CategoricalDtype)):
+            continue
+        if len(df[col].cat.categories) <= MAX_CROSS_VALUES:
+            variables.append(col)
+    return variables
+
+
+# ========================================
+# MAGASIN DES CROISEMENTS
+# ========================================
+
+class CrossTabStore:
+    """
+    Clients et churnés de chaque paire de variables
+
+    Une matrice (modalités var1 × modalités var2) par paire non ordonnée,
+    calculée à la première lecture puis conservée; la paire inverse se lit
+    par transposition. Les lignes dont une des deux variables manque sont
+    ignorées, comme dans un groupby.
+    """
+
+    def __init__(self, df: pd.DataFrame, variables: Sequence[str],
+                 churn_column: str = 'Is_Churned',
+                 on_fill: Optional[Callable[[], None]] = None):
+        """
+        Args:
+            df: Lignes de la sélection courante (lues, jamais modifiées)
+            variables: Variables à croiser (absentes ignorées)
+            churn_column: Indicateur du churn (0/1)
+            on_fill: Appelé après chaque paire calculée (remesure de
+                l'entrée du cache des sélections qui contient le magasin)
+        """
+        self.variables = [var for var in variables if var in df.columns]
+        self.rows = len(df)
+        self.values: Dict[str, pd.Index] = {}
+        self.tables: Dict[Tuple[str, str], Tuple[np.ndarray, np.ndarray]] = {}
+
+        self._df = df
+        self._churned = (df[churn_column].to_numpy() != 0).astype(np.int32)
+        self._codes: Dict[str, np.ndarray] = {}
+        self._missing: Dict[str, bool] = {}
+        self._on_fill = on_fill
+
+    def __contains__(self, pair: Tuple[str, str]) -> bool:
+        var1, var2 = pair
+        return var1 != var2 and var1 in self.variables and var2 in self.variables
+
+    def _factorize(self, var: str) -> np.ndarray:
+        """Codes entiers d'une variable, factorisée à la première paire qui la lit"""
+        if var not in self._codes:
+            var_codes, values = factorize(self._df[var])
+            self._missing[var] = valid_codes(var_codes) is not None
+            self.values[var] = values
+            # Codes étroits: peu de modalités, moins de mémoire parcourue
+            self._codes[var] = var_codes.astype(np.int32)
+        return self._codes[var]
+
+    def _count_pair(self, var1: str, var2: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Clients et churnés d'une paire par un seul bincount"""
+        codes1, codes2 = self._factorize(var1), self._factorize(var2)
+        n1, n2 = len(self.values[var1]), len(self.values[var2])
+        # Case (modalité var1, modalité var2, churn) d'un seul bincount
+        combined = (codes1 * n2 + codes2) * 2 + self._churned
+        if self._missing[var1] or self._missing[var2]:
+            combined = combined[(codes1 >= 0) & (codes2 >= 0)]
+        counts = np.bincount(combined, minlength=n1 * n2 * 2).reshape(n1, n2, 2)
+        return counts.sum(axis=2), counts[:, :, 1]
+
+    def counts(self, var1: str, var2: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Matrices (clients, churnés) du croisement var1 × var2
+
+        Raises:
+            KeyError: Paire hors des variables croisables
+        """
+        if (var1, var2) not in self:
+            raise KeyError((var1, var2))
+
+        # Paire rangée dans l'ordre des variables: un seul calcul pour les deux sens
+        transposed = self.variables.index(var1) > self.variables.index(var2)
+        pair = (var2, var1) if transposed else (var1, var2)
+        if pair not in self.tables:
+            self.tables[pair] = self._count_pair(*pair)
+            if self._on_fill is not None:
+                self._on_fill()
+
+        total, churned = self.tables[pair]
+        if transposed:
+            return total.T, churned.T
+        return total, churned
+
+    def cross_table(self, var1: str, var2: str) -> pd.DataFrame:
+        """
+        Taux de churn par combinaison observée de deux variables
+
+        Mêmes lignes et ordre que df.groupby([var1, var2], observed=True)
+        ['Is_Churned'].agg(['mean', 'count']) (taux en pourcentage).
+
+        Returns:
+            DataFrame [var1, var2, 'Churn_Rate', 'Count']
+        """
+        total, churned = self.counts(var1, var2)
+        rows, cols = np.nonzero(total)
+
+        return pd.DataFrame({
+            var1: self.values[var1].take(rows),
+            var2: self.values[var2].take(cols),
+            'Churn_Rate': group_rate(churned[rows, cols], total[rows, cols]),
+            'Count': total[rows, cols]
+        })
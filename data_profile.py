@@ -0,0 +1,310 @@
+"""
+🩺 PROFIL QUALITÉ DES DONNÉES - Contrôle des extraits au chargement
+
+Features:
+- Un passage vectorisé par colonne: valeurs nulles, modalités distinctes,
+  min / max et valeurs les plus fréquentes
+- Échecs de conversion des mesures numériques (texte non numérique
+  remplacé silencieusement par 0 au chargement), comptés pendant la
+  conversion elle-même et conservés dans le snapshot, deltas fusionnés compris
+- Calculé une fois par version des données, persisté à côté du snapshot;
+  après un delta, seules les colonnes modifiées sont reprofilées
+- Rapport en ligne de commande (python data_profile.py [fichier.csv])
+
+Author: EthicalDataBoost
+Date: 2026-10-17
+Version: 1.0
+"""
+
+import json
+import os
+import sys
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from columnar_store import (COERCION_ATTR, artifact_path, load_or_build_artifact,
+                            read_artifact, write_artifact)
+
+# ========================================
+# CONSTANTES
+# ========================================
+
+PROFILE_FORMAT_VERSION = 2
+PROFILE_SUFFIX = '.profile.pkl'
+
+# Nombre de valeurs les plus fréquentes retenues par colonne
+TOP_VALUES = 3
+
+PROFILE_COLUMNS = ['Colonne', 'Type', 'Nulls', '% nulls', 'Échecs conversion',
+                   'Distincts', 'Min', 'Max', 'Top valeurs']
+
+
+# ========================================
+# PROFIL PAR COLONNE
+# ========================================
+
+def _format_top(values: Sequence, counts: Sequence[int]) -> str:
+    """Valeurs fréquentes affichées 'valeur (n)'"""
+    return ', '.join(f'{value} ({count:,})' for value, count in zip(values, counts))
+
+
+def _categorical_profile(series: pd.Series) -> Dict:
+    """Profil d'une colonne category: un bincount sur les codes"""
+    categories = series.cat.categories
+    # Code -1 (valeur manquante) décalé en 0
+    counts = np.bincount(series.cat.codes.to_numpy().astype(np.int64) + 1,
+                         minlength=len(categories) + 1)
+    nulls, counts = int(counts[0]), counts[1:]
+
+    present = np.flatnonzero(counts)
+    top = present[np.argsort(-counts[present], kind='stable')][:TOP_VALUES]
+    observed = categories[present]
+
+    try:
+        low, high = observed.min(), observed.max()
+    except (TypeError, ValueError):
+        low = high = None
+
+    return {
+        'Nulls': nulls,
+        'Distincts': len(present),
+        'Min': low,
+        'Max': high,
+        'Top valeurs': _format_top(categories[top], counts[top])
+    }
+
+
+def _generic_profile(series: pd.Series) -> Dict:
+    """Profil d'une colonne numérique ou texte: value_counts (hachage)"""
+    counts = series.value_counts(dropna=True, sort=True)
+    nulls = len(series) - int(counts.sum())
+
+    low = high = None
+    if len(counts):
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            values = counts.index.to_numpy()
+            low, high = values.min(), values.max()
+        else:
+            try:
+                low, high = counts.index.min(), counts.index.max()
+            except TypeError:
+                # Types mélangés (texte et nombres): pas d'ordre
+                pass
+
+    top = counts.iloc[:TOP_VALUES]
+    return {
+        'Nulls': nulls,
+        'Distincts': len(counts),
+        'Min': low,
+        'Max': high,
+        'Top valeurs': _format_top(top.index, top.to_numpy())
+    }
+
+
+def profile_column(series: pd.Series) -> Dict:
+    """
+    Profil qualité d'une colonne
+
+    Args:
+        series: Colonne du dataset
+
+    Returns:
+        Nulls, Distincts, Min, Max et Top valeurs
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return _categorical_profile(series)
+    return _generic_profile(series)
+
+
+# ========================================
+# ÉCHECS DE CONVERSION
+# ========================================
+
+def coerce_numeric(df: pd.DataFrame, columns: Sequence[str]) -> Dict[str, Dict[str, int]]:
+    """
+    Convertir les mesures en nombres (manquant ou invalide -> 0) en comptant
+
+    Les valeurs brutes sont encore là: une valeur présente mais non
+    convertible est un échec, compté au passage sans relire le fichier.
+
+    Args:
+        df: Lignes brutes parsées (modifiées en place)
+        columns: Mesures à convertir (absentes ignorées)
+
+    Returns:
+        Par colonne: {'nulls': vides dans le source, 'failures': échecs}
+    """
+    report = {}
+    for col in columns:
+        if col not in df.columns:
+            continue
+        present = df[col].notna().to_numpy()
+        converted = pd.to_numeric(df[col], errors='coerce')
+        report[col] = {
+            'nulls': int((~present).sum()),
+            'failures': int((converted.isna().to_numpy() & present).sum())
+        }
+        df[col] = converted.fillna(0)
+    return report
+
+
+# ========================================
+# PROFIL DU DATASET
+# ========================================
+
+def profile_dataset(df: pd.DataFrame,
+                    coercion: Optional[Dict[str, Dict[str, int]]] = None,
+                    previous: Optional[pd.DataFrame] = None,
+                    column_token: Optional[Callable[[str], str]] = None) -> pd.DataFrame:
+    """
+    Profil qualité de toutes les colonnes d'un dataset
+
+    Args:
+        df: Dataset complet normalisé
+        coercion: Compteurs de coerce_numeric (défaut: ceux du dataset,
+            df.attrs[COERCION_ATTR], cumulés sur le CSV et les deltas)
+        previous: Profil d'une version précédente (mise à jour incrémentale)
+        column_token: Jeton d'une colonne (columns_token): une colonne dont
+            le jeton et les compteurs de conversion n'ont pas changé depuis
+            previous garde sa ligne sans être relue
+
+    Returns:
+        Une ligne par colonne (PROFILE_COLUMNS). Pour une mesure convertie,
+        Nulls compte les valeurs vides du source: elles valent 0 une fois
+        chargées. attrs['column_tokens']: jeton de chaque ligne.
+    """
+    coercion = coercion if coercion is not None else df.attrs.get(COERCION_ATTR, {})
+    n_rows = len(df)
+
+    reusable, known = {}, {}
+    if previous is not None and column_token is not None:
+        known = previous.attrs.get('column_tokens', {})
+        reusable = {row['Colonne']: row for row in previous.to_dict('records')}
+
+    rows, tokens = [], {}
+    for col in df.columns:
+        source = coercion.get(col)
+        if column_token is not None:
+            tokens[col] = json.dumps([column_token(col), source], sort_keys=True)
+            if col in reusable and known.get(col) == tokens[col]:
+                rows.append(reusable[col])
+                continue
+
+        stats = profile_column(df[col])
+        if source is not None:
+            stats['Nulls'] = max(stats['Nulls'], source['nulls'])
+
+        rows.append({
+            'Colonne': col,
+            'Type': str(df[col].dtype),
+            'Nulls': stats['Nulls'],
+            '% nulls': round(stats['Nulls'] / n_rows * 100, 1) if n_rows else 0.0,
+            'Échecs conversion': source['failures'] if source is not None else 0,
+            'Distincts': stats['Distincts'],
+            # Texte: une seule colonne d'affichage pour tous les types
+            'Min': '' if stats['Min'] is None else str(stats['Min']),
+            'Max': '' if stats['Max'] is None else str(stats['Max']),
+            'Top valeurs': stats['Top valeurs']
+        })
+
+    profile = pd.DataFrame(rows, columns=PROFILE_COLUMNS)
+    profile.attrs['rows'] = n_rows
+    profile.attrs['column_tokens'] = tokens
+    return profile
+
+
+def profile_alerts(profile: pd.DataFrame) -> pd.DataFrame:
+    """Colonnes à vérifier: échecs de conversion ou valeurs nulles"""
+    return profile[(profile['Échecs conversion'] > 0) | (profile['Nulls'] > 0)]
+
+
+# ========================================
+# PERSISTANCE
+# ========================================
+
+def profile_path(csv_path: str) -> str:
+    """Fichier du profil qualité d'un CSV (à côté de son snapshot)"""
+    return artifact_path(csv_path, PROFILE_SUFFIX)
+
+
+def write_profile(profile: pd.DataFrame, path: str, token: str) -> None:
+    """Écrire un profil sur disque (remplacement atomique)"""
+    write_artifact(path, token, PROFILE_FORMAT_VERSION, {
+        'rows': profile.attrs.get('rows', 0),
+        'column_tokens': profile.attrs.get('column_tokens', {}),
+        'profile': profile
+    })
+
+
+def read_profile(path: str, token: Optional[str]) -> Optional[pd.DataFrame]:
+    """
+    Relire un profil persisté (None si absent, illisible ou périmé)
+
+    token None: dernier profil écrit, quelle que soit sa version
+    """
+    payload = read_artifact(path, token, PROFILE_FORMAT_VERSION)
+    if payload is None:
+        return None
+
+    profile = payload['profile']
+    profile.attrs['rows'] = payload['rows']
+    profile.attrs['column_tokens'] = payload['column_tokens']
+    return profile
+
+
+def load_or_build_profile(path: str, token: str,
+                          dataset_fn: Callable[[], pd.DataFrame],
+                          column_token: Optional[Callable[[str], str]] = None) -> pd.DataFrame:
+    """
+    Profil persisté à jour, recalculé si les données ont changé
+
+    Args:
+        path: Fichier du profil
+        token: Jeton de l'état des données (snapshot_token)
+        dataset_fn: Dataset de cette version (appelé seulement si nécessaire)
+        column_token: Jeton par colonne (voir profile_dataset): avec lui,
+            seules les colonnes modifiées depuis le dernier profil écrit
+            sont reprofilées
+
+    Returns:
+        Profil de cette version des données
+    """
+    def build() -> pd.DataFrame:
+        previous = read_profile(path, None) if column_token is not None else None
+        return profile_dataset(dataset_fn(), previous=previous, column_token=column_token)
+
+    return load_or_build_artifact(path, token, read_profile, write_profile, build)
+
+
+# ========================================
+# RAPPORT
+# ========================================
+
+def main(argv) -> int:
+    """Afficher le profil qualité d'un CSV (python data_profile.py [fichier.csv])"""
+    from columnar_store import load_or_build
+    import streamlit_app as app
+
+    csv_path = argv[0] if argv else app._find_data_file()
+    if csv_path is None or not os.path.exists(csv_path):
+        print("❌ Fichier telco_churn_master.csv introuvable")
+        return 1
+
+    # Snapshot à jour: deltas fusionnés et leurs échecs de conversion compris
+    profile = profile_dataset(load_or_build(csv_path, app._build_dataset))
+
+    with pd.option_context('display.max_rows', None, 'display.width', 200,
+                           'display.max_colwidth', 60):
+        print(profile.to_string(index=False))
+
+    alerts = profile_alerts(profile)
+    print()
+    print(f"{profile.attrs['rows']:,} lignes, {len(profile)} colonnes, "
+          f"{len(alerts)} colonne(s) à vérifier")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,282 @@
+"""
+🗂️ SCHÉMA TYPÉ - Types compacts déclarés pour le dataset Telco
+
+Features:
+- Dimensions texte (City, Contract, Offer...) parsées directement en category
+- Indicateurs Yes/No en category à deux modalités fixes ['No', 'Yes']
+- Entiers bornés (Satisfaction, Age, Tenure...) réduits au type le plus étroit sûr
+- Projection: seules les colonnes déclarées utiles au dashboard sont parsées
+- Rapport d'empreinte mémoire et de temps de parsing (python data_schema.py [fichier.csv])
+
+Author: EthicalDataBoost
+Date: 2026-10-17
+Version: 1.0
+"""
+
+import sys
+import time
+from typing import Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+# ========================================
+# SCHÉMA DÉCLARÉ
+# ========================================
+
+# Dimensions texte à faible cardinalité
+CATEGORY_COLUMNS = [
+    'Country', 'State', 'City', 'Gender',
+    'Internet Service', 'Multiple Lines', 'Online Security', 'Online Backup',
+    'Device Protection', 'Tech Support', 'Streaming TV', 'Streaming Movies',
+    'Streaming Music', 'Unlimited Data',
+    'Contract', 'Payment Method', 'Offer',
+    'Customer Status', 'Churn Category', 'Churn Reason_x', 'Churn Reason_y'
+]
+
+# Indicateurs Yes/No: category ['No', 'Yes'] (1 octet par ligne, comme un
+# uint8) plutôt que bool, pour que les comparaisons == 'Yes' du dashboard
+# restent valides
+FLAG_COLUMNS = [
+    'Senior Citizen', 'Partner', 'Dependents', 'Phone Service',
+    'Paperless Billing (facturation électronique)', 'Churn Label', 'Churn'
+]
+FLAG_CATEGORIES = ['No', 'Yes']
+
+# Entiers bornés: type cible (signé, pour éviter tout débordement sur une
+# soustraction). Appliqué seulement si toutes les valeurs tiennent dedans.
+INTEGER_COLUMNS = {
+    'Count': 'int8',
+    'Age': 'int8',
+    'Tenure in Months': 'int8',
+    'Satisfaction Score': 'int8',
+    'Churn Value': 'int8',
+    'Churn Score': 'int8',
+    'Nb_Produits': 'int8',
+    'Upsell': 'int8',
+    'CLTV': 'int16',
+    'Zip Code': 'int32'
+}
+
+# Mesures converties en nombre au chargement (valeurs invalides -> 0)
+COERCED_NUMERIC_COLUMNS = ['Monthly Charge', 'Total Revenue', 'CLTV',
+                           'Satisfaction Score', 'Tenure in Months']
+
+# Colonnes dont le texte brut est réécrit après parsing (mapping de valeurs)
+_REMAPPED_COLUMNS = {'Customer Status'}
+
+# Colonnes lues par les onglets (projection au parsing). Les colonnes
+# optionnelles absentes du fichier sont ignorées. Non lues car redondantes:
+# Lat Long (= Latitude / Longitude), Churn Reason_x / Churn Reason_y
+# (doublons d'une fusion), Count, Country et State (constantes).
+DASHBOARD_COLUMNS = [
+    # Identifiant ('customerID' dans certains extraits, renommé au chargement)
+    'CustomerID', 'customerID',
+    # Dimensions des filtres et de la géographie
+    'City', 'Latitude', 'Longitude', 'Gender', 'Age', 'Tranche_Age',
+    'Senior Citizen', 'Contract', 'Offer', 'Payment Method',
+    # Services (Nb_Produits, analyses comportementales)
+    'Phone Service', 'Multiple Lines', 'Internet Service', 'Online Security',
+    'Online Backup', 'Device Protection', 'Tech Support', 'Streaming TV',
+    'Streaming Movies', 'Streaming Music', 'Unlimited Data',
+    # Mesures
+    'Tenure in Months', 'Monthly Charge', 'Total Revenue', 'CLTV',
+    'Satisfaction Score',
+    # Statut de churn
+    'Churn Label', 'Churn', 'Customer Status'
+]
+
+
+# Valeur des multiselects de filtre signifiant "pas de filtre" (partagée par
+# le dashboard, le cache des sélections, l'index bitmap, le cube et SQLite)
+ALL_VALUES = 'Tout'
+
+
+# ========================================
+# APPLICATION DU SCHÉMA
+# ========================================
+
+def parse_dtypes() -> Dict[str, str]:
+    """
+    Types à passer à pd.read_csv pour parser les dimensions en category
+
+    Les colonnes absentes du fichier sont ignorées par pandas.
+    """
+    columns = [col for col in CATEGORY_COLUMNS + FLAG_COLUMNS
+               if col not in _REMAPPED_COLUMNS]
+    return {col: 'category' for col in columns}
+
+
+def parse_columns() -> Callable[[str], bool]:
+    """
+    Sélecteur de colonnes à passer à pd.read_csv (usecols)
+
+    Un callable plutôt qu'une liste: les colonnes déclarées mais absentes
+    du fichier ne provoquent pas d'erreur.
+    """
+    wanted = frozenset(DASHBOARD_COLUMNS)
+    return wanted.__contains__
+
+
+def _fits_integer(series: pd.Series, dtype: str) -> bool:
+    """Vérifier qu'une colonne numérique tient sans perte dans un type entier"""
+    if not pd.api.types.is_numeric_dtype(series) or series.isna().any():
+        return False
+    if series.empty:
+        return True
+    values = series.to_numpy()
+    if not np.array_equal(values, np.round(values)):
+        return False
+    info = np.iinfo(dtype)
+    return info.min <= values.min() and values.max() <= info.max
+
+
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convertir un DataFrame normalisé vers les types compacts déclarés
+
+    Chaque conversion est sans perte: une colonne qui ne respecte pas le
+    schéma (valeur hors bornes, modalité inattendue) garde son type.
+
+    Args:
+        df: DataFrame normalisé (modifié en place)
+
+    Returns:
+        Le même DataFrame, typé
+    """
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+
+    flag_dtype = pd.CategoricalDtype(FLAG_CATEGORIES)
+    for col in FLAG_COLUMNS:
+        if col not in df.columns:
+            continue
+        values = set(df[col].dropna().unique())
+        if values <= set(FLAG_CATEGORIES):
+            df[col] = df[col].astype(flag_dtype)
+        elif not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+
+    for col, dtype in INTEGER_COLUMNS.items():
+        if col in df.columns and _fits_integer(df[col], dtype):
+            df[col] = df[col].astype(dtype)
+
+    return df
+
+
+def read_typed_csv(path: str, project: bool = False) -> pd.DataFrame:
+    """
+    Parser un CSV avec le schéma déclaré (sans normalisation métier)
+
+    Args:
+        path: Chemin du fichier CSV
+        project: Ne lire que les colonnes du dashboard (DASHBOARD_COLUMNS)
+    """
+    usecols = parse_columns() if project else None
+    return apply_schema(pd.read_csv(path, dtype=parse_dtypes(), usecols=usecols))
+
+
+# ========================================
+# RAPPORT D'EMPREINTE
+# ========================================
+
+def footprint_report(before: pd.DataFrame, after: pd.DataFrame) -> pd.DataFrame:
+    """
+    Comparer l'empreinte mémoire de deux versions d'un même DataFrame
+
+    Args:
+        before: DataFrame avec les types d'origine
+        after: DataFrame avec les types du schéma
+
+    Returns:
+        Une ligne par colonne: types, Ko avant/après et gain en %
+    """
+    mem_before = before.memory_usage(deep=True, index=False)
+    mem_after = after.memory_usage(deep=True, index=False)
+
+    rows = []
+    for col in before.columns:
+        kb_before = mem_before[col] / 1024
+        kb_after = mem_after.get(col, 0) / 1024
+        rows.append({
+            'Colonne': col,
+            'Type avant': str(before[col].dtype),
+            'Type après': str(after[col].dtype) if col in after.columns else '-',
+            'Ko avant': round(kb_before, 1),
+            'Ko après': round(kb_after, 1),
+            'Gain %': round((1 - kb_after / kb_before) * 100, 1) if kb_before else 0.0
+        })
+
+    return pd.DataFrame(rows).sort_values('Ko avant', ascending=False)
+
+
+def _time_groupby(df: pd.DataFrame, key: str, repeat: int = 20) -> float:
+    """Durée moyenne (ms) d'un groupby(key).size()"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        df.groupby(key, observed=True).size()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def _time_parse(parse_fn: Callable[[], pd.DataFrame], repeat: int = 3) -> float:
+    """Meilleure durée (ms) d'un parsing complet"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse_fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def projection_report(path: str) -> Dict[str, float]:
+    """
+    Mesurer le gain de la projection sur un CSV (schéma typé dans les deux cas)
+
+    Returns:
+        Colonnes, durée de parsing (ms) et mémoire (Mo), toutes colonnes
+        puis colonnes du dashboard seulement
+    """
+    full = read_typed_csv(path)
+    projected = read_typed_csv(path, project=True)
+    return {
+        'columns_full': len(full.columns),
+        'columns_projected': len(projected.columns),
+        'parse_ms_full': _time_parse(lambda: read_typed_csv(path)),
+        'parse_ms_projected': _time_parse(lambda: read_typed_csv(path, project=True)),
+        'memory_mb_full': full.memory_usage(deep=True).sum() / 1024 ** 2,
+        'memory_mb_projected': projected.memory_usage(deep=True).sum() / 1024 ** 2
+    }
+
+
+def main(path: str = 'telco_churn_master.csv') -> None:
+    """Afficher le rapport d'empreinte avant/après et le gain de projection pour un CSV"""
+    before = pd.read_csv(path)
+    after = read_typed_csv(path)
+
+    report = footprint_report(before, after)
+    total_before = report['Ko avant'].sum()
+    total_after = report['Ko après'].sum()
+
+    with pd.option_context('display.max_rows', None, 'display.width', 200):
+        print(report.to_string(index=False))
+    print()
+    print(f"Total: {total_before / 1024:.2f} Mo -> {total_after / 1024:.2f} Mo "
+          f"({(1 - total_after / total_before) * 100:.1f}% de gain)")
+
+    for key in ('City', 'Contract'):
+        if key in before.columns:
+            print(f"groupby('{key}'): {_time_groupby(before, key):.2f} ms -> "
+                  f"{_time_groupby(after, key):.2f} ms")
+
+    projection = projection_report(path)
+    skipped = sorted(set(before.columns) - set(DASHBOARD_COLUMNS))
+    print()
+    print(f"Projection: {projection['columns_full']} -> {projection['columns_projected']} colonnes "
+          f"(non lues: {', '.join(skipped) or '-'})")
+    print(f"Parsing: {projection['parse_ms_full']:.1f} ms -> {projection['parse_ms_projected']:.1f} ms")
+    print(f"Mémoire: {projection['memory_mb_full']:.2f} Mo -> {projection['memory_mb_projected']:.2f} Mo")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
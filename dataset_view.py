@@ -0,0 +1,87 @@
+"""
+🔎 VUES DU DATASET - Table partagée + vecteur de sélection, sans copie
+
+Features:
+- Une vue associe la table de base (partagée, jamais modifiée) aux
+  positions des lignes retenues par les filtres
+- Sans filtre: la vue est la table elle-même (aucune copie)
+- Lignes filtrées matérialisées une seule fois par exécution, partagées
+  par tous les onglets
+- Chaque onglet reçoit un DataFrame de travail superficiel: il peut
+  ajouter ses colonnes sans dupliquer ni modifier les données partagées
+
+Author: EthicalDataBoost
+Date: 2026-10-17
+Version: 1.0
+"""
+
+from typing import Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+
+# ========================================
+# VUE
+# ========================================
+
+class DatasetView:
+    """
+    Sélection de lignes d'une table de base immuable
+
+    Les colonnes et le DataFrame filtré sont matérialisés au premier
+    accès puis conservés: ils ne doivent pas être modifiés en place
+    (as_frame fournit un DataFrame de travail).
+    """
+
+    def __init__(self, base: pd.DataFrame, rows: Optional[np.ndarray] = None):
+        """
+        Args:
+            base: Table complète partagée
+            rows: Positions des lignes retenues (None: toutes les lignes)
+        """
+        self.base = base
+        self.rows = rows
+        self._frame: Optional[pd.DataFrame] = None
+        self._columns: Dict[str, pd.Series] = {}
+
+    def __len__(self) -> int:
+        return len(self.base) if self.rows is None else len(self.rows)
+
+    @property
+    def columns(self) -> pd.Index:
+        return self.base.columns
+
+    @property
+    def empty(self) -> bool:
+        return len(self) == 0 or len(self.base.columns) == 0
+
+    def column(self, name: str) -> pd.Series:
+        """Une colonne restreinte aux lignes de la vue (sans matérialiser les autres)"""
+        if self._frame is not None:
+            return self._frame[name]
+        if name not in self._columns:
+            series = self.base[name]
+            self._columns[name] = series if self.rows is None else series.iloc[self.rows]
+        return self._columns[name]
+
+    def frame(self) -> pd.DataFrame:
+        """DataFrame des lignes de la vue (la table de base elle-même sans filtre)"""
+        if self._frame is None:
+            self._frame = self.base if self.rows is None else self.base.iloc[self.rows]
+            self._columns.clear()
+        return self._frame
+
+
+Dataset = Union[pd.DataFrame, DatasetView]
+
+
+def as_frame(data: Dataset) -> pd.DataFrame:
+    """
+    DataFrame de travail d'un onglet (remplace df.copy())
+
+    Copie superficielle: les colonnes ajoutées ou remplacées ne concernent
+    que ce DataFrame, les données existantes ne sont pas dupliquées.
+    """
+    frame = data.frame() if isinstance(data, DatasetView) else data
+    return frame.copy(deep=False)
@@ -0,0 +1,125 @@
+"""
+👀 SURVEILLANCE DU FICHIER DE DONNÉES - Rechargement hors requête
+
+Features:
+- Thread d'arrière-plan qui surveille le CSV (jeton snapshot_token)
+- Nouvelle version reconstruite hors du chemin des requêtes
+- Bascule atomique: toutes les sessions voient la nouvelle version d'un coup
+- Les rendus en cours terminent sur la version qu'ils ont déjà en main
+- Échec de reconstruction: la version précédente reste servie, nouvel
+  essai seulement quand le fichier change à nouveau
+
+Author: EthicalDataBoost
+Date: 2026-10-17
+Version: 1.0
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# ========================================
+# CONSTANTES
+# ========================================
+
+DEFAULT_INTERVAL = 30.0
+
+
+# ========================================
+# SURVEILLANCE
+# ========================================
+
+class DatasetWatcher:
+    """
+    Version partagée du dataset, rafraîchie par un thread d'arrière-plan
+
+    La version courante est un couple (jeton, DataFrame) remplacé en une
+    seule affectation: un lecteur obtient toujours un couple cohérent, et
+    garde sa référence jusqu'à la fin de son rendu même si une nouvelle
+    version est publiée entre-temps. Les générations du snapshot ne sont
+    jamais modifiées après publication (columnar_store): les colonnes
+    mappées d'une version remplacée restent valides.
+    """
+
+    def __init__(self, path: str,
+                 token_fn: Callable[[str], str],
+                 load_fn: Callable[[str, str], pd.DataFrame],
+                 interval: float = DEFAULT_INTERVAL):
+        """
+        Args:
+            path: Fichier CSV surveillé
+            token_fn: Jeton bon marché de l'état des données (snapshot_token)
+            load_fn: Construction complète d'une version (path, jeton) ->
+                DataFrame, colonnes calculées comprises
+            interval: Délai entre deux vérifications (secondes)
+        """
+        self.path = path
+        self.token_fn = token_fn
+        self.load_fn = load_fn
+        self.interval = interval
+
+        self._current: Optional[Tuple[str, pd.DataFrame]] = None
+        self._failed_token: Optional[str] = None
+        self._refresh_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'DatasetWatcher':
+        """Charger la version initiale (bloquant) puis lancer la surveillance"""
+        self.refresh()
+
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run,
+                name=f'dataset-watcher-{self.path}',
+                daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def current(self) -> Tuple[str, pd.DataFrame]:
+        """Version publiée: (jeton, DataFrame partagé, jamais modifié en place)"""
+        if self._current is None:
+            raise RuntimeError("Aucune version du dataset n'est encore chargée")
+        return self._current
+
+    def refresh(self) -> bool:
+        """
+        Reconstruire et publier une nouvelle version si les données ont changé
+
+        Returns:
+            True si une nouvelle version a été publiée
+        """
+        with self._refresh_lock:
+            token = self.token_fn(self.path)
+            if self._current is not None and self._current[0] == token:
+                return False
+            if token == self._failed_token:
+                # Même fichier invalide: pas de nouvelle tentative avant modification
+                return False
+
+            try:
+                df = self.load_fn(self.path, token)
+            except Exception:
+                self._failed_token = token
+                raise
+
+            # Bascule atomique (une seule affectation)
+            self._current = (token, df)
+            logger.info("Nouvelle version du dataset publiée: %d lignes", len(df))
+            return True
+
+    def _run(self) -> None:
+        # Thread démon: il vit aussi longtemps que le serveur
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.refresh()
+            except Exception as e:
+                # Fichier en cours d'écriture, CSV invalide...: la version
+                # précédente reste servie
+                logger.warning("Rechargement du dataset impossible: %s", e)
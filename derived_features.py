@@ -0,0 +1,125 @@
+"""
+🧮 COLONNES CALCULÉES - Calculées une fois par version, sur la table complète
+
+Features:
+- Churn, Nb_Produits, Upsell, CLV_Cat, Tenure_Years et Is_Churned calculés
+  pendant la préparation du dataset (avant le snapshot)
+- Toutes les colonnes sont ligne à ligne: un bloc du mode flux ou un delta
+  reçoit exactement les valeurs qu'aurait produites la table complète
+- Les vues filtrées héritent des colonnes: aucun recalcul par rerun ni par
+  onglet (missing_features signale un dataset préparé sans elles)
+
+Author: EthicalDataBoost
+Date: 2026-10-17
+Version: 1.0
+"""
+
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+# ========================================
+# DÉFINITIONS
+# ========================================
+
+# Services comptés dans Nb_Produits (les deux derniers sont optionnels)
+PRODUCT_COLUMNS = [
+    'Phone Service', 'Multiple Lines', 'Internet Service',
+    'Online Security', 'Online Backup', 'Device Protection',
+    'Tech Support', 'Streaming TV', 'Streaming Movies',
+    'Streaming Music', 'Unlimited Data'
+]
+
+# Vente incitative: au moins ce nombre de produits
+UPSELL_MIN_PRODUCTS = 3
+
+CLV_BINS = [0, 2500, 3000, 3500, 4000, 4500, 5000, 5500, 6000, 7000]
+CLV_LABELS = ['2001-2500', '2501-3000', '3001-3500', '3501-4000',
+              '4001-4500', '4501-5000', '5001-5500', '5501-6000', '6001-6500']
+
+TENURE_BINS = [0, 12, 24, 36, 48, 60, 72]
+TENURE_LABELS = ['1 an', '2 ans', '3 ans', '4 ans', '5 ans', '6 ans']
+
+# Colonne calculée -> colonne source dont elle dépend (None: toujours créée)
+DERIVED_COLUMNS = {
+    'Churn': None,
+    'Nb_Produits': None,
+    'Upsell': None,
+    'Is_Churned': None,
+    'CLV_Cat': 'CLTV',
+    'Tenure_Years': 'Tenure in Months'
+}
+
+
+# ========================================
+# CALCUL
+# ========================================
+
+def add_derived_features(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Ajouter les colonnes calculées à un dataset normalisé
+
+    À appeler sur la table complète (ou un bloc / delta de lignes brutes),
+    jamais sur une vue filtrée.
+
+    Args:
+        df: Dataset normalisé (modifié en place)
+
+    Returns:
+        DataFrame avec les colonnes calculées
+    """
+    # Colonne 'Churn' à partir de 'Churn Label'
+    if 'Churn' not in df.columns:
+        if 'Churn Label' in df.columns:
+            df['Churn'] = df['Churn Label']
+        elif 'Customer Status' in df.columns:
+            df['Churn'] = df['Customer Status'].map({'Churned': 'Yes', 'Stayed': 'No'})
+        else:
+            # Fallback
+            df['Churn'] = 'No'
+
+    # Identifiant client unique 'CustomerID' (un extrait en 'customerID'
+    # est renommé, jamais dupliqué)
+    if 'customerID' in df.columns and 'CustomerID' not in df.columns:
+        df = df.rename(columns={'customerID': 'CustomerID'})
+
+    # Nombre de produits souscrits: somme des indicateurs 'Yes'
+    nb_produits = np.zeros(len(df), dtype=np.int64)
+    for col in PRODUCT_COLUMNS:
+        if col in df.columns:
+            nb_produits += (df[col] == 'Yes').to_numpy(dtype=np.int64)
+    df['Nb_Produits'] = nb_produits
+
+    # Indicateur de vente incitative
+    df['Upsell'] = (nb_produits >= UPSELL_MIN_PRODUCTS).astype(np.int64)
+
+    # Indicateur de churn numérique (moyennes et sommes des onglets). Gardé
+    # en int64: une somme groupby conserve le type et déborderait en int8
+    churn = df['Churn Label'] if 'Churn Label' in df.columns else df['Churn']
+    df['Is_Churned'] = (churn == 'Yes').to_numpy(dtype=np.int64)
+
+    # Catégories CLV
+    if 'CLTV' in df.columns:
+        df['CLV_Cat'] = pd.cut(df['CLTV'], bins=CLV_BINS, labels=CLV_LABELS)
+
+    # Ancienneté en années
+    if 'Tenure in Months' in df.columns:
+        df['Tenure_Years'] = pd.cut(df['Tenure in Months'], bins=TENURE_BINS,
+                                    labels=TENURE_LABELS)
+
+    return df
+
+
+def missing_features(df: pd.DataFrame) -> List[str]:
+    """
+    Colonnes calculées attendues mais absentes d'un dataset
+
+    Args:
+        df: Dataset préparé ou vue filtrée
+
+    Returns:
+        Noms des colonnes manquantes (liste vide si le dataset est complet)
+    """
+    return [col for col, source in DERIVED_COLUMNS.items()
+            if col not in df.columns and (source is None or source in df.columns)]
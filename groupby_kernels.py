@@ -0,0 +1,314 @@
+"""
+⚙️ NOYAUX DE REGROUPEMENT - Comptages et sommes par codes entiers
+
+Features:
+- Chaque dimension factorisée une fois en codes entiers (codes des
+  colonnes catégorielles repris tels quels, sans tri ni hachage)
+- Croisements à plusieurs dimensions par codes combinés (ravel_multi_index)
+- Comptages, sommes et premières valeurs par groupe avec np.bincount /
+  np.add.at / np.minimum.at, sans groupby pandas ni lambda
+- churn_stats: Total et Churned par modalité, même contrat que
+  SqliteSource.churn_stats et que groupby(observed=True).agg({...})
+- Benchmark contre le chemin pandas: python groupby_kernels.py [lignes ...]
+
+Author: EthicalDataBoost
+Date: 2026-10-17
+Version: 1.0
+"""
+
+import sys
+import time
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# ========================================
+# CONSTANTES
+# ========================================
+
+# Croisements: jusqu'à ce nombre de combinaisons possibles (ou le nombre
+# de lignes), groupes trouvés par un bincount dense plutôt qu'un hachage
+DENSE_MAX_COMBINATIONS = 1 << 20
+
+
+# ========================================
+# CODES DE GROUPE
+# ========================================
+
+def factorize(series: pd.Series, keep_empty: bool = False) -> Tuple[np.ndarray, pd.Index]:
+    """
+    Codes entiers d'une colonne (-1: valeur manquante)
+
+    Args:
+        series: Colonne de regroupement
+        keep_empty: Garder les modalités catégorielles absentes des lignes
+
+    Returns:
+        (code de chaque ligne, modalités triées, type de la colonne conservé)
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy().astype(np.int64)
+        values = pd.CategoricalIndex(series.cat.categories, dtype=series.dtype)
+        if not keep_empty:
+            valid = valid_codes(codes)
+            present = np.flatnonzero(np.bincount(codes if valid is None else codes[valid],
+                                                 minlength=len(values)))
+            if len(present) < len(values):
+                # Renumérotation des seules modalités présentes
+                lookup = np.full(len(values) + 1, -1, dtype=np.int64)
+                lookup[present] = np.arange(len(present))
+                codes = lookup[codes]
+                values = values[present]
+        return codes, values
+
+    codes, uniques = pd.factorize(series, sort=True)
+    return codes.astype(np.int64), pd.Index(uniques)
+
+
+def group_codes(df: pd.DataFrame, keys: Sequence[str],
+                keep_empty: bool = False) -> Tuple[np.ndarray, List[pd.Index]]:
+    """
+    Codes de groupe d'une ou plusieurs colonnes (-1: une clé manquante)
+
+    Plusieurs clés: codes par clé combinés, puis renumérotés; seules les
+    combinaisons présentes forment un groupe (ordre lexicographique).
+
+    Args:
+        df: Lignes à regrouper
+        keys: Colonnes de regroupement
+        keep_empty: Une seule clé: garder les modalités catégorielles absentes
+
+    Returns:
+        (code de chaque ligne, modalités de chaque clé alignées sur les groupes)
+    """
+    if len(keys) == 1:
+        codes, values = factorize(df[keys[0]], keep_empty)
+        return codes, [values]
+
+    level_codes, levels = [], []
+    for key in keys:
+        codes, values = factorize(df[key])
+        level_codes.append(codes)
+        levels.append(values)
+
+    # Lignes dont une clé manque (None: aucune)
+    missing = None
+    for codes in level_codes:
+        valid = valid_codes(codes)
+        if valid is not None:
+            missing = ~valid if missing is None else missing | ~valid
+    if missing is not None:
+        level_codes = [np.where(missing, 0, codes) for codes in level_codes]
+
+    shape = [max(len(level), 1) for level in levels]
+    n_combinations = int(np.prod(shape, dtype=np.float64))
+    if n_combinations >= 2 ** 62:
+        raise ValueError(f"Croisement trop grand: {n_combinations:.3g} combinaisons")
+    # Code combiné (ravel_multi_index en ordre C, sans tableau intermédiaire)
+    combined = level_codes[0]
+    for codes, size in zip(level_codes[1:], shape[1:]):
+        combined = combined * size + codes
+
+    if n_combinations <= max(len(df), DENSE_MAX_COMBINATIONS):
+        # Produit cartésien raisonnable: combinaisons présentes par bincount
+        groups = np.flatnonzero(np.bincount(combined if missing is None else combined[~missing],
+                                            minlength=n_combinations))
+        if missing is None and len(groups) == n_combinations:
+            codes = combined
+        else:
+            lookup = np.full(n_combinations + 1, -1, dtype=np.int64)
+            lookup[groups] = np.arange(len(groups))
+            codes = lookup[combined if missing is None else np.where(missing, -1, combined)]
+    else:
+        if missing is not None:
+            combined[missing] = -1
+        codes, groups = pd.factorize(combined, sort=True)
+        if len(groups) and groups[0] == -1:
+            codes = codes - 1
+            groups = groups[1:]
+    positions = np.unravel_index(np.asarray(groups), shape)
+    return codes.astype(np.int64, copy=False), [level[pos] for level, pos in zip(levels, positions)]
+
+
+# ========================================
+# NOYAUX
+# ========================================
+
+def valid_codes(codes: np.ndarray) -> Optional[np.ndarray]:
+    """Masque des codes valides, None si aucun code n'est manquant (-1)"""
+    if len(codes) == 0 or codes.min() >= 0:
+        return None
+    return codes >= 0
+
+
+def group_count(codes: np.ndarray, n_groups: int) -> np.ndarray:
+    """Nombre de lignes par groupe (codes -1 ignorés)"""
+    valid = valid_codes(codes)
+    return np.bincount(codes if valid is None else codes[valid], minlength=n_groups)
+
+
+def group_sum(codes: np.ndarray, values: np.ndarray, n_groups: int) -> np.ndarray:
+    """
+    Somme par groupe (valeurs manquantes ignorées, comme pandas)
+
+    Entiers et booléens: résultat int64 exact (np.bincount pondéré tant
+    que les sommes restent exactes en flottant, np.add.at au-delà);
+    flottants par np.bincount pondéré.
+    """
+    values = np.asarray(values)
+    valid = valid_codes(codes)
+
+    if values.dtype.kind in 'iub':
+        values = values.astype(np.int64, copy=False)
+        if valid is not None:
+            codes, values = codes[valid], values[valid]
+        bound = max(abs(int(values.min())), abs(int(values.max()))) if len(values) else 0
+        if bound * len(values) < 2 ** 53:
+            return np.bincount(codes, weights=values, minlength=n_groups).astype(np.int64)
+        sums = np.zeros(n_groups, dtype=np.int64)
+        np.add.at(sums, codes, values)
+        return sums
+
+    values = values.astype('float64', copy=False)
+    present = ~np.isnan(values)
+    if valid is not None:
+        present &= valid
+    return np.bincount(codes[present], weights=values[present], minlength=n_groups)
+
+
+def group_first(codes: np.ndarray, series: pd.Series, n_groups: int) -> pd.Series:
+    """Première valeur non manquante de chaque groupe (agrégat 'first')"""
+    rows = np.flatnonzero((codes >= 0) & series.notna().to_numpy())
+    first = np.full(n_groups, len(codes), dtype=np.int64)
+    np.minimum.at(first, codes[rows], rows)
+
+    # Groupe sans valeur: position -1, absente -> valeur manquante
+    positions = np.where(first < len(codes), first, -1)
+    return series.reset_index(drop=True).reindex(positions).reset_index(drop=True)
+
+
+def group_rate(part: np.ndarray, total: np.ndarray) -> np.ndarray:
+    """Taux en pourcentage par groupe (0 pour un groupe vide)"""
+    part = np.asarray(part, dtype='float64')
+    total = np.asarray(total, dtype='float64')
+    return np.divide(part, total, out=np.zeros_like(part), where=total != 0) * 100
+
+
+def churn_stats(df: pd.DataFrame, keys: Sequence[str], churn_column: str = 'Is_Churned',
+                first_columns: Sequence[str] = (),
+                count_column: Optional[str] = None) -> pd.DataFrame:
+    """
+    Total et Churned par modalité d'une ou plusieurs colonnes
+
+    Mêmes lignes, types et ordre que
+    df.groupby(keys, observed=True).agg({'CustomerID': 'count',
+    churn_column: 'sum', col: 'first'}).reset_index() sur un dataset dont
+    chaque ligne a un identifiant client.
+
+    Args:
+        df: Lignes à regrouper
+        keys: Colonnes de regroupement (croisement si plusieurs)
+        churn_column: Indicateur numérique du churn (sommé)
+        first_columns: Colonnes reprises de la première ligne non nulle
+        count_column: Ne compter que les valeurs non nulles de cette
+            colonne (None: lignes du groupe; le test des valeurs nulles
+            d'une colonne texte coûte plus que tout le regroupement)
+
+    Returns:
+        DataFrame keys + ['Total', 'Churned'] + first_columns
+    """
+    keys = list(keys)
+    codes, labels = group_codes(df, keys)
+    n_groups = len(labels[0])
+
+    if count_column is not None:
+        codes_counted = np.where(df[count_column].notna().to_numpy(), codes, -1)
+    else:
+        codes_counted = codes
+    stats = {key: values for key, values in zip(keys, labels)}
+    stats['Total'] = group_count(codes_counted, n_groups)
+    stats['Churned'] = group_sum(codes, df[churn_column].to_numpy(), n_groups)
+    for col in first_columns:
+        stats[col] = group_first(codes, df[col], n_groups)
+
+    return pd.DataFrame({
+        col: values.to_numpy() if isinstance(values, pd.Series) else values
+        for col, values in stats.items()
+    })
+
+
+# ========================================
+# BENCHMARK
+# ========================================
+
+def _benchmark_frame(n_rows: int, n_cities: int = 3000, seed: int = 42) -> pd.DataFrame:
+    """Dataset minimal aux types du snapshot (dimensions catégorielles)"""
+    rng = np.random.default_rng(seed)
+    contracts = ['Month-to-Month', 'One Year', 'Two Year']
+    internet = ['Cable', 'DSL', 'Fiber Optic', 'None']
+    cities = [f'City {i:05d}' for i in range(n_cities)]
+
+    return pd.DataFrame({
+        'CustomerID': pd.RangeIndex(n_rows).astype(str),
+        'City': pd.Categorical.from_codes(rng.integers(0, n_cities, n_rows), categories=cities),
+        'Contract': pd.Categorical.from_codes(rng.integers(0, len(contracts), n_rows),
+                                              categories=contracts),
+        'Internet Type': pd.Categorical.from_codes(rng.integers(0, len(internet), n_rows),
+                                                   categories=internet),
+        'Is_Churned': (rng.random(n_rows) < 0.265).astype(np.int64),
+        'Latitude': rng.uniform(32.5, 42.0, n_rows)
+    })
+
+
+def benchmark(n_rows: int) -> pd.DataFrame:
+    """
+    Durées du chemin pandas et des noyaux sur un dataset synthétique
+
+    Returns:
+        Une ligne par regroupement: durées (s), accélération, égalité des tables
+    """
+    df = _benchmark_frame(n_rows)
+    cases = [
+        (['Contract'], ()),
+        (['City'], ('Latitude',)),
+        (['Contract', 'Internet Type'], ()),
+        (['City', 'Contract'], ())
+    ]
+
+    results = []
+    for keys, first_columns in cases:
+        spec = {'CustomerID': 'count', 'Is_Churned': 'sum', **{col: 'first' for col in first_columns}}
+
+        start = time.perf_counter()
+        expected = df.groupby(keys, observed=True).agg(spec).reset_index()
+        pandas_time = time.perf_counter() - start
+        expected.columns = keys + ['Total', 'Churned'] + list(first_columns)
+
+        start = time.perf_counter()
+        stats = churn_stats(df, keys, first_columns=first_columns)
+        kernel_time = time.perf_counter() - start
+
+        results.append({
+            'Regroupement': ' x '.join(keys),
+            'Groupes': len(stats),
+            'pandas (s)': round(pandas_time, 3),
+            'noyaux (s)': round(kernel_time, 3),
+            'Accélération': round(pandas_time / kernel_time, 1) if kernel_time else np.inf,
+            'Identique': stats.equals(expected)
+        })
+    return pd.DataFrame(results)
+
+
+def main(argv) -> int:
+    """Comparer pandas et les noyaux (python groupby_kernels.py [lignes ...])"""
+    sizes = [int(arg) for arg in argv] or [1_000_000, 10_000_000]
+    for n_rows in sizes:
+        print(f"📏 {n_rows:,} lignes")
+        print(benchmark(n_rows).to_string(index=False))
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
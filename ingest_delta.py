@@ -0,0 +1,57 @@
+"""
+📥 INGESTION DELTA - Fusion d'un extrait mensuel dans le dataset en cache
+
+Features:
+- Fusion par CustomerID: clients modifiés réécrits, nouveaux clients ajoutés
+- Normalisation et colonnes calculées limitées aux lignes du delta
+- Seules les colonnes réellement modifiées sont réécrites
+- Valeurs non numériques de l'extrait signalées (et ajoutées au profil qualité)
+- Un même fichier delta n'est appliqué qu'une seule fois
+- Agrégats sans filtre et cube OLAP mis à jour à partir des seules lignes
+  du delta (pas de recalcul complet au prochain chargement)
+
+Usage:
+    python ingest_delta.py delta_2024_03.csv [telco_churn_master.csv]
+
+Author: EthicalDataBoost
+Date: 2026-10-17
+Version: 1.0
+"""
+
+import sys
+
+from incremental_aggregates import ingest_delta_incremental
+
+
+def main(argv) -> int:
+    """Point d'entrée en ligne de commande"""
+    if not argv:
+        print(__doc__)
+        return 1
+
+    # Import tardif: même normalisation que le dashboard
+    from streamlit_app import _build_dataset, _find_data_file
+
+    delta_path = argv[0]
+    csv_path = argv[1] if len(argv) > 1 else _find_data_file()
+    if csv_path is None:
+        print("❌ Fichier telco_churn_master.csv introuvable")
+        return 1
+
+    summary = ingest_delta_incremental(csv_path, delta_path, _build_dataset)
+
+    if summary['skipped']:
+        print(f"⏭️ {delta_path} déjà appliqué")
+    else:
+        print(f"✅ {summary['updated']} clients mis à jour, {summary['inserted']} ajoutés")
+        print(f"   Colonnes modifiées: {', '.join(summary['changed_columns']) or 'aucune'}")
+        for col, counts in summary['coercion'].items():
+            if counts['failures']:
+                print(f"   ⚠️ {col}: {counts['failures']} valeur(s) non numérique(s) remplacée(s) par 0")
+        for name, done in summary['refreshed'].items():
+            print(f"   {name}: {'mis à jour' if done else 'recalcul complet au prochain chargement'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
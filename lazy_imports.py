@@ -0,0 +1,162 @@
+"""
+💤 IMPORTS DIFFÉRÉS - Modules lourds chargés à la première utilisation
+
+Features:
+- Proxy de module: l'import réel a lieu au premier accès à un attribut
+- Registre des modules lourds du dashboard et de la fonctionnalité qui les utilise
+- Rapport du temps d'import du point d'entrée (python lazy_imports.py)
+
+Author: EthicalDataBoost
+Date: 2026-10-17
+Version: 1.0
+"""
+
+import importlib
+import json
+import subprocess
+import sys
+import types
+from typing import Any, Callable, Dict, List
+
+# ========================================
+# REGISTRE DES MODULES LOURDS
+# ========================================
+
+# Module -> fonctionnalité qui le charge. Aucun ne doit être importé au
+# démarrage du point d'entrée (vérifié par le rapport).
+HEAVY_MODULES = {
+    'plotly.express': "Carte, sunburst et treemap",
+    'scipy.stats': "Tests statistiques (Chi², corrélation, régression)",
+    'statsmodels': "Non utilisé par les onglets actuels",
+    'reportlab': "Export PDF du plan d'action",
+    'wordcloud': "Non utilisé par les onglets actuels",
+    'openpyxl': "Non utilisé par les onglets actuels",
+    'nps_simulator_component': "Simulateur NPS de l'onglet Satisfaction"
+}
+
+
+# ========================================
+# PROXYS
+# ========================================
+
+class LazyModule(types.ModuleType):
+    """
+    Module importé au premier accès à l'un de ses attributs
+
+    Usage:
+        px = LazyModule('plotly.express')
+        px.treemap(...)  # import de plotly.express ici
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._module = None
+
+    def _load(self) -> types.ModuleType:
+        if self._module is None:
+            # importlib sérialise les imports concurrents (sessions en threads)
+            self._module = importlib.import_module(self.__name__)
+        return self._module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = 'chargé' if self._module is not None else 'différé'
+        return f"<LazyModule '{self.__name__}' ({state})>"
+
+
+def lazy_module(name: str) -> LazyModule:
+    """Module chargé à la première utilisation"""
+    return LazyModule(name)
+
+
+def lazy_attribute(module: str, attr: str) -> Callable:
+    """
+    Fonction d'un module chargé à son premier appel
+
+    Usage:
+        make_subplots = lazy_attribute('plotly.subplots', 'make_subplots')
+    """
+    proxy = LazyModule(module)
+
+    def call(*args, **kwargs):
+        return getattr(proxy, attr)(*args, **kwargs)
+
+    call.__name__ = attr
+    call.__qualname__ = attr
+    call.__doc__ = f"{module}.{attr} (import différé)"
+    return call
+
+
+# ========================================
+# RAPPORT DE TEMPS D'IMPORT
+# ========================================
+
+def import_time_report(entry_point: str = 'streamlit_app', top: int = 15) -> Dict:
+    """
+    Mesurer l'import d'un module dans un interpréteur neuf (-X importtime)
+
+    Args:
+        entry_point: Module mesuré
+        top: Nombre de modules les plus coûteux retenus
+
+    Returns:
+        Durée totale (ms), imports directs les plus coûteux (cumulé, ms) et
+        modules lourds du registre effectivement chargés à l'import
+    """
+    probe = (
+        f"import sys, json; import {entry_point}; "
+        f"print(json.dumps([m for m in {list(HEAVY_MODULES)!r} if m in sys.modules]))"
+    )
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', probe],
+        capture_output=True, text=True, check=True
+    )
+
+    # -X importtime liste les sous-modules (indentés) avant leur parent
+    children: List[tuple] = []
+    total = 0.0
+    direct: List[tuple] = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not cumulative.strip().isdigit():
+            continue
+        ms = int(cumulative) / 1000
+        indent = len(name) - len(name.lstrip()) - 1
+        if indent == 0:
+            if name.strip() == entry_point:
+                total, direct = ms, children
+            children = []
+        elif indent == 2:
+            children.append((name.strip(), ms))
+
+    loaded = json.loads(result.stdout.strip().splitlines()[-1])
+
+    return {
+        'entry_point': entry_point,
+        'total_ms': total,
+        'top': sorted(direct, key=lambda item: item[1], reverse=True)[:top],
+        'heavy_loaded': loaded
+    }
+
+
+def main(argv) -> int:
+    """Afficher le rapport d'import du point d'entrée"""
+    report = import_time_report(*(argv[:1] or ['streamlit_app']))
+
+    print(f"Import de {report['entry_point']}: {report['total_ms']:.0f} ms")
+    print()
+    for name, ms in report['top']:
+        print(f"  {ms:8.1f} ms  {name}")
+    print()
+    for module, feature in HEAVY_MODULES.items():
+        state = '⚠️ chargé' if module in report['heavy_loaded'] else '✅ différé'
+        print(f"  {state:10} {module:26} {feature}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,314 @@
+"""
+🧊 CUBE OLAP - Mesures additives pré-agrégées sur les dimensions des filtres
+
+Features:
+- Une cellule par combinaison observée de Tranche_Age, Contract, City,
+  Offer, Gender et Customer Status (valeur manquante = modalité à part)
+- Mesures additives par cellule: clients, churnés, histogramme des scores
+  de satisfaction, sommes CLTV et Monthly Charge
+- Construit une fois par version des données, persisté à côté du snapshot
+- Toute sélection de filtres se résout par roll-up des cellules: KPI,
+  donuts et barres de la vue d'ensemble sans relire les lignes clients
+- Mise à jour incrémentale par lots de lignes retirées / ajoutées
+
+Author: EthicalDataBoost
+Date: 2026-10-17
+Version: 1.0
+"""
+
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from columnar_store import artifact_path, load_or_build_artifact, read_artifact, write_artifact
+from data_schema import ALL_VALUES
+from streaming_aggregates import (COUNT_CODES, KEEP_EMPTY_DIMENSIONS, RunningAggregates,
+                                  dimension_codes, measures_table, row_measures)
+
+# ========================================
+# CONSTANTES
+# ========================================
+
+# Dimensions des filtres + statut (donut et KPI par statut)
+CUBE_DIMENSIONS = ['Tranche_Age', 'Contract', 'City', 'Offer', 'Gender', 'Customer Status']
+
+CUBE_FORMAT_VERSION = 1
+CUBE_SUFFIX = '.cube.pkl'
+
+
+# ========================================
+# CUBE
+# ========================================
+
+class OlapCube:
+    """
+    Cube des mesures additives par combinaison de modalités
+
+    Seules les combinaisons présentes dans les données sont stockées: le
+    cube compte au plus une cellule par client, bien moins en pratique.
+    Les comptages sont conservés en liste creuse (cellule, code, effectif):
+    un roll-up ne parcourt que les cases non vides.
+    """
+
+    def __init__(self, df: pd.DataFrame, dimensions: Sequence[str] = CUBE_DIMENSIONS):
+        """
+        Args:
+            df: Dataset complet normalisé (lu, jamais modifié)
+            dimensions: Dimensions du cube (absentes ignorées)
+        """
+        self.dimensions = [dim for dim in dimensions if dim in df.columns]
+        self.rows = len(df)
+        self.values: Dict[str, pd.Index] = {}
+        self.categorical: Dict[str, bool] = {}
+        self.slots: Dict[str, Dict[str, List[int]]] = {}
+
+        row_codes, sizes = [], []
+        for dim in self.dimensions:
+            codes, index = dimension_codes(df, [dim], keep_empty=True)
+            self.values[dim] = index
+            self.categorical[dim] = isinstance(df[dim].dtype, pd.CategoricalDtype)
+            self.slots[dim] = {}
+            for slot, value in enumerate(index):
+                self.slots[dim].setdefault(str(value), []).append(slot)
+
+            # Valeur manquante: dernière case (jamais retenue par un filtre)
+            row_codes.append(np.where(codes < 0, len(index), codes))
+            sizes.append(len(index) + 1)
+
+        combined = (np.ravel_multi_index(row_codes, sizes) if row_codes
+                    else np.zeros(len(df), dtype=np.int64))
+        cell_ids, cells = pd.factorize(combined, sort=True)
+        n_cells = len(cells)
+
+        self.cell_codes = {
+            dim: codes.astype(np.int32)
+            for dim, codes in zip(self.dimensions, np.unravel_index(np.asarray(cells), sizes))
+        }
+
+        measures = row_measures(df)
+        counts = np.bincount(cell_ids * COUNT_CODES + measures['counts'],
+                             minlength=n_cells * COUNT_CODES)
+        entries = np.flatnonzero(counts)
+        self.entry_cells = (entries // COUNT_CODES).astype(np.int32)
+        self.entry_codes = (entries % COUNT_CODES).astype(np.int64)
+        self.entry_counts = counts[entries]
+        self.n_cells = n_cells
+        self.sums = {
+            measure: np.bincount(cell_ids, weights=weights, minlength=n_cells)
+            for measure, (weights, _) in measures['sums'].items()
+        }
+        self.divisors = {measure: divisor for measure, (_, divisor) in measures['sums'].items()}
+
+    def __len__(self) -> int:
+        return self.n_cells
+
+    def apply_delta(self, removed: Optional[pd.DataFrame],
+                    added: Optional[pd.DataFrame]) -> None:
+        """
+        Mettre à jour le cube avec un lot de lignes retirées et ajoutées
+
+        Seules les cellules des lignes du lot sont touchées: nouvelles
+        modalités et nouvelles combinaisons sont ajoutées, les comptages
+        vides disparaissent de la liste creuse.
+
+        Args:
+            removed: Lignes à retirer (état avant modification), ou None
+            added: Lignes à intégrer (nouvelles ou modifiées), ou None
+
+        Raises:
+            ValueError: Lignes retirées absentes du cube
+        """
+        for rows, sign in ((removed, -1), (added, 1)):
+            if rows is not None and len(rows):
+                self._fold(rows, sign)
+
+    def _slot_codes(self, rows: pd.DataFrame, dim: str) -> np.ndarray:
+        """Case de chaque ligne dans une dimension (modalités inconnues ajoutées)"""
+        values = rows[dim].astype(object)
+        slots = self.values[dim].get_indexer(values)
+        unknown = (slots < 0) & values.notna().to_numpy()
+        if unknown.any():
+            new_values = pd.unique(values[unknown])
+            n_values = len(self.values[dim])
+            # La case des valeurs manquantes reste la dernière
+            missing = self.cell_codes[dim] == n_values
+            self.cell_codes[dim][missing] = n_values + len(new_values)
+            self.values[dim] = self.values[dim].append(pd.Index(new_values, name=dim))
+            for slot, value in enumerate(new_values, start=n_values):
+                self.slots[dim].setdefault(str(value), []).append(slot)
+            slots = self.values[dim].get_indexer(values)
+        return np.where(slots < 0, len(self.values[dim]), slots)
+
+    def _fold(self, rows: pd.DataFrame, sign: int) -> None:
+        """Ajouter (sign=1) ou retirer (sign=-1) les lignes d'un lot"""
+        row_codes = [self._slot_codes(rows, dim) for dim in self.dimensions]
+        sizes = [len(self.values[dim]) + 1 for dim in self.dimensions]
+
+        # Cellule de chaque ligne: existante, sinon nouvelle combinaison.
+        # Cellules candidates: même modalité que le lot dans la dimension
+        # la plus fine (peu de cellules à comparer, pas tout le cube)
+        if self.dimensions:
+            keys = np.ravel_multi_index(row_codes, sizes)
+            finest = int(np.argmax(sizes))
+            candidates = np.flatnonzero(np.isin(self.cell_codes[self.dimensions[finest]],
+                                                row_codes[finest]))
+            cell_keys = np.ravel_multi_index(
+                [self.cell_codes[dim][candidates].astype(np.int64) for dim in self.dimensions], sizes)
+        else:
+            keys = np.zeros(len(rows), dtype=np.int64)
+            candidates = np.arange(self.n_cells)
+            cell_keys = np.zeros(self.n_cells, dtype=np.int64)
+        found = pd.Index(cell_keys).get_indexer(keys)
+        cell_ids = np.full(len(keys), -1, dtype=np.int64)
+        cell_ids[found >= 0] = candidates[found[found >= 0]]
+        new = cell_ids < 0
+        if new.any():
+            if sign < 0:
+                raise ValueError("Retrait de lignes absentes du cube")
+            new_keys, new_ids = np.unique(keys[new], return_inverse=True)
+            cell_ids[new] = self.n_cells + new_ids
+            for dim, codes in zip(self.dimensions, np.unravel_index(new_keys, sizes)):
+                self.cell_codes[dim] = np.concatenate(
+                    [self.cell_codes[dim], codes.astype(np.int32)])
+            self.sums = {m: np.concatenate([s, np.zeros(len(new_keys))]) for m, s in self.sums.items()}
+            self.n_cells += len(new_keys)
+
+        measures = row_measures(rows)
+        for measure, (weights, divisor) in measures['sums'].items():
+            if measure in self.sums:
+                np.add.at(self.sums[measure], cell_ids, sign * weights * (self.divisors[measure] / divisor))
+
+        # Comptages creux: entrées triées par (cellule, code); recherche
+        # binaire de la cellule puis parmi ses COUNT_CODES codes au plus
+        delta_keys, delta_counts = np.unique(cell_ids * COUNT_CODES + measures['counts'],
+                                             return_counts=True)
+        delta_cells = (delta_keys // COUNT_CODES).astype(np.int32)
+        delta_codes = delta_keys % COUNT_CODES
+        first = np.searchsorted(self.entry_cells, delta_cells, side='left')
+        end = np.searchsorted(self.entry_cells, delta_cells, side='right')
+        positions = first.copy()
+        if len(self.entry_codes):
+            last = len(self.entry_codes) - 1
+            for offset in range(COUNT_CODES):
+                at = first + offset
+                positions += (at < end) & (self.entry_codes[np.minimum(at, last)] < delta_codes)
+        found = positions < end
+        found[found] = self.entry_codes[positions[found]] == delta_codes[found]
+
+        hit = positions[found]
+        counts = self.entry_counts[hit] + sign * delta_counts[found]
+        if sign < 0 and (not found.all() or (counts < 0).any()):
+            raise ValueError("Retrait de lignes absentes du cube")
+        self.entry_counts[hit] = counts
+
+        # Listes réécrites seulement si des entrées apparaissent ou se vident
+        if not found.all():
+            missing = ~found
+            self.entry_cells = np.insert(self.entry_cells, positions[missing], delta_cells[missing])
+            self.entry_codes = np.insert(self.entry_codes, positions[missing], delta_codes[missing])
+            self.entry_counts = np.insert(self.entry_counts, positions[missing], delta_counts[missing])
+        emptied = hit[counts == 0]
+        if len(emptied):
+            self.entry_cells = np.delete(self.entry_cells, emptied)
+            self.entry_codes = np.delete(self.entry_codes, emptied)
+            self.entry_counts = np.delete(self.entry_counts, emptied)
+        self.rows += sign * len(rows)
+
+    def cell_mask(self, selection: Dict[str, List[str]]) -> Optional[np.ndarray]:
+        """
+        Cellules retenues par une sélection de filtres
+
+        Mêmes règles qu'apply_filters: une colonne sans sélection ou
+        contenant 'Tout' n'est pas filtrée, une colonne absente est ignorée.
+
+        Returns:
+            Masque booléen des cellules, ou None si aucun filtre n'est actif
+        """
+        mask = None
+        for column, values in selection.items():
+            if not values or ALL_VALUES in values or column not in self.cell_codes:
+                continue
+            allowed = np.zeros(len(self.values[column]) + 1, dtype=bool)
+            allowed[[slot for value in values for slot in self.slots[column].get(str(value), [])]] = True
+            selected = allowed[self.cell_codes[column]]
+            mask = selected if mask is None else mask & selected
+        return mask
+
+    def rollup(self, selection: Dict[str, List[str]]) -> RunningAggregates:
+        """
+        Agrégats par dimension du cube pour une sélection de filtres
+
+        Args:
+            selection: Sélection par colonne (render_filter_widgets)
+
+        Returns:
+            Agrégats des dimensions du cube (tables identiques à celles de
+            RunningAggregates.from_frame sur les lignes filtrées)
+        """
+        mask = self.cell_mask(selection)
+        sums = {m: (s if mask is None else s[mask]) for m, s in self.sums.items()}
+        if mask is None:
+            entry_cells, entry_codes, entry_counts = self.entry_cells, self.entry_codes, self.entry_counts
+        else:
+            kept = mask[self.entry_cells]
+            entry_cells, entry_codes, entry_counts = (
+                self.entry_cells[kept], self.entry_codes[kept], self.entry_counts[kept])
+
+        tables = {}
+        for dim in self.dimensions:
+            codes = self.cell_codes[dim] if mask is None else self.cell_codes[dim][mask]
+            n_slots = len(self.values[dim]) + 1
+
+            # Un bincount pour tous les comptages: case (modalité, code)
+            grouped = np.bincount(
+                self.cell_codes[dim][entry_cells] * COUNT_CODES + entry_codes,
+                weights=entry_counts, minlength=n_slots * COUNT_CODES
+            ).reshape(n_slots, COUNT_CODES)[:-1]
+            grouped_sums = {
+                measure: np.bincount(codes, weights=values, minlength=n_slots)[:-1] / self.divisors[measure]
+                for measure, values in sums.items()
+            }
+
+            table = measures_table(np.rint(grouped).astype(np.int64), grouped_sums, self.values[dim])
+            if not (self.categorical[dim] and dim in KEEP_EMPTY_DIMENSIONS):
+                # Modalités observées seulement, comme un groupby observed=True
+                table = table[table['Total'] > 0]
+            tables[dim] = table
+
+        return RunningAggregates.from_tables(tables, int(entry_counts.sum()))
+
+
+# ========================================
+# PERSISTANCE
+# ========================================
+
+def cube_path(csv_path: str) -> str:
+    """Fichier du cube d'un CSV (à côté de son snapshot)"""
+    return artifact_path(csv_path, CUBE_SUFFIX)
+
+
+def write_cube(cube: OlapCube, path: str, token: str) -> None:
+    """Écrire un cube sur disque (remplacement atomique)"""
+    write_artifact(path, token, CUBE_FORMAT_VERSION, {'cube': cube})
+
+
+def read_cube(path: str, token: str) -> Optional[OlapCube]:
+    """Relire un cube persisté (None si absent, illisible ou périmé)"""
+    payload = read_artifact(path, token, CUBE_FORMAT_VERSION)
+    return None if payload is None else payload['cube']
+
+
+def load_or_build_cube(path: str, token: str, build_fn: Callable[[], OlapCube]) -> OlapCube:
+    """
+    Cube persisté à jour, reconstruit si les données ont changé
+
+    Args:
+        path: Fichier du cube
+        token: Jeton de l'état des données (snapshot_token)
+        build_fn: Construction complète (appelée seulement si nécessaire)
+
+    Returns:
+        Cube de cette version des données
+    """
+    return load_or_build_artifact(path, token, read_cube, write_cube, build_fn)
@@ -0,0 +1,192 @@
+"""
+🗃️ DATASET PARTITIONNÉ - Un snapshot colonnaire par valeur d'une dimension
+
+Features:
+- Base clients découpée sur disque par City, Contract... (une partition = un snapshot)
+- manifest.json: partitions, effectifs et catalogue des valeurs des filtres
+- Élagage: seules les partitions sélectionnées dans les filtres sont lues
+- Ordre et index d'origine des lignes restitués à la lecture
+
+Author: EthicalDataBoost
+Date: 2026-10-17
+Version: 1.0
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from columnar_store import (SNAPSHOT_ROOT_DIRNAME, _swap_directory, _to_json_list,
+                            read_snapshot, write_snapshot)
+
+# ========================================
+# CONSTANTES
+# ========================================
+
+PARTITION_FORMAT_VERSION = 1
+MANIFEST_FILENAME = 'manifest.json'
+
+# Position de la ligne dans le dataset complet (ordre et index restitués)
+ROW_ID_COLUMN = '__row_id'
+
+
+# ========================================
+# ÉCRITURE
+# ========================================
+
+def partition_root(csv_path: str, column: str) -> str:
+    """Répertoire des partitions d'un CSV pour une colonne donnée"""
+    csv_path = os.path.abspath(csv_path)
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    slug = ''.join(c if c.isalnum() else '_' for c in column)
+    return os.path.join(os.path.dirname(csv_path), SNAPSHOT_ROOT_DIRNAME, f'{stem}.by_{slug}')
+
+
+def _distinct_values(series: pd.Series) -> List:
+    """Valeurs distinctes triées (comme les options des filtres)"""
+    return sorted(_to_json_list(series.dropna().astype(str).unique()))
+
+
+def write_partitions(df: pd.DataFrame, root: str, column: str, token: str,
+                     catalog_columns: Optional[List[str]] = None) -> Dict:
+    """
+    Découper un DataFrame en partitions sur disque
+
+    Args:
+        df: Dataset complet normalisé (index RangeIndex)
+        root: Répertoire des partitions (remplacé atomiquement)
+        column: Colonne de partitionnement
+        token: Jeton de l'état des données source
+        catalog_columns: Colonnes dont les valeurs distinctes sont listées
+            dans le manifest (options des filtres sans lire les données)
+
+    Returns:
+        Le manifest écrit
+    """
+    parent = os.path.dirname(os.path.abspath(root))
+    os.makedirs(parent, exist_ok=True)
+    tmp_root = tempfile.mkdtemp(prefix='.tmp-', dir=parent)
+
+    try:
+        keys = df[column].astype(str).where(df[column].notna())
+        row_ids = pd.Series(np.arange(len(df), dtype=np.int64), index=df.index, name=ROW_ID_COLUMN)
+        indexed = pd.concat([df, row_ids], axis=1)
+
+        partitions = []
+        for i, (value, part) in enumerate(indexed.groupby(keys, dropna=False, sort=True)):
+            part_dir = f'part-{i:05d}'
+            write_snapshot(part.reset_index(drop=True), os.path.join(tmp_root, part_dir),
+                           {'partition': None if pd.isna(value) else value})
+            partitions.append({
+                'value': None if pd.isna(value) else value,
+                'dir': part_dir,
+                'n_rows': len(part)
+            })
+
+        manifest = {
+            'format_version': PARTITION_FORMAT_VERSION,
+            'token': token,
+            'partition_by': column,
+            'n_rows': len(df),
+            'partitions': partitions,
+            'values': {
+                col: _distinct_values(df[col])
+                for col in (catalog_columns or []) if col in df.columns
+            }
+        }
+        with open(os.path.join(tmp_root, MANIFEST_FILENAME), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
+
+        _swap_directory(tmp_root, root)
+        return manifest
+    except Exception:
+        shutil.rmtree(tmp_root, ignore_errors=True)
+        raise
+
+
+# ========================================
+# LECTURE
+# ========================================
+
+def read_manifest(root: str) -> Optional[Dict]:
+    """Lire le manifest des partitions (None si absent ou illisible)"""
+    try:
+        with open(os.path.join(root, MANIFEST_FILENAME), encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if manifest.get('format_version') != PARTITION_FORMAT_VERSION:
+        return None
+    return manifest
+
+
+def read_partitions(root: str, manifest: Dict, values: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Lire les partitions correspondant à une sélection
+
+    Args:
+        root: Répertoire des partitions
+        manifest: Manifest lu par read_manifest
+        values: Valeurs de la colonne de partitionnement à lire (None: toutes)
+
+    Returns:
+        Lignes des partitions lues, dans l'ordre et avec l'index du dataset complet
+    """
+    if not manifest['partitions']:
+        return pd.DataFrame()
+
+    wanted = None if values is None else set(values)
+    selected = [p for p in manifest['partitions']
+                if wanted is None or p['value'] in wanted]
+
+    if not selected:
+        # Aucune partition: structure conservée (colonnes et types)
+        frame = read_snapshot(os.path.join(root, manifest['partitions'][0]['dir'])).iloc[:0]
+        return frame.drop(columns=ROW_ID_COLUMN)
+
+    # Une partition: memory-mappée sans copie. Plusieurs: lues en mémoire,
+    # la concaténation copie de toute façon (et un mapping = un descripteur)
+    mmap = len(selected) == 1
+    frames = [read_snapshot(os.path.join(root, p['dir']), mmap=mmap) for p in selected]
+    df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+    row_ids = df[ROW_ID_COLUMN].to_numpy()
+    if len(frames) > 1:
+        order = np.argsort(row_ids, kind='stable')
+        df = df.take(order)
+        row_ids = row_ids[order]
+
+    df = df.drop(columns=ROW_ID_COLUMN)
+    df.index = pd.Index(row_ids)
+    return df
+
+
+def load_or_build_partitions(csv_path: str, column: str, token: str,
+                             load_fn: Callable[[], pd.DataFrame],
+                             catalog_columns: Optional[List[str]] = None) -> Dict:
+    """
+    Manifest des partitions à jour, reconstruites si les données ont changé
+
+    Args:
+        csv_path: CSV source
+        column: Colonne de partitionnement
+        token: Jeton de l'état des données (snapshot_token)
+        load_fn: Chargement du dataset complet (appelé seulement si nécessaire)
+        catalog_columns: Colonnes du catalogue de filtres
+
+    Returns:
+        Manifest, avec la clé 'root' (répertoire des partitions)
+    """
+    root = partition_root(csv_path, column)
+    manifest = read_manifest(root)
+
+    if manifest is None or manifest.get('token') != token:
+        manifest = write_partitions(load_fn(), root, column, token, catalog_columns)
+
+    return dict(manifest, root=root)
@@ -0,0 +1,136 @@
+"""
+🔥 PRÉ-CHAUFFAGE - Artefacts disque du dashboard construits avant la première visite
+
+Features:
+- À lancer au démarrage du serveur, avant streamlit run
+- Processus séparé: seuls les artefacts sur disque sont préparés; les
+  caches mémoire du serveur (st.cache_resource) et les figures de la vue
+  sans filtre sont remplis par warm_up_default_view (streamlit_app.py) à
+  la première exécution de chaque version, en relisant ces artefacts
+- Dataset: parsing du CSV et snapshot colonnaire (ou relecture s'il est à jour)
+- Colonnes calculées incluses dans le snapshot; partitions et base SQLite
+  selon la configuration
+- Agrégats de la vue sans filtre persistés
+- Cube OLAP des filtres persisté (vue d'ensemble filtrée par roll-up)
+- Profil qualité des données persisté (panneau d'administration)
+- Durée de chaque étape journalisée
+
+Usage:
+    python prewarm.py [telco_churn_master.csv]
+    python prewarm.py; streamlit run streamlit_app.py
+
+Author: EthicalDataBoost
+Date: 2026-10-17
+Version: 1.0
+"""
+
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+logger = logging.getLogger('prewarm')
+
+
+@contextmanager
+def _stage(timings: Dict[str, float], name: str):
+    """Chronométrer une étape et journaliser sa durée"""
+    start = time.perf_counter()
+    yield
+    timings[name] = time.perf_counter() - start
+    logger.info("%-22s %8.1f ms", name, timings[name] * 1000)
+
+
+def prewarm(csv_path: Optional[str] = None) -> Dict[str, float]:
+    """
+    Construire tous les artefacts persistants pour la version courante du CSV
+
+    Args:
+        csv_path: CSV source (défaut: celui que trouve le dashboard)
+
+    Returns:
+        Durée de chaque étape (secondes)
+    """
+    timings: Dict[str, float] = {}
+
+    # Import tardif: même configuration et même normalisation que le dashboard
+    with _stage(timings, 'imports'):
+        import streamlit_app as app
+        from columnar_store import columns_token, load_or_build, snapshot_token
+        from data_profile import load_or_build_profile, profile_path
+        from olap_cube import OlapCube, cube_path, load_or_build_cube
+        from partitioned_store import load_or_build_partitions
+        from sqlite_store import load_or_build_database
+        from streaming_aggregates import aggregates_path, load_or_build_aggregates
+
+    csv_path = csv_path or app._find_data_file()
+    if csv_path is None:
+        raise FileNotFoundError("Fichier telco_churn_master.csv introuvable")
+    token = snapshot_token(csv_path)
+
+    if app.Config.STREAMING_MODE:
+        # Mode flux: seuls les agrégats sont servis
+        with _stage(timings, 'agrégats (flux)'):
+            load_or_build_aggregates(
+                aggregates_path(csv_path), token,
+                lambda: app._stream_dataset_aggregates(csv_path)
+            )
+    else:
+        with _stage(timings, 'dataset'):
+            df = load_or_build(csv_path, app._build_dataset)
+
+        if app.Config.PARTITION_BY:
+            with _stage(timings, 'partitions'):
+                load_or_build_partitions(
+                    csv_path, app.Config.PARTITION_BY, token, lambda: df,
+                    catalog_columns=[column for column, _, _ in app.FILTERS]
+                )
+
+        if app.Config.SQLITE_BACKEND:
+            with _stage(timings, 'base SQLite'):
+                load_or_build_database(csv_path, token, lambda: df)
+
+        with _stage(timings, 'agrégats'):
+            load_or_build_aggregates(
+                aggregates_path(csv_path), token,
+                lambda: app._build_default_aggregates(df)
+            )
+
+        with _stage(timings, 'cube OLAP'):
+            load_or_build_cube(cube_path(csv_path), token, lambda: OlapCube(df))
+
+        with _stage(timings, 'profil qualité'):
+            load_or_build_profile(profile_path(csv_path), token, lambda: df,
+                                  lambda column: columns_token(csv_path, [column], token))
+
+    logger.info("%-22s %8.1f ms", 'total', sum(timings.values()) * 1000)
+    return timings
+
+
+def main(argv) -> int:
+    """
+    Point d'entrée en ligne de commande
+
+    Un échec n'est jamais bloquant: le dashboard construira lui-même ce
+    qui manque à la première visite (code retour 1, serveur lancé quand même
+    avec `;`).
+    """
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
+
+    try:
+        prewarm(argv[0] if argv else None)
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        return 1
+    except Exception as e:
+        # Trace complète journalisée: le serveur démarre quand même
+        logger.exception("❌ Pré-chauffage interrompu (%s): caches construits à la première visite", e)
+        return 1
+
+    print("✅ Artefacts prêts")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,204 @@
+"""
+🗃️ CACHE DES SÉLECTIONS - Résultats par combinaison de filtres (LRU)
+
+Features:
+- Clé normalisée: filtres inactifs ('Tout' ou vide) ignorés, ordre des
+  colonnes et des valeurs sans importance
+- Une entrée par sélection: lignes retenues et résultats dérivés nommés
+  (agrégats de la vue d'ensemble...)
+- Éviction LRU bornée en nombre d'entrées et en mémoire estimée
+- Compteurs de hits / misses / évictions
+- Chaque résultat porte la version des colonnes qu'il lit (columns_token):
+  après un delta, seuls les résultats dont une colonne a changé sont
+  recalculés, les autres restent servis
+
+Author: EthicalDataBoost
+Date: 2026-10-17
+Version: 1.0
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data_schema import ALL_VALUES
+
+# ========================================
+# CONSTANTES
+# ========================================
+
+DEFAULT_MAX_ENTRIES = 64
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+SelectionKey = Tuple[Tuple[str, Tuple[str, ...]], ...]
+
+
+# ========================================
+# CLÉ DE SÉLECTION
+# ========================================
+
+def selection_key(selection: Dict[str, List[str]]) -> SelectionKey:
+    """
+    Clé normalisée d'une sélection de filtres
+
+    Args:
+        selection: Sélection par colonne (render_filter_widgets)
+
+    Returns:
+        Tuple trié des seuls filtres actifs; () si aucun filtre
+    """
+    return tuple(sorted(
+        (column, tuple(sorted({str(value) for value in values})))
+        for column, values in selection.items()
+        if values and ALL_VALUES not in values
+    ))
+
+
+# ========================================
+# ESTIMATION MÉMOIRE
+# ========================================
+
+def estimate_nbytes(value: Any) -> int:
+    """Taille approximative d'un résultat mis en cache (octets)"""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=False).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=False))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_nbytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_nbytes(v) for v in value)
+    if hasattr(value, '__dict__'):
+        # Objets composés (RunningAggregates...): somme de leurs attributs
+        return sys.getsizeof(value) + estimate_nbytes(vars(value))
+    return sys.getsizeof(value)
+
+
+# ========================================
+# CACHE LRU
+# ========================================
+
+class SelectionCache:
+    """
+    Cache LRU des résultats par sélection de filtres
+
+    Chaque entrée (une sélection) regroupe des résultats nommés. Une
+    entrée utilisée remonte en tête; les moins récemment utilisées sont
+    évincées dès que le nombre d'entrées ou la mémoire estimée dépasse
+    les bornes. Les résultats sont partagés entre sessions: ils ne doivent
+    pas être modifiés en place.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._entries: 'OrderedDict[SelectionKey, Dict[str, Any]]' = OrderedDict()
+        self._versions: Dict[Tuple[SelectionKey, str], Optional[str]] = {}
+        self._sizes: Dict[SelectionKey, int] = {}
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key: SelectionKey, name: str, compute: Callable[[], Any],
+                       version: Optional[str] = None) -> Any:
+        """
+        Résultat nommé d'une sélection, calculé au premier accès
+
+        Args:
+            key: Clé de la sélection (selection_key)
+            name: Nom du résultat ('rows', 'overview'...)
+            compute: Calcul du résultat (hors verrou)
+            version: Version des données lues par le résultat: un résultat
+                mis en cache pour une autre version est recalculé
+
+        Returns:
+            Résultat mis en cache ou fraîchement calculé
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and name in entry and self._versions.get((key, name)) == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[name]
+            self.misses += 1
+
+        # Calcul hors verrou: deux sessions peuvent calculer le même
+        # résultat, la seconde écriture remplace la première
+        value = compute()
+        self.put(key, name, value, version)
+        return value
+
+    def put(self, key: SelectionKey, name: str, value: Any,
+            version: Optional[str] = None) -> None:
+        """Enregistrer un résultat (et sa version) puis évincer au-delà des bornes"""
+        size = estimate_nbytes(value)
+
+        with self._lock:
+            entry = self._entries.setdefault(key, {})
+            if name in entry:
+                old = estimate_nbytes(entry[name])
+                self._sizes[key] -= old
+                self._nbytes -= old
+            entry[name] = value
+            self._versions[(key, name)] = version
+            self._sizes[key] = self._sizes.get(key, 0) + size
+            self._nbytes += size
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def refresh_size(self, key: SelectionKey, name: str) -> None:
+        """
+        Remesurer un résultat complété après sa mise en cache
+
+        Pour les résultats mémoïsés paresseusement (magasin des croisements):
+        leur taille grandit après put; la borne mémoire doit en tenir compte.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or name not in entry:
+                # Entrée déjà évincée: rien à compter
+                return
+            old = self._sizes[key]
+            self._sizes[key] = sum(estimate_nbytes(value) for value in entry.values())
+            self._nbytes += self._sizes[key] - old
+            self._evict(keep=key)
+
+    def _evict(self, keep: Optional[SelectionKey] = None) -> None:
+        """
+        Évincer les entrées les moins récentes au-delà des bornes (verrou tenu)
+
+        L'entrée la plus récente, ou keep, est gardée même si elle dépasse
+        seule la borne.
+        """
+        keep = next(reversed(self._entries)) if keep is None else keep
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries
+                                          or self._nbytes > self.max_bytes):
+            evicted = next(key for key in self._entries if key != keep)
+            for name in self._entries.pop(evicted):
+                del self._versions[(evicted, name)]
+            self._nbytes -= self._sizes.pop(evicted)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, float]:
+        """Compteurs et occupation du cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'nbytes': self._nbytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups * 100 if lookups else 0.0
+            }
@@ -0,0 +1,304 @@
+"""
+🛢️ BASE SQLITE EMBARQUÉE - Filtres et regroupements exécutés en SQL
+
+Features:
+- Copie du dataset normalisé dans un fichier SQLite local (stdlib sqlite3)
+- Index sur les colonnes des filtres (City, Contract, Offer, Gender, Tranche_Age)
+- Sélection des filtres compilée en clause WHERE paramétrée
+- Agrégats Total / Churned calculés par GROUP BY, sans copie pandas filtrée
+- Base reconstruite quand le jeton des données change
+
+Author: EthicalDataBoost
+Date: 2026-10-17
+Version: 1.0
+"""
+
+import os
+import sqlite3
+import tempfile
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from columnar_store import SNAPSHOT_ROOT_DIRNAME
+from data_schema import ALL_VALUES
+
+# ========================================
+# CONSTANTES
+# ========================================
+
+TABLE_NAME = 'customers'
+META_TABLE_NAME = 'meta'
+
+# Position de la ligne dans le dataset complet ('first' dans l'ordre pandas)
+ROW_ID_COLUMN = '__row_id'
+
+# Colonnes indexées (colonnes des filtres du dashboard)
+INDEXED_COLUMNS = ['City', 'Contract', 'Offer', 'Gender', 'Tranche_Age']
+
+
+def _quote(identifier: str) -> str:
+    """Identifiant SQL entre guillemets (noms de colonnes avec espaces)"""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+# ========================================
+# CONSTRUCTION
+# ========================================
+
+def database_path(csv_path: str) -> str:
+    """Fichier SQLite associé à un CSV"""
+    csv_path = os.path.abspath(csv_path)
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(os.path.dirname(csv_path), SNAPSHOT_ROOT_DIRNAME, f'{stem}.sqlite')
+
+
+def _sql_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Préparer un DataFrame pour l'écriture SQL
+
+    Les colonnes catégorielles sont écrites en texte (valeurs manquantes
+    en NULL): les filtres comparent les valeurs affichées par les widgets.
+    Les noms SQL ignorent la casse: une copie à l'identique d'une colonne
+    sous un nom ne différant que par la casse n'est écrite qu'une fois.
+    """
+    columns = {}
+    seen = {}
+    for col in df.columns:
+        series = df[col]
+        if col.lower() in seen:
+            if not series.equals(df[seen[col.lower()]]):
+                raise ValueError(f"Colonnes en conflit (casse ignorée par SQLite): "
+                                 f"{seen[col.lower()]} / {col}")
+            continue
+        seen[col.lower()] = col
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            series = series.astype(object).where(series.notna(), None).map(
+                lambda v: v if v is None else str(v)
+            )
+        columns[col] = series.reset_index(drop=True)
+    frame = pd.DataFrame(columns)
+    frame[ROW_ID_COLUMN] = range(len(frame))
+    return frame
+
+
+def build_database(df: pd.DataFrame, path: str, token: str) -> None:
+    """
+    Écrire le dataset dans un fichier SQLite (remplacé atomiquement)
+
+    Args:
+        df: Dataset complet normalisé
+        path: Fichier SQLite cible
+        token: Jeton de l'état des données source
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix='.tmp-', suffix='.sqlite', dir=os.path.dirname(path))
+    os.close(fd)
+
+    try:
+        conn = sqlite3.connect(tmp_path)
+        try:
+            _sql_frame(df).to_sql(TABLE_NAME, conn, index=False, chunksize=10_000)
+            for col in INDEXED_COLUMNS:
+                if col in df.columns:
+                    conn.execute(
+                        f'CREATE INDEX {_quote("idx_" + col)} '
+                        f'ON {TABLE_NAME} ({_quote(col)})'
+                    )
+            conn.execute(f'CREATE TABLE {META_TABLE_NAME} (token TEXT)')
+            conn.execute(f'INSERT INTO {META_TABLE_NAME} VALUES (?)', (token,))
+            conn.commit()
+        finally:
+            conn.close()
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def read_token(path: str) -> Optional[str]:
+    """Jeton enregistré dans une base (None si absente ou illisible)"""
+    if not os.path.exists(path):
+        return None
+    try:
+        conn = sqlite3.connect(path)
+        try:
+            row = conn.execute(f'SELECT token FROM {META_TABLE_NAME}').fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return None
+    return row[0] if row else None
+
+
+def load_or_build_database(csv_path: str, token: str,
+                           load_fn: Callable[[], pd.DataFrame]) -> str:
+    """
+    Base SQLite à jour, reconstruite si les données ont changé
+
+    Args:
+        csv_path: CSV source
+        token: Jeton de l'état des données (snapshot_token)
+        load_fn: Chargement du dataset complet (appelé seulement si nécessaire)
+
+    Returns:
+        Chemin du fichier SQLite
+    """
+    path = database_path(csv_path)
+    if read_token(path) != token:
+        build_database(load_fn(), path, token)
+    return path
+
+
+# ========================================
+# REQUÊTES
+# ========================================
+
+def compile_where(selection: Dict[str, List[str]],
+                  columns: Optional[Sequence[str]] = None) -> Tuple[str, List]:
+    """
+    Compiler une sélection de filtres en clause WHERE
+
+    Mêmes règles qu'apply_filters: une colonne sans sélection ou contenant
+    'Tout' n'est pas filtrée, une colonne absente est ignorée.
+
+    Args:
+        selection: Sélection par colonne (render_filter_widgets)
+        columns: Colonnes de la table (None: toutes acceptées)
+
+    Returns:
+        (clause sans le mot-clé WHERE, paramètres); clause '1' si aucun filtre
+    """
+    conditions = []
+    params: List = []
+    for column, values in selection.items():
+        if not values or ALL_VALUES in values:
+            continue
+        if columns is not None and column.lower() not in {c.lower() for c in columns}:
+            continue
+        placeholders = ', '.join('?' for _ in values)
+        conditions.append(f'{_quote(column)} IN ({placeholders})')
+        params.extend(str(v) for v in values)
+
+    return (' AND '.join(conditions) or '1'), params
+
+
+class SqliteSource:
+    """
+    Base SQLite restreinte à une sélection de filtres
+
+    Les agrégats reproduisent ceux des onglets calculés en pandas:
+    Total = nombre de valeurs non nulles de count_column, Churned = nombre
+    de lignes où churn_column vaut churn_value, modalités nulles exclues,
+    triées comme un groupby pandas.
+    """
+
+    def __init__(self, path: str, selection: Optional[Dict[str, List[str]]] = None):
+        self.path = path
+        self.columns = self._table_columns()
+        self.where, self.params = compile_where(selection or {}, self.columns)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Une connexion par requête: les sessions Streamlit tournent
+        # dans des threads différents
+        conn = sqlite3.connect(self.path)
+        conn.execute('PRAGMA query_only = 1')
+        return conn
+
+    def _table_columns(self) -> List[str]:
+        conn = self._connect()
+        try:
+            rows = conn.execute(f'PRAGMA table_info({TABLE_NAME})').fetchall()
+        finally:
+            conn.close()
+        return [row[1] for row in rows]
+
+    def has(self, *columns: str) -> bool:
+        """Indiquer si toutes les colonnes existent dans la base"""
+        names = {col.lower() for col in self.columns}
+        return all(col.lower() in names for col in columns)
+
+    def _fetch(self, sql: str, params: List) -> List[tuple]:
+        conn = self._connect()
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+    def churn_stats(self, keys: List[str], count_column: str,
+                    churn_column: str, churn_value: str,
+                    first_columns: Sequence[str] = (),
+                    like: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        Total et Churned par modalité (GROUP BY sur la sélection)
+
+        Args:
+            keys: Colonnes de regroupement
+            count_column: Colonne dont les valeurs non nulles sont comptées
+            churn_column: Colonne indicatrice du churn
+            churn_value: Valeur signifiant "churné"
+            first_columns: Colonnes reprises de la première ligne de chaque
+                groupe (valeur non nulle, comme l'agrégat 'first' de pandas)
+            like: DataFrame de référence dont les types des clés sont repris
+                (catégories et ordre de tri identiques au chemin pandas)
+
+        Returns:
+            DataFrame keys + ['Total', 'Churned'] + first_columns
+        """
+        key_sql = ', '.join(_quote(k) for k in keys)
+        not_null = ' AND '.join(f'{_quote(k)} IS NOT NULL' for k in keys)
+        where = f'({self.where}) AND {not_null}'
+
+        rows = self._fetch(
+            f'SELECT {key_sql}, COUNT({_quote(count_column)}), '
+            f'COALESCE(SUM({_quote(churn_column)} = ?), 0) '
+            f'FROM {TABLE_NAME} WHERE {where} '
+            f'GROUP BY {key_sql} ORDER BY {key_sql}',
+            [churn_value] + self.params
+        )
+        stats = pd.DataFrame(rows, columns=keys + ['Total', 'Churned'])
+        stats = stats.astype({'Total': 'int64', 'Churned': 'int64'})
+
+        for col in first_columns:
+            # Une seule fonction MIN: SQLite reprend les colonnes nues de
+            # la ligne qui réalise le minimum (première ligne non nulle)
+            first_rows = self._fetch(
+                f'SELECT {key_sql}, {_quote(col)}, MIN({ROW_ID_COLUMN}) '
+                f'FROM {TABLE_NAME} WHERE {where} AND {_quote(col)} IS NOT NULL '
+                f'GROUP BY {key_sql}',
+                self.params
+            )
+            first = pd.DataFrame([row[:-1] for row in first_rows], columns=keys + [col])
+            stats = stats.merge(first, on=keys, how='left')
+
+        if like is not None:
+            stats = _match_dtypes(stats, keys, list(first_columns), like)
+        return stats
+
+
+def _match_dtypes(stats: pd.DataFrame, keys: List[str], first_columns: List[str],
+                  like: pd.DataFrame) -> pd.DataFrame:
+    """Reprendre les types du DataFrame pandas (catégories et tri des clés)"""
+    categorical = []
+    for key in keys + first_columns:
+        if key not in like.columns:
+            continue
+        dtype = like[key].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            stats[key] = pd.Categorical(
+                stats[key].map(_category_lookup(dtype)), dtype=dtype
+            )
+            if key in keys:
+                categorical.append(key)
+        elif len(stats):
+            stats[key] = stats[key].astype(dtype)
+
+    if categorical:
+        stats = stats.sort_values(keys, kind='stable').reset_index(drop=True)
+    return stats
+
+
+def _category_lookup(dtype: pd.CategoricalDtype) -> Dict[str, object]:
+    """Texte stocké en base -> catégorie d'origine (catégories non textuelles)"""
+    return {str(category): category for category in dtype.categories}
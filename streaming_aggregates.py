@@ -0,0 +1,399 @@
+"""
+🌊 AGRÉGATS EN FLUX - Ingestion par blocs du CSV Telco
+
+Features:
+- Lecture du CSV par blocs de taille fixe (pd.read_csv chunksize)
+- Même normalisation que load_data, appliquée bloc par bloc
+- Agrégats courants par dimension: Total, Churned, sommes CLTV et
+  Monthly Charge, histogramme des scores de satisfaction
+- Le DataFrame ligne à ligne complet n'est jamais gardé en mémoire
+- Agrégats persistés sur disque par version des données (pré-chauffage)
+- Mise à jour par lots de lignes retirées / ajoutées (deltas clients)
+
+Author: EthicalDataBoost
+Date: 2026-10-17
+Version: 1.0
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from columnar_store import artifact_path, load_or_build_artifact, read_artifact, write_artifact
+from groupby_kernels import group_codes
+
+# ========================================
+# CONSTANTES
+# ========================================
+
+DEFAULT_CHUNKSIZE = 50_000
+
+# Dimension -> colonnes de regroupement
+DIMENSIONS = {
+    'Tranche_Age': ['Tranche_Age'],
+    'Customer Status': ['Customer Status'],
+    'Gender': ['Gender'],
+    'Contract': ['Contract'],
+    'Offer': ['Offer'],
+    'Tenure in Months': ['Tenure in Months'],
+    'City': ['City'],
+    'Geo': ['Latitude', 'Longitude', 'City']
+}
+
+# Dimensions à modalités fixes (bins): les modalités vides sont conservées
+KEEP_EMPTY_DIMENSIONS = {'Tranche_Age'}
+
+SATISFACTION_SCORES = [1, 2, 3, 4, 5]
+
+COUNT_MEASURES = (['Total', 'Churned'] +
+                  [f'Satisfaction_{score}' for score in SATISFACTION_SCORES])
+SUM_MEASURES = ['CLTV_Sum', 'Monthly_Charge_Sum']
+
+# Mesure sommée -> colonne source
+SUM_COLUMNS = {'CLTV_Sum': 'CLTV', 'Monthly_Charge_Sum': 'Monthly Charge'}
+
+# Colonnes lues par row_measures (en plus des colonnes des dimensions)
+MEASURE_COLUMNS = ['Customer Status', 'Satisfaction Score'] + list(SUM_COLUMNS.values())
+
+# Code de comptage d'une ligne: churné (0/1) x score (0 = absent, 1..5)
+COUNT_CODES = 2 * (len(SATISFACTION_SCORES) + 1)
+
+AGGREGATES_FORMAT_VERSION = 2
+AGGREGATES_SUFFIX = '.aggregates.pkl'
+
+
+# ========================================
+# AGRÉGATS COURANTS
+# ========================================
+
+def _sum_weights(values: pd.Series) -> Tuple[np.ndarray, float]:
+    """
+    Poids d'une mesure sommée et diviseur à appliquer aux sommes
+
+    Montants au centime près: sommés en centimes entiers (somme exacte,
+    indépendante de l'ordre des lignes), sinon en flottants.
+    """
+    values = values.to_numpy(dtype='float64')
+    cents = np.round(values * 100)
+    if np.array_equal(cents / 100, values) and np.abs(cents).sum() < 2 ** 53:
+        return cents, 100.0
+    return values, 1.0
+
+
+def _in_cents(values: pd.Series) -> bool:
+    """Montants tous au centime près (sommes exactes en centimes)"""
+    return _sum_weights(values)[1] == 100.0
+
+
+def row_measures(chunk: pd.DataFrame) -> Dict[str, object]:
+    """
+    Mesures ligne à ligne d'un bloc normalisé, sous forme de tableaux
+
+    Les mesures de comptage sont réunies en un seul code par ligne
+    (churné x score de satisfaction): un bincount par dimension suffit
+    pour Total, Churned et l'histogramme des scores.
+    """
+    churned = (chunk['Customer Status'] == 'Churned').to_numpy(dtype=np.int64)
+
+    if 'Satisfaction Score' in chunk.columns:
+        # Score 1..5 -> 1..5, autres valeurs -> 0 (non comptées)
+        scores = pd.to_numeric(chunk['Satisfaction Score'], errors='coerce').to_numpy(dtype='float64')
+        valid = np.isin(scores, SATISFACTION_SCORES)
+        scores = np.where(valid, np.nan_to_num(scores), 0).astype(np.int64)
+    else:
+        scores = np.zeros(len(chunk), dtype=np.int64)
+
+    sums = {}
+    for measure, col in SUM_COLUMNS.items():
+        if col in chunk.columns:
+            sums[measure] = _sum_weights(chunk[col])
+
+    return {'counts': churned * (len(SATISFACTION_SCORES) + 1) + scores, 'sums': sums}
+
+
+def dimension_codes(chunk: pd.DataFrame, keys: List[str],
+                    keep_empty: bool) -> Tuple[np.ndarray, pd.Index]:
+    """
+    Codes de groupe d'une dimension (-1: clé manquante, ligne ignorée)
+
+    Returns:
+        (code de chaque ligne, index des groupes en valeurs simples)
+    """
+    codes, labels = group_codes(chunk, keys, keep_empty)
+    labels = [values.astype(object) if isinstance(values, pd.CategoricalIndex) else values
+              for values in labels]
+    if len(keys) == 1:
+        return codes, pd.Index(labels[0], name=keys[0])
+    return codes, pd.MultiIndex.from_arrays(labels, names=keys)
+
+
+def measures_table(counts: np.ndarray, sums: Dict[str, np.ndarray],
+                   index: pd.Index) -> pd.DataFrame:
+    """
+    Table des mesures d'une dimension
+
+    Args:
+        counts: Comptages [groupe, churné, score] (COUNT_CODES par groupe)
+        sums: Sommes par groupe et par mesure de SUM_MEASURES (absentes: 0)
+        index: Modalités des groupes
+
+    Returns:
+        DataFrame indexé par modalité: COUNT_MEASURES puis SUM_MEASURES
+    """
+    cube = np.asarray(counts).reshape(len(index), 2, len(SATISFACTION_SCORES) + 1)
+
+    table = {
+        'Total': cube.sum(axis=(1, 2)),
+        'Churned': cube[:, 1, :].sum(axis=1)
+    }
+    histogram = cube.sum(axis=1)
+    for score in SATISFACTION_SCORES:
+        table[f'Satisfaction_{score}'] = histogram[:, score]
+
+    for measure in SUM_MEASURES:
+        table[measure] = sums[measure] if measure in sums else np.zeros(len(index))
+
+    grouped = pd.DataFrame(table, index=index)
+    return grouped.astype({m: 'int64' for m in COUNT_MEASURES})
+
+
+def _grouped_measures(codes: np.ndarray, index: pd.Index,
+                      measures: Dict[str, object]) -> pd.DataFrame:
+    """Mesures d'une dimension: un np.bincount pour les comptages, un par somme"""
+    n_groups = len(index)
+    counts = measures['counts']
+    weights = {measure: w for measure, (w, _) in measures['sums'].items()}
+
+    if (codes < 0).any():
+        valid = codes >= 0
+        codes, counts = codes[valid], counts[valid]
+        weights = {measure: w[valid] for measure, w in weights.items()}
+
+    # [groupe, churné, score] (score 0: absent ou hors 1..5)
+    cube = np.bincount(codes * COUNT_CODES + counts, minlength=n_groups * COUNT_CODES)
+    sums = {
+        measure: np.bincount(codes, weights=w, minlength=n_groups) / measures['sums'][measure][1]
+        for measure, w in weights.items()
+    }
+    return measures_table(cube, sums, index)
+
+
+class RunningAggregates:
+    """
+    Agrégats par dimension, enrichis bloc après bloc
+
+    Chaque table contient une ligne par modalité de la dimension et les
+    colonnes Total, Churned, CLTV_Sum, Monthly_Charge_Sum et
+    Satisfaction_1..5. Toutes les mesures sont additives: fusionner deux
+    blocs revient à additionner leurs tables.
+    """
+
+    def __init__(self, dimensions: Optional[Dict[str, List[str]]] = None):
+        self.dimensions = dimensions if dimensions is not None else DIMENSIONS
+        self.rows = 0
+        self._tables: Dict[str, pd.DataFrame] = {}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'RunningAggregates':
+        """Agréger un DataFrame déjà en mémoire (un seul bloc)"""
+        aggregates = cls()
+        aggregates.update(df)
+        return aggregates
+
+    @classmethod
+    def from_tables(cls, tables: Dict[str, pd.DataFrame], rows: int) -> 'RunningAggregates':
+        """
+        Agrégats à partir de tables déjà calculées (roll-up du cube OLAP)
+
+        Args:
+            tables: Dimension -> table indexée par modalité (measures_table)
+            rows: Nombre de clients agrégés
+        """
+        aggregates = cls({name: list(table.index.names) for name, table in tables.items()})
+        aggregates.rows = rows
+        aggregates._tables = dict(tables)
+        return aggregates
+
+    def merge(self, other: 'RunningAggregates') -> 'RunningAggregates':
+        """
+        Réunir les dimensions de deux agrégats des mêmes lignes
+
+        Les tables de other complètent (ou remplacent) celles de self.
+        """
+        merged = RunningAggregates({**self.dimensions, **other.dimensions})
+        merged.rows = self.rows
+        merged._tables = {**self._tables, **other._tables}
+        return merged
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """Intégrer un bloc normalisé dans les agrégats courants"""
+        self._fold(chunk, 1)
+
+    def retract(self, chunk: pd.DataFrame) -> None:
+        """
+        Retirer un bloc déjà intégré (clients supprimés ou remplacés)
+
+        Les modalités qui n'ont plus aucun client disparaissent, sauf dans
+        les dimensions catégorielles à modalités fixes.
+
+        Raises:
+            ValueError: Lignes absentes des agrégats (comptage négatif)
+        """
+        self._fold(chunk, -1)
+
+    def apply_delta(self, removed: Optional[pd.DataFrame],
+                    added: Optional[pd.DataFrame]) -> None:
+        """
+        Mettre à jour les agrégats avec un lot de lignes retirées et ajoutées
+
+        Un client modifié figure dans les deux lots (ancienne puis nouvelle
+        version): le coût ne dépend que de la taille des lots, pas du
+        nombre de clients déjà agrégés. Les sommes au centime près sont
+        ré-arrondies au centime: mêmes tables qu'un recalcul complet.
+
+        Args:
+            removed: Lignes à retirer (état avant modification), ou None
+            added: Lignes à intégrer (nouvelles ou modifiées), ou None
+        """
+        batches = [rows for rows in (removed, added) if rows is not None and len(rows)]
+        cents = {
+            measure: all(_in_cents(rows[col]) for rows in batches if col in rows.columns)
+            for measure, col in SUM_COLUMNS.items()
+        }
+        exact = {
+            name: [m for m in SUM_MEASURES if cents[m] and _in_cents(table[m])]
+            for name, table in self._tables.items()
+        }
+
+        for rows, sign in ((removed, -1), (added, 1)):
+            if rows is not None:
+                self._fold(rows, sign)
+
+        for name, measures in exact.items():
+            table = self._tables[name]
+            for measure in measures:
+                table[measure] = np.round(table[measure] * 100) / 100
+
+    def _fold(self, chunk: pd.DataFrame, sign: int) -> None:
+        """Ajouter (sign=1) ou retirer (sign=-1) les mesures d'un bloc"""
+        if len(chunk) == 0:
+            return
+
+        # Mesures extraites une fois, puis une passe de comptage par
+        # dimension sur des codes entiers (pas de groupby par dimension)
+        measures = row_measures(chunk)
+        self.rows += sign * len(chunk)
+
+        for name, keys in self.dimensions.items():
+            if not all(key in chunk.columns for key in keys):
+                continue
+
+            keep_empty = name in KEEP_EMPTY_DIMENSIONS
+            codes, index = dimension_codes(chunk, keys, keep_empty)
+            grouped = _grouped_measures(codes, index, measures)
+
+            if sign < 0:
+                grouped = -grouped
+            if name in self._tables:
+                grouped = self._tables[name].add(grouped, fill_value=0)
+            grouped = grouped.astype({m: 'int64' for m in COUNT_MEASURES})
+
+            if sign < 0:
+                if (grouped['Total'] < 0).any():
+                    raise ValueError(f"Retrait de lignes absentes des agrégats ({name})")
+                if not (keep_empty and isinstance(chunk[keys[0]].dtype, pd.CategoricalDtype)):
+                    grouped = grouped[grouped['Total'] > 0]
+            self._tables[name] = grouped
+
+    def has(self, name: str) -> bool:
+        """Indiquer si une dimension a été agrégée"""
+        return name in self._tables
+
+    def table(self, name: str) -> pd.DataFrame:
+        """
+        Table agrégée d'une dimension, triée par modalité
+
+        Args:
+            name: Nom de la dimension (clé de DIMENSIONS)
+
+        Returns:
+            DataFrame avec les colonnes de regroupement puis les mesures
+        """
+        if name not in self._tables:
+            return pd.DataFrame(columns=self.dimensions.get(name, [name]) +
+                                COUNT_MEASURES + SUM_MEASURES)
+        return self._tables[name].sort_index().reset_index()
+
+
+# ========================================
+# INGESTION EN FLUX
+# ========================================
+
+def stream_aggregates(path: str,
+                      normalize_fn: Callable[[pd.DataFrame], pd.DataFrame],
+                      chunksize: int = DEFAULT_CHUNKSIZE,
+                      **read_kwargs) -> RunningAggregates:
+    """
+    Lire un CSV par blocs et replier chaque bloc dans les agrégats
+
+    Args:
+        path: Chemin du fichier CSV
+        normalize_fn: Normalisation appliquée à chaque bloc
+        chunksize: Nombre de lignes par bloc
+        **read_kwargs: Options transmises à pd.read_csv
+
+    Returns:
+        Agrégats courants sur l'ensemble du fichier
+    """
+    aggregates = RunningAggregates()
+    with pd.read_csv(path, chunksize=chunksize, **read_kwargs) as reader:
+        for chunk in reader:
+            aggregates.update(normalize_fn(chunk))
+    return aggregates
+
+
+# ========================================
+# PERSISTANCE
+# ========================================
+
+def aggregates_path(csv_path: str) -> str:
+    """Fichier des agrégats sans filtre d'un CSV (à côté de son snapshot)"""
+    return artifact_path(csv_path, AGGREGATES_SUFFIX)
+
+
+def write_aggregates(aggregates: RunningAggregates, path: str, token: str) -> None:
+    """Écrire des agrégats sur disque (remplacement atomique)"""
+    write_artifact(path, token, AGGREGATES_FORMAT_VERSION, {
+        'dimensions': aggregates.dimensions,
+        'rows': aggregates.rows,
+        'tables': aggregates._tables
+    })
+
+
+def read_aggregates(path: str, token: str) -> Optional[RunningAggregates]:
+    """Relire des agrégats persistés (None si absents, illisibles ou périmés)"""
+    payload = read_artifact(path, token, AGGREGATES_FORMAT_VERSION)
+    if payload is None:
+        return None
+
+    aggregates = RunningAggregates(payload['dimensions'])
+    aggregates.rows = payload['rows']
+    aggregates._tables = payload['tables']
+    return aggregates
+
+
+def load_or_build_aggregates(path: str, token: str,
+                             build_fn: Callable[[], RunningAggregates]) -> RunningAggregates:
+    """
+    Agrégats persistés à jour, recalculés si les données ont changé
+
+    Args:
+        path: Fichier des agrégats
+        token: Jeton de l'état des données (snapshot_token)
+        build_fn: Calcul complet (appelé seulement si nécessaire)
+
+    Returns:
+        Agrégats de cette version des données
+    """
+    return load_or_build_artifact(path, token, read_aggregates, write_aggregates, build_fn)
@@ -15,16 +15,39 @@ Date: 17/02/2024
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
 import plotly.graph_objects as go
 from collections import Counter
+import os
 import re
-from plotly.subplots import make_subplots
 from typing import Tuple, Optional, Dict, List
 import warnings
 warnings.filterwarnings('ignore')
 
-from nps_simulator_component import integrate_simulator_in_satisfaction_tab
+from lazy_imports import lazy_attribute, lazy_module
+from columnar_store import COERCION_ATTR, columns_token, load_or_build, snapshot_token
+from data_schema import (ALL_VALUES, COERCED_NUMERIC_COLUMNS, apply_schema, parse_columns,
+                         parse_dtypes)
+from streaming_aggregates import (DIMENSIONS, RunningAggregates, aggregates_path,
+                                  load_or_build_aggregates, stream_aggregates)
+from partitioned_store import load_or_build_partitions, read_manifest, read_partitions
+from sqlite_store import SqliteSource, load_or_build_database
+from dataset_watcher import DatasetWatcher
+from derived_features import add_derived_features, missing_features
+from bitmap_index import BitmapIndex
+from selection_cache import SelectionCache, selection_key
+from dataset_view import Dataset, DatasetView, as_frame
+from groupby_kernels import churn_stats
+from cross_tabs import CrossTabStore, explorer_variables
+from olap_cube import OlapCube, cube_path, load_or_build_cube
+from incremental_aggregates import aggregate_columns
+from data_profile import coerce_numeric, load_or_build_profile, profile_alerts, profile_path
+
+# Modules lourds chargés par la fonctionnalité qui en a besoin (voir
+# lazy_imports.py; rapport d'import: python lazy_imports.py)
+px = lazy_module('plotly.express')
+make_subplots = lazy_attribute('plotly.subplots', 'make_subplots')
+scipy_stats = lazy_module('scipy.stats')
+nps_simulator = lazy_module('nps_simulator_component')
 
 # ============================================================================
 # CONFIGURATION GLOBALE
@@ -77,6 +100,33 @@ class Config:
         'nps_good': 30,
         'nps_excellent': 50
     }
+    
+    # Mode flux: CSV lu par blocs, seuls les agrégats restent en mémoire
+    # (pour les extraits trop volumineux pour tenir en RAM)
+    STREAMING_MODE = os.environ.get('TELCO_STREAMING_MODE', '0') == '1'
+    STREAMING_CHUNKSIZE = int(os.environ.get('TELCO_STREAMING_CHUNKSIZE', '50000'))
+    
+    # Dataset partitionné sur disque par cette colonne (ex: City, Contract):
+    # seules les partitions retenues par les filtres sont lues
+    PARTITION_BY = os.environ.get('TELCO_PARTITION_BY') or None
+    
+    # Base SQLite embarquée: les agrégats lourds des onglets (par ville,
+    # contrat, variable comportementale) sont calculés en GROUP BY SQL
+    SQLITE_BACKEND = os.environ.get('TELCO_SQLITE', '0') == '1'
+    
+    # Surveillance du CSV (secondes entre deux vérifications, 0 = désactivée,
+    # défaut): une nouvelle version est reconstruite en arrière-plan puis
+    # publiée d'un coup pour toutes les sessions. Sans surveillance, la
+    # version est vérifiée à chaque exécution (jeton snapshot_token)
+    WATCH_INTERVAL = float(os.environ.get('TELCO_WATCH_INTERVAL', '0'))
+    
+    # Panneau d'administration (profil qualité des données) sous l'en-tête
+    ADMIN_MODE = os.environ.get('TELCO_ADMIN', '0') == '1'
+    
+    # Cache LRU des résultats par sélection de filtres (lignes retenues,
+    # agrégats), borné en entrées et en mémoire estimée
+    SELECTION_CACHE_ENTRIES = int(os.environ.get('TELCO_SELECTION_CACHE_ENTRIES', '64'))
+    SELECTION_CACHE_MB = float(os.environ.get('TELCO_SELECTION_CACHE_MB', '256'))
 
 # ============================================================================
 # UTILITAIRES & HELPERS
@@ -102,6 +152,81 @@ class DataValidator:
         result = DataValidator.safe_divide(part, total, 0) * 100
         return round(result, decimals)
     
+    @staticmethod
+    def safe_divide_array(numerator, denominator, default: float = 0.0):
+        """
+        Division sécurisée vectorisée (mêmes règles que safe_divide par élément)
+        
+        Args:
+            numerator: Series ou tableau des numérateurs
+            denominator: Series ou tableau des dénominateurs
+            default: Valeur si dénominateur nul ou manquant, ou résultat infini
+            
+        Returns:
+            Series (index du numérateur) si numerator est une Series, sinon ndarray
+        """
+        num = np.asarray(numerator, dtype='float64')
+        den = np.asarray(denominator, dtype='float64')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result = num / den
+        result = np.where((den == 0) | np.isnan(den) | np.isinf(result), default, result)
+        
+        if isinstance(numerator, pd.Series):
+            return pd.Series(result, index=numerator.index)
+        return result
+    
+    @staticmethod
+    def safe_percentage_array(part, total, decimals: int = 1):
+        """
+        Pourcentages sécurisés vectorisés (mêmes valeurs que safe_percentage)
+        
+        Une table agrégée entière en une opération NumPy, au lieu d'un
+        .apply(axis=1) ligne par ligne.
+        """
+        result = DataValidator.safe_divide_array(part, total, 0) * 100
+        values = DataValidator._round_like_python(np.asarray(result, dtype='float64'), decimals)
+        
+        if isinstance(result, pd.Series):
+            return pd.Series(values, index=result.index)
+        return values
+    
+    @staticmethod
+    def _round_like_python(values: np.ndarray, decimals: int) -> np.ndarray:
+        """
+        np.round avec le résultat exact de round() (decimals >= 0)
+        
+        np.round arrondit values * 10**decimals, produit lui-même arrondi:
+        une valeur juste sous ou juste au-dessus d'un demi (2.675 vaut en
+        réalité 2.67499999...) peut tomber exactement sur le demi et partir
+        du mauvais côté. C'est le seul cas ambigu: le signe de l'erreur
+        exacte du produit le tranche, pour tout le tableau à la fois.
+        """
+        scale = 10.0 ** decimals
+        with np.errstate(invalid='ignore', over='ignore'):
+            scaled = values * scale
+            floor = np.floor(scaled)
+            error = DataValidator._product_error(values, scale, scaled)
+            # Produit arrondi pile sur un demi alors que la valeur exacte ne l'est pas
+            tie = (scaled - floor == 0.5) & (error != 0)
+            rounded = np.where(tie, floor + (error > 0), np.rint(scaled))
+        return rounded / scale
+    
+    @staticmethod
+    def _product_error(a: np.ndarray, b: float, product: np.ndarray) -> np.ndarray:
+        """
+        Erreur d'arrondi exacte de product = a * b (produit de Dekker)
+        
+        a * b vaut exactement product + erreur (hors dépassement de capacité).
+        """
+        split = 134217729.0  # 2**27 + 1: moitiés de 26 bits, produits exacts
+        t = split * a
+        a_hi = t - (t - a)
+        a_lo = a - a_hi
+        t = split * b
+        b_hi = t - (t - b)
+        b_lo = b - b_hi
+        return ((a_hi * b_hi - product) + a_hi * b_lo + a_lo * b_hi) + a_lo * b_lo
+    
     @staticmethod
     def validate_dataframe(df: pd.DataFrame, min_rows: int = 1) -> Tuple[bool, str]:
         """Valider qu'un DataFrame contient des données"""
@@ -111,15 +236,6 @@ class DataValidator:
             return False, f"Données insuffisantes (minimum {min_rows} lignes requises)"
         return True, ""
     
-    @staticmethod
-    def clean_numeric(value, default=0):
-        """Nettoyer une valeur numérique"""
-        try:
-            if pd.isna(value):
-                return default
-            return float(value)
-        except:
-            return default
 
 class UIComponents:
     """Composants UI réutilisables"""
@@ -448,73 +564,174 @@ def inject_custom_css():
 # DATA LOADING & CACHING
 # ============================================================================
 
-@st.cache_data(ttl=3600, show_spinner=False)
+def _find_data_file() -> Optional[str]:
+    """Chercher le fichier CSV dans plusieurs emplacements possibles"""
+    possible_paths = [
+        'telco_churn_master.csv',  # Même dossier (Streamlit Cloud)
+        '/home/claude/telco_churn_master.csv',  # Local
+        './telco_churn_master.csv',  # Relatif
+        os.path.join(os.path.dirname(__file__), 'telco_churn_master.csv')  # Même dossier que le script
+    ]
+    
+    for path in possible_paths:
+        if os.path.exists(path):
+            return path
+    return None
+
+def _build_dataset(path: str) -> pd.DataFrame:
+    """
+    Parser le CSV et appliquer toute la normalisation
+    
+    Args:
+        path: Chemin du fichier CSV
+        
+    Returns:
+        DataFrame consolidé et nettoyé
+    """
+    # Colonnes utiles seulement, dimensions parsées directement en category
+    # (voir data_schema.py)
+    return _normalize_dataset(pd.read_csv(path, dtype=parse_dtypes(), usecols=parse_columns()))
+
+def _normalize_dataset(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normaliser un DataFrame brut (fichier complet ou bloc du mode flux)
+    
+    Args:
+        df: Lignes brutes issues du CSV
+        
+    Returns:
+        DataFrame consolidé et nettoyé
+    """
+    # Créer la colonne Tranche_Age si elle n'existe pas
+    if 'Tranche_Age' not in df.columns:
+        if 'Age' in df.columns:
+            df['Tranche_Age'] = pd.cut(
+                df['Age'],
+                bins=[0, 25, 32, 39, 46, 53, 60, 67, 74, 100],
+                labels=['18-25', '25-32', '32-39', '39-46', '46-53', 
+                       '53-60', '60-67', '67-74', '74-81']
+            )
+        else:
+            # Fallback basé sur Senior Citizen
+            df['Tranche_Age'] = df['Senior Citizen'].map({
+                0: '39-46',
+                1: '67-74'
+            })
+    
+    # Nettoyer les valeurs numériques, échecs de conversion comptés au
+    # passage (profil qualité, conservés avec le snapshot)
+    coercion = coerce_numeric(df, COERCED_NUMERIC_COLUMNS)
+    
+    # Standardiser Customer Status
+    if 'Customer Status' in df.columns:
+        status_mapping = {
+            'Yes': 'Churned',
+            'No': 'Stayed',
+            1: 'Churned',
+            0: 'Stayed'
+        }
+        df['Customer Status'] = df['Customer Status'].replace(status_mapping)
+        df['Customer Status'] = df['Customer Status'].fillna('Stayed')
+    
+    # Colonnes calculées: une fois par version, sur la table complète
+    df = create_calculated_columns(df)
+    
+    # Types compacts déclarés (category, entiers bornés)
+    df = apply_schema(df)
+    df.attrs[COERCION_ATTR] = coercion
+    return df
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _load_dataset(path: str, data_token: str) -> pd.DataFrame:
+    """
+    Dataset partagé pour un état donné des données
+    
+    Pas d'expiration: la clé data_token (empreinte du contenu) change
+    exactement quand le CSV change ou qu'un delta est fusionné. Les
+    erreurs ne sont pas mises en cache (exception propagée).
+    """
+    with st.spinner('📊 Chargement des données...'):
+        return load_or_build(path, _build_dataset)
+
+def _prepare_version(path: str, data_token: str) -> pd.DataFrame:
+    """
+    Construire une version complète des données (thread de surveillance)
+    
+    Dataset normalisé et colonnes calculées, agrégats de la vue sans
+    filtre, cube OLAP, profil qualité, puis partitions et base SQLite si
+    ces modes sont actifs: tout est prêt avant la publication.
+    """
+    df = load_or_build(path, _build_dataset)
+    
+    if Config.PARTITION_BY:
+        load_or_build_partitions(path, Config.PARTITION_BY, data_token, lambda: df,
+                                 catalog_columns=FILTER_COLUMNS)
+    if Config.SQLITE_BACKEND:
+        load_or_build_database(path, data_token, lambda: df)
+    load_or_build_aggregates(aggregates_path(path), data_token,
+                             lambda: _build_default_aggregates(df))
+    load_or_build_cube(cube_path(path), data_token, lambda: OlapCube(df))
+    load_or_build_profile(profile_path(path), data_token, lambda: df,
+                          lambda column: columns_token(path, [column], data_token))
+    
+    return df
+
+@st.cache_resource(show_spinner=False)
+def _dataset_watcher(path: str) -> DatasetWatcher:
+    """Surveillance partagée par toutes les sessions (version initiale chargée)"""
+    with st.spinner('📊 Chargement des données...'):
+        return DatasetWatcher(path, snapshot_token, _prepare_version, Config.WATCH_INTERVAL).start()
+
+def current_token(path: str) -> str:
+    """
+    Jeton de la version des données servie aux sessions
+    
+    Avec la surveillance active, c'est celui de la dernière version publiée:
+    un fichier modifié n'est visible qu'une fois sa version reconstruite.
+    """
+    if Config.WATCH_INTERVAL > 0:
+        return _dataset_watcher(path).current()[0]
+    return snapshot_token(path)
+
+def _current_dataset(path: str, data_token: str) -> pd.DataFrame:
+    """Dataset partagé d'une version (publiée par la surveillance si active)"""
+    if Config.WATCH_INTERVAL > 0:
+        token, df = _dataset_watcher(path).current()
+        if token == data_token:
+            return df
+    return _load_dataset(path, data_token)
+
 def load_data() -> pd.DataFrame:
     """
     Charger les données avec gestion d'erreurs robuste
     
+    Le CSV n'est parsé qu'une fois par version du fichier: le résultat est
+    conservé en snapshot colonnaire binaire (un fichier par colonne) et
+    relu directement aux démarrages suivants.
+    
+    Les colonnes sont memory-mappées et partagées par toutes les sessions
+    (cache_resource, pas de copie sérialisée par session): une colonne
+    n'occupe de la RAM qu'à partir du moment où un onglet la lit.
+    Ce DataFrame partagé ne doit jamais être modifié en place.
+    
+    Le cache est indexé par l'empreinte du fichier (taille, date, hash de
+    blocs échantillonnés), recalculée à chaque exécution pour quelques Ko lus.
+    
+    Avec Config.WATCH_INTERVAL > 0, un thread d'arrière-plan fait ce suivi:
+    la requête reçoit la dernière version publiée et n'attend jamais une
+    reconstruction (sauf au tout premier chargement).
+    
     Returns:
         DataFrame consolidé et nettoyé
     """
     try:
-        with st.spinner('📊 Chargement des données...'):
-            # Chercher le fichier CSV dans plusieurs emplacements possibles
-            import os
-            possible_paths = [
-                'telco_churn_master.csv',  # Même dossier (Streamlit Cloud)
-                '/home/claude/telco_churn_master.csv',  # Local
-                './telco_churn_master.csv',  # Relatif
-                os.path.join(os.path.dirname(__file__), 'telco_churn_master.csv')  # Même dossier que le script
-            ]
-            
-            df = None
-            for path in possible_paths:
-                if os.path.exists(path):
-                    df = pd.read_csv(path)
-                    break
-            
-            if df is None:
-                raise FileNotFoundError("Fichier telco_churn_master.csv introuvable")
-            
-            # Créer la colonne Tranche_Age si elle n'existe pas
-            if 'Tranche_Age' not in df.columns:
-                if 'Age' in df.columns:
-                    df['Tranche_Age'] = pd.cut(
-                        df['Age'],
-                        bins=[0, 25, 32, 39, 46, 53, 60, 67, 74, 100],
-                        labels=['18-25', '25-32', '32-39', '39-46', '46-53', 
-                               '53-60', '60-67', '67-74', '74-81']
-                    )
-                else:
-                    # Fallback basé sur Senior Citizen
-                    df['Tranche_Age'] = df['Senior Citizen'].map({
-                        0: '39-46',
-                        1: '67-74'
-                    })
-            
-            # Nettoyer les valeurs numériques
-            numeric_cols = ['Monthly Charge', 'Total Revenue', 'CLTV', 
-                           'Satisfaction Score', 'Tenure in Months']
-            for col in numeric_cols:
-                if col in df.columns:
-                    df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-            
-            # Standardiser Customer Status
-            if 'Customer Status' in df.columns:
-                status_mapping = {
-                    'Yes': 'Churned',
-                    'No': 'Stayed',
-                    1: 'Churned',
-                    0: 'Stayed'
-                }
-                df['Customer Status'] = df['Customer Status'].replace(status_mapping)
-                df['Customer Status'] = df['Customer Status'].fillna('Stayed')
-            
-            # Créer colonnes calculées
-            df = create_calculated_columns(df)
-            
-            return df
-            
+        path = _find_data_file()
+        
+        if path is None:
+            raise FileNotFoundError("Fichier telco_churn_master.csv introuvable")
+        
+        return _current_dataset(path, current_token(path))
+    
     except FileNotFoundError:
         st.error("❌ Fichier de données introuvable. Veuillez vérifier le chemin.")
         return pd.DataFrame()
@@ -522,59 +739,278 @@ def load_data() -> pd.DataFrame:
         st.error(f"❌ Erreur lors du chargement des données: {str(e)}")
         return pd.DataFrame()
 
-def create_calculated_columns(df: pd.DataFrame) -> pd.DataFrame:
-    """Créer les colonnes calculées nécessaires"""
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _load_aggregates(path: str, data_token: str) -> RunningAggregates:
+    """
+    Agrégats du mode flux pour un état donné des données (sans expiration)
+    
+    Persistés à côté du snapshot: un redémarrage (ou prewarm.py) les relit
+    sans relire le CSV.
+    """
+    with st.spinner('📊 Agrégation des données par blocs...'):
+        return load_or_build_aggregates(
+            aggregates_path(path),
+            data_token,
+            lambda: _stream_dataset_aggregates(path)
+        )
+
+def _stream_dataset_aggregates(path: str) -> RunningAggregates:
+    """Agréger le CSV par blocs (normalisation de load_data bloc par bloc)"""
+    return stream_aggregates(
+        path,
+        _normalize_dataset,
+        chunksize=Config.STREAMING_CHUNKSIZE,
+        dtype=parse_dtypes(),
+        usecols=parse_columns()
+    )
+
+def _build_default_aggregates(df: pd.DataFrame) -> RunningAggregates:
+    """Agrégats de la vue sans filtre (colonnes calculées déjà présentes)"""
+    return RunningAggregates.from_frame(df)
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _load_default_aggregates(path: str, aggregates_token: str,
+                             _data_token: str) -> RunningAggregates:
+    """
+    Agrégats de la vue d'ensemble sans filtre pour un état des données
+    
+    Clé: jeton des colonnes agrégées (AGGREGATE_COLUMNS): un delta qui
+    n'en modifie aucune garde les agrégats en mémoire. Sinon relus depuis
+    le disque pour la version _data_token (non hachée), où prewarm.py, la
+    surveillance du fichier ou ingest_delta.py les ont déjà écrits.
+    """
+    return load_or_build_aggregates(
+        aggregates_path(path),
+        _data_token,
+        lambda: _build_default_aggregates(_current_dataset(path, _data_token))
+    )
+
+def load_default_aggregates(path: str) -> RunningAggregates:
+    """Agrégats sans filtre de la version servie"""
+    token = current_token(path)
+    return _load_default_aggregates(path, _columns_token(path, token, AGGREGATE_COLUMNS), token)
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _load_profile(path: str, data_token: str) -> pd.DataFrame:
+    """
+    Profil qualité d'un état des données (calculé une fois par version)
+    
+    Persisté à côté du snapshot, comme les agrégats sans filtre.
+    """
+    return load_or_build_profile(
+        profile_path(path),
+        data_token,
+        lambda: _current_dataset(path, data_token),
+        # Après un delta, seules les colonnes modifiées sont reprofilées
+        lambda column: columns_token(path, [column], data_token)
+    )
+
+def render_data_quality_panel():
+    """
+    Profil qualité des données (Config.ADMIN_MODE)
+    
+    Signale les extraits douteux: valeurs non numériques remplacées par 0
+    au chargement, valeurs manquantes, modalités inattendues.
+    """
+    path = _find_data_file()
+    if path is None:
+        return
+    
     try:
-        # CRITIQUE: Créer colonne 'Churn' à partir de 'Churn Label'
-        if 'Churn' not in df.columns:
-            if 'Churn Label' in df.columns:
-                df['Churn'] = df['Churn Label']
-            elif 'Customer Status' in df.columns:
-                df['Churn'] = df['Customer Status'].map({'Churned': 'Yes', 'Stayed': 'No'})
-            else:
-                # Fallback
-                df['Churn'] = 'No'
-        
-        # CRITIQUE: Normaliser customerID (certaines fonctions utilisent lowercase)
-        if 'CustomerID' in df.columns and 'customerID' not in df.columns:
-            df['customerID'] = df['CustomerID']
-        
-        # Calculer nombre de produits souscrits
-        product_cols = ['Phone Service', 'Multiple Lines', 'Internet Service', 
-                       'Online Security', 'Online Backup', 'Device Protection',
-                       'Tech Support', 'Streaming TV', 'Streaming Movies']
-        
-        if 'Streaming Music' in df.columns:
-            product_cols.append('Streaming Music')
-        if 'Unlimited Data' in df.columns:
-            product_cols.append('Unlimited Data')
-        
-        df['Nb_Produits'] = 0
-        for col in product_cols:
-            if col in df.columns:
-                df['Nb_Produits'] += (df[col] == 'Yes').astype(int)
-        
-        # Indicateur de vente incitative (3+ produits)
-        df['Upsell'] = (df['Nb_Produits'] >= 3).astype(int)
-        
-        # Catégories CLV
-        if 'CLTV' in df.columns:
-            df['CLV_Cat'] = pd.cut(
-                df['CLTV'],
-                bins=[0, 2500, 3000, 3500, 4000, 4500, 5000, 5500, 6000, 7000],
-                labels=['2001-2500', '2501-3000', '3001-3500', '3501-4000', 
-                       '4001-4500', '4501-5000', '5001-5500', '5501-6000', '6001-6500']
-            )
+        profile = _load_profile(path, current_token(path))
+    except Exception as e:
+        st.warning(f"⚠️ Profil qualité indisponible: {str(e)}")
+        return
+    
+    alerts = profile_alerts(profile)
+    label = "🩺 Qualité des données (admin)"
+    if len(alerts):
+        label += f" - {len(alerts)} colonne(s) à vérifier"
+    
+    with st.expander(label, expanded=False):
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Lignes", f"{profile.attrs.get('rows', 0):,}")
+        col2.metric("Colonnes", len(profile))
+        col3.metric("Échecs de conversion", int(profile['Échecs conversion'].sum()))
+        
+        if len(alerts):
+            st.markdown("**⚠️ Colonnes à vérifier**")
+            st.dataframe(alerts, hide_index=True, use_container_width=True)
+        
+        st.markdown("**📋 Profil par colonne**")
+        st.dataframe(profile, hide_index=True, use_container_width=True)
+        st.caption("Échecs conversion: valeurs non numériques du CSV source et "
+                   "des deltas fusionnés, remplacées par 0 au chargement.")
+
+def _filtered_aggregates(df_filtered: pd.DataFrame, selection: Dict[str, List[str]],
+                         cube: Optional[OlapCube] = None) -> RunningAggregates:
+    """
+    Agrégats d'une sélection active
+    
+    Avec le cube: KPI, statuts, âge, genre, contrat, offre et villes par
+    roll-up des cellules; seules l'ancienneté et la carte (dimensions hors
+    cube) sont agrégées sur les lignes filtrées.
+    """
+    if cube is None:
+        return RunningAggregates.from_frame(df_filtered)
+    
+    detail = RunningAggregates({name: keys for name, keys in DIMENSIONS.items()
+                                if name not in cube.dimensions})
+    detail.update(df_filtered)
+    return cube.rollup(selection).merge(detail)
+
+def overview_aggregates(df_filtered: pd.DataFrame,
+                        cache: Optional[SelectionCache] = None,
+                        cube: Optional[OlapCube] = None) -> RunningAggregates:
+    """
+    Agrégats de la vue d'ensemble pour la sélection courante
+    
+    Sans filtre actif: agrégats partagés et persistés. Sinon: roll-up du
+    cube OLAP de df (calcul sur les lignes filtrées sans cube), une fois
+    par sélection si un cache est fourni.
+    """
+    selection = current_selection()
+    if not active_filters(selection):
+        path = _find_data_file()
+        if path is not None:
+            try:
+                return load_default_aggregates(path)
+            except Exception:
+                # Repli: calcul direct sur les lignes filtrées
+                pass
+    if cache is not None:
+        return cache.get_or_compute(selection_key(selection), 'overview',
+                                    lambda: _filtered_aggregates(df_filtered, selection, cube),
+                                    columns_version(FILTER_COLUMNS + list(AGGREGATE_COLUMNS)))
+    return _filtered_aggregates(df_filtered, selection, cube)
+
+def load_aggregates() -> Optional[RunningAggregates]:
+    """
+    Charger les données en mode flux (Config.STREAMING_MODE)
+    
+    Le CSV est lu par blocs de Config.STREAMING_CHUNKSIZE lignes; chaque
+    bloc reçoit la même normalisation que load_data puis est replié dans
+    les agrégats par dimension. Seuls ces agrégats sont conservés.
+    
+    Returns:
+        Agrégats par dimension, ou None en cas d'erreur
+    """
+    try:
+        path = _find_data_file()
         
-        # Tenure Years
-        if 'Tenure in Months' in df.columns:
-            df['Tenure_Years'] = pd.cut(
-                df['Tenure in Months'],
-                bins=[0, 12, 24, 36, 48, 60, 72],
-                labels=['1 an', '2 ans', '3 ans', '4 ans', '5 ans', '6 ans']
-            )
+        if path is None:
+            raise FileNotFoundError("Fichier telco_churn_master.csv introuvable")
         
-        return df
+        return _load_aggregates(path, snapshot_token(path))
+    
+    except FileNotFoundError:
+        st.error("❌ Fichier de données introuvable. Veuillez vérifier le chemin.")
+        return None
+    except Exception as e:
+        st.error(f"❌ Erreur lors du chargement des données: {str(e)}")
+        return None
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _load_partition_manifest(path: str, data_token: str) -> Dict:
+    """Manifest des partitions pour un état donné des données"""
+    with st.spinner('📊 Préparation des partitions...'):
+        return load_or_build_partitions(
+            path,
+            Config.PARTITION_BY,
+            data_token,
+            lambda: _current_dataset(path, data_token),
+            catalog_columns=FILTER_COLUMNS
+        )
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _load_partition_rows(root: str, data_token: str, values: Tuple[str, ...]) -> pd.DataFrame:
+    """Lignes des partitions sélectionnées (partagées, jamais modifiées en place)"""
+    return read_partitions(root, read_manifest(root), list(values))
+
+def load_filtered_partitions() -> pd.DataFrame:
+    """
+    Afficher les filtres et charger seulement les partitions utiles
+    
+    Les options des filtres viennent du catalogue du manifest: aucune
+    donnée n'est lue avant la sélection. Le filtre portant sur
+    Config.PARTITION_BY choisit les partitions lues, les autres filtres
+    s'appliquent ensuite aux lignes chargées.
+    
+    Returns:
+        DataFrame filtré (vide en cas d'erreur)
+    """
+    try:
+        path = _find_data_file()
+        
+        if path is None:
+            raise FileNotFoundError("Fichier telco_churn_master.csv introuvable")
+        
+        token = current_token(path)
+        manifest = _load_partition_manifest(path, token)
+        
+        selection = render_filter_widgets(manifest['values'])
+        values = active_filters(selection).get(Config.PARTITION_BY)
+        
+        if values:
+            df = _load_partition_rows(manifest['root'], token, tuple(values))
+        else:
+            # Pas de sélection sur la colonne de partitionnement: le snapshot
+            # complet (memory-mappé) est plus direct que toutes les partitions
+            df = _current_dataset(path, token)
+        return apply_filters(df, selection)
+    
+    except FileNotFoundError:
+        st.error("❌ Fichier de données introuvable. Veuillez vérifier le chemin.")
+        return pd.DataFrame()
+    except Exception as e:
+        st.error(f"❌ Erreur lors du chargement des données: {str(e)}")
+        return pd.DataFrame()
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _load_sqlite_database(path: str, data_token: str) -> str:
+    """Fichier SQLite à jour pour un état donné des données"""
+    with st.spinner('📊 Préparation de la base SQLite...'):
+        return load_or_build_database(
+            path,
+            data_token,
+            lambda: _current_dataset(path, data_token)
+        )
+
+def load_sql_source(selection: Dict[str, List[str]]) -> Optional[SqliteSource]:
+    """
+    Base SQLite restreinte aux filtres courants (Config.SQLITE_BACKEND)
+    
+    La sélection des multiselects est compilée en clause WHERE; les onglets
+    qui reçoivent cette source calculent leurs agrégats Total / Churned par
+    GROUP BY au lieu de regrouper la copie pandas filtrée.
+    
+    Returns:
+        Source SQL, ou None (mode désactivé ou erreur: chemin pandas)
+    """
+    if not Config.SQLITE_BACKEND:
+        return None
+    
+    try:
+        path = _find_data_file()
+    
+        if path is None:
+            return None
+    
+        return SqliteSource(_load_sqlite_database(path, current_token(path)), selection)
+    
+    except Exception as e:
+        st.warning(f"⚠️ Base SQLite indisponible, calcul en mémoire: {str(e)}")
+        return None
+
+def create_calculated_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Créer les colonnes calculées nécessaires (derived_features.py)
+    
+    Appelée une seule fois par version des données, sur la table complète,
+    pendant la préparation du snapshot: les vues filtrées en héritent.
+    """
+    try:
+        return add_derived_features(df)
         
     except Exception as e:
         st.warning(f"⚠️ Erreur création colonnes calculées: {str(e)}")
@@ -584,105 +1020,254 @@ def create_calculated_columns(df: pd.DataFrame) -> pd.DataFrame:
 # FILTRES INTERACTIFS
 # ============================================================================
 
-def render_filters(df: pd.DataFrame) -> pd.DataFrame:
+# Filtres: (colonne, libellé, clé du widget)
+FILTERS = [
+    ('Tranche_Age', "📊 Tranche d'âge", 'filter_age'),
+    ('Contract', "📋 Contrat", 'filter_contract'),
+    ('City', "🌆 Ville", 'filter_city'),
+    ('Offer', "🎁 Offre", 'filter_offer'),
+    ('Gender', "👤 Genre", 'filter_gender')
+]
+
+FILTER_COLUMNS = [column for column, _, _ in FILTERS]
+
+# Colonnes lues par les agrégats et le cube (clé de leurs caches)
+AGGREGATE_COLUMNS = tuple(aggregate_columns())
+
+def filter_options(df: pd.DataFrame) -> Dict[str, List[str]]:
+    """Valeurs proposées par chaque filtre (valeurs distinctes triées)"""
+    return {
+        column: sorted(df[column].dropna().astype(str).unique().tolist())
+        for column, _, _ in FILTERS
+        if column in df.columns
+    }
+
+def render_filter_widgets(options: Dict[str, List[str]]) -> Dict[str, List[str]]:
     """
-    Afficher les filtres et retourner les données filtrées
+    Afficher les filtres et retourner la sélection de l'utilisateur
     
     Args:
-        df: DataFrame source
+        options: Valeurs proposées par colonne (filter_options ou catalogue
+            des partitions)
         
     Returns:
-        DataFrame filtré
+        Sélection par colonne (peut contenir 'Tout')
     """
     st.markdown('<div class="filter-container">', unsafe_allow_html=True)
     
-    filter_cols = st.columns(5)
-    
-    # Récupérer les valeurs uniques pour chaque filtre
-    with filter_cols[0]:
-        tranche_age_options = ['Tout'] + sorted(
-            df['Tranche_Age'].dropna().astype(str).unique().tolist()
-        )
-        tranche_age_filter = st.multiselect(
-            "📊 Tranche d'âge",
-            options=tranche_age_options,
-            default=['Tout'],
-            key='filter_age'
-        )
-    
-    with filter_cols[1]:
-        contract_options = ['Tout'] + sorted(
-            df['Contract'].dropna().unique().tolist()
-        )
-        contract_filter = st.multiselect(
-            "📋 Contrat",
-            options=contract_options,
-            default=['Tout'],
-            key='filter_contract'
-        )
+    filter_cols = st.columns(len(FILTERS))
+    selection = {}
     
-    with filter_cols[2]:
-        city_options = ['Tout'] + sorted(
-            df['City'].dropna().unique().tolist()
-        )
-        city_filter = st.multiselect(
-            "🌆 Ville",
-            options=city_options,
-            default=['Tout'],
-            key='filter_city'
-        )
-    
-    with filter_cols[3]:
-        offer_options = ['Tout'] + sorted(
-            df['Offer'].dropna().unique().tolist()
-        ) if 'Offer' in df.columns else ['Tout']
-        offer_filter = st.multiselect(
-            "🎁 Offre",
-            options=offer_options,
-            default=['Tout'],
-            key='filter_offer'
-        )
-    
-    with filter_cols[4]:
-        gender_options = ['Tout'] + sorted(
-            df['Gender'].dropna().unique().tolist()
-        )
-        gender_filter = st.multiselect(
-            "👤 Genre",
-            options=gender_options,
-            default=['Tout'],
-            key='filter_gender'
-        )
+    for filter_col, (column, label, key) in zip(filter_cols, FILTERS):
+        with filter_col:
+            selection[column] = st.multiselect(
+                label,
+                options=[ALL_VALUES] + options.get(column, []),
+                default=[ALL_VALUES],
+                key=key
+            )
     
     st.markdown('</div>', unsafe_allow_html=True)
     
-    # Appliquer les filtres
-    df_filtered = df.copy()
+    return selection
+
+def current_selection() -> Dict[str, List[str]]:
+    """Sélection des filtres affichés lors de cette exécution (état des widgets)"""
+    return {
+        column: st.session_state.get(key, [ALL_VALUES])
+        for column, _, key in FILTERS
+    }
+
+def active_filters(selection: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """Filtres effectifs: colonnes avec une sélection explicite (sans 'Tout')"""
+    return {
+        column: values
+        for column, values in selection.items()
+        if ALL_VALUES not in values and len(values) > 0
+    }
+
+def apply_filters(df: pd.DataFrame, selection: Dict[str, List[str]],
+                  index: Optional[BitmapIndex] = None) -> pd.DataFrame:
+    """
+    Appliquer une sélection de filtres
     
-    try:
-        if 'Tout' not in tranche_age_filter and len(tranche_age_filter) > 0:
-            df_filtered = df_filtered[
-                df_filtered['Tranche_Age'].astype(str).isin(tranche_age_filter)
-            ]
-        
-        if 'Tout' not in contract_filter and len(contract_filter) > 0:
-            df_filtered = df_filtered[df_filtered['Contract'].isin(contract_filter)]
-        
-        if 'Tout' not in city_filter and len(city_filter) > 0:
-            df_filtered = df_filtered[df_filtered['City'].isin(city_filter)]
-        
-        if 'Tout' not in offer_filter and len(offer_filter) > 0 and 'Offer' in df_filtered.columns:
-            df_filtered = df_filtered[df_filtered['Offer'].isin(offer_filter)]
+    Args:
+        df: DataFrame source
+        selection: Sélection par colonne (render_filter_widgets)
+        index: Index bitmap de df (load_filter_index): un seul masque
+            calculé par opérations bit à bit au lieu d'un isin par filtre
         
-        if 'Tout' not in gender_filter and len(gender_filter) > 0:
-            df_filtered = df_filtered[df_filtered['Gender'].isin(gender_filter)]
+    Returns:
+        DataFrame filtré
+    """
+    # Copie superficielle: la table partagée n'est jamais dupliquée ni
+    # modifiée, les masques créent leurs propres colonnes
+    df_filtered = df.copy(deep=False)
+    
+    try:
+        if index is not None:
+            mask = index.mask(selection)
+            return df_filtered if mask is None else df_filtered[mask]
+        
+        for column, values in active_filters(selection).items():
+            if column not in df_filtered.columns:
+                continue
+            if column == 'Tranche_Age':
+                df_filtered = df_filtered[df_filtered[column].astype(str).isin(values)]
+            else:
+                df_filtered = df_filtered[df_filtered[column].isin(values)]
         
     except Exception as e:
         st.error(f"❌ Erreur lors de l'application des filtres: {str(e)}")
-        return df
+        return df.copy(deep=False)
     
     return df_filtered
 
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _columns_token(path: str, data_token: str, columns: Tuple[str, ...]) -> str:
+    """Jeton de quelques colonnes pour une version des données (journal lu une fois)"""
+    return columns_token(path, columns, data_token)
+
+def columns_version(columns: List[str]) -> Optional[str]:
+    """
+    Version des colonnes lues par un résultat, pour la version servie
+    
+    Clé des caches qui ne lisent que ces colonnes: un delta qui ne les
+    modifie pas la laisse inchangée (None sans fichier de données).
+    """
+    path = _find_data_file()
+    if path is None:
+        return None
+    return _columns_token(path, current_token(path), tuple(columns))
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _load_filter_index(path: str, index_token: str, _data_token: str) -> BitmapIndex:
+    """
+    Index bitmap des filtres (sans expiration)
+    
+    Clé: jeton des colonnes filtrées; toute version de même jeton (mêmes
+    lignes, mêmes valeurs filtrées) donne le même index. Construit sur le
+    dataset de la version _data_token (non hachée).
+    """
+    return BitmapIndex(_current_dataset(path, _data_token), FILTER_COLUMNS)
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _load_selection_cache(path: str) -> SelectionCache:
+    """
+    Cache des sélections d'un fichier, conservé d'une version à l'autre
+    
+    Chaque résultat est versionné par les colonnes qu'il lit
+    (columns_version): seuls ceux dont une colonne a changé sont recalculés.
+    """
+    return SelectionCache(Config.SELECTION_CACHE_ENTRIES,
+                          int(Config.SELECTION_CACHE_MB * 1024 * 1024))
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _load_olap_cube(path: str, cube_token: str, _data_token: str) -> OlapCube:
+    """
+    Cube OLAP (sans expiration)
+    
+    Clé: jeton des colonnes agrégées, comme les agrégats sans filtre. Persisté
+    à côté du snapshot (pré-calculé par prewarm.py, la surveillance du
+    fichier ou ingest_delta.py) sous la version _data_token (non hachée).
+    """
+    return load_or_build_cube(
+        cube_path(path),
+        _data_token,
+        lambda: OlapCube(_current_dataset(path, _data_token))
+    )
+
+def _served_version(df: pd.DataFrame) -> Optional[Tuple[str, str]]:
+    """
+    (chemin, jeton) de la version servie si df en est le dataset partagé
+    
+    None si une nouvelle version a été publiée pendant l'exécution: les
+    structures de cette version ne décrivent pas df.
+    """
+    path = _find_data_file()
+    if path is None:
+        return None
+    token = current_token(path)
+    if _current_dataset(path, token) is not df:
+        return None
+    return path, token
+
+def load_filter_index(df: pd.DataFrame) -> Optional[BitmapIndex]:
+    """
+    Index bitmap du dataset partagé df
+    
+    None si df n'est pas la version servie ou en cas d'erreur: filtrage
+    par isin.
+    """
+    try:
+        version = _served_version(df)
+        if version is None:
+            return None
+        path, token = version
+        return _load_filter_index(path, _columns_token(path, token, tuple(FILTER_COLUMNS)), token)
+    except Exception:
+        return None
+
+def load_selection_cache(df: pd.DataFrame) -> Optional[SelectionCache]:
+    """Cache des sélections du dataset partagé df (None: pas de cache)"""
+    try:
+        version = _served_version(df)
+        return _load_selection_cache(version[0]) if version is not None else None
+    except Exception:
+        return None
+
+def load_olap_cube(df: pd.DataFrame) -> Optional[OlapCube]:
+    """Cube OLAP du dataset partagé df (None: agrégats calculés sur les lignes)"""
+    try:
+        version = _served_version(df)
+        if version is None:
+            return None
+        path, token = version
+        return _load_olap_cube(path, _columns_token(path, token, AGGREGATE_COLUMNS), token)
+    except Exception:
+        return None
+
+def render_filters(df: pd.DataFrame, cache: Optional[SelectionCache] = None) -> DatasetView:
+    """
+    Afficher les filtres et retourner la vue des données filtrées
+    
+    Args:
+        df: DataFrame source
+        cache: Cache des sélections de df: les lignes retenues par une
+            sélection déjà vue sont relues au lieu d'être recalculées
+        
+    Returns:
+        Vue de df restreinte aux lignes retenues (df lui-même sans filtre)
+    """
+    index = load_filter_index(df)
+    options = index.options() if index is not None else filter_options(df)
+    selection = render_filter_widgets(options)
+    
+    if not active_filters(selection):
+        return DatasetView(df)
+    if index is None:
+        return DatasetView(apply_filters(df, selection))
+    
+    def filtered_rows() -> np.ndarray:
+        mask = index.mask(selection)
+        return np.arange(len(df)) if mask is None else np.flatnonzero(mask)
+    
+    if cache is None:
+        return DatasetView(df, filtered_rows())
+    return DatasetView(df, cache.get_or_compute(selection_key(selection), 'rows', filtered_rows,
+                                                columns_version(FILTER_COLUMNS)))
+
+def render_selection_cache_panel(cache: SelectionCache):
+    """Compteurs du cache des sélections (Config.ADMIN_MODE)"""
+    stats = cache.stats()
+    with st.expander("🗃️ Cache des sélections (admin)", expanded=False):
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Sélections en cache", f"{stats['entries']} / {cache.max_entries}")
+        col2.metric("Mémoire estimée", f"{stats['nbytes'] / 1024 / 1024:.1f} Mo")
+        col3.metric("Hits / misses", f"{stats['hits']} / {stats['misses']}",
+                    f"{stats['hit_rate']:.0f}% de hits", delta_color="off")
+        col4.metric("Évictions", stats['evictions'])
+
 # ============================================================================
 # MAIN APPLICATION
 # ============================================================================
@@ -701,24 +1286,63 @@ def main():
     </div>
     """, unsafe_allow_html=True)
     
-    # Charger les données
-    df = load_data()
+    # Mode flux: vue d'ensemble rendue depuis les agrégats uniquement
+    if Config.STREAMING_MODE:
+        render_streaming_overview()
+        return
     
-    # Vérifier si les données sont chargées
-    is_valid, error_msg = DataValidator.validate_dataframe(df)
-    if not is_valid:
-        st.error(f"❌ {error_msg}")
-        st.stop()
+    if Config.ADMIN_MODE:
+        render_data_quality_panel()
+    
+    # Vue sans filtre prête en mémoire dès la première exécution d'une version
+    default_figures = warm_up_default_view()
+    
+    cache = cube = None
+    if Config.PARTITION_BY:
+        # Dataset partitionné: filtres d'abord, lecture des seules partitions utiles
+        view = DatasetView(load_filtered_partitions())
+    else:
+        # Charger les données
+        df = load_data()
+        
+        # Vérifier si les données sont chargées
+        is_valid, error_msg = DataValidator.validate_dataframe(df)
+        if not is_valid:
+            st.error(f"❌ {error_msg}")
+            st.stop()
+        
+        # Appliquer les filtres (résultats par sélection mis en cache)
+        cache = load_selection_cache(df)
+        cube = load_olap_cube(df)
+        view = render_filters(df, cache)
     
-    # Appliquer les filtres
-    df_filtered = render_filters(df)
+    # Lignes filtrées matérialisées une seule fois; chaque onglet reçoit la
+    # vue et en tire un DataFrame de travail sans copie des données
+    df_filtered = view.frame()
     
-    # CRITIQUE: Recréer les colonnes calculées après filtrage
-    df_filtered = create_calculated_columns(df_filtered)
+    # Base SQLite (optionnelle): mêmes filtres compilés en clause WHERE
+    sql_source = load_sql_source(current_selection())
     
     # Vérifier si les données filtrées sont vides
     is_valid_filtered, _ = DataValidator.validate_dataframe(df_filtered)
     
+    # Colonnes calculées héritées du dataset complet: jamais recalculées
+    # sur la vue filtrée
+    missing = missing_features(df_filtered) if is_valid_filtered else []
+    if missing:
+        st.error(f"❌ Colonnes calculées absentes du dataset: {', '.join(missing)}")
+        st.stop()
+    
+    # Statistiques par ville: une table par état des filtres, partagée par
+    # les trois modes géographiques, l'impact financier et le plan d'action
+    cities = None
+    if is_valid_filtered:
+        try:
+            cities = city_statistics(view, sql_source, cache)
+        except Exception:
+            # Repli: chaque onglet calcule (et signale) ses statistiques
+            pass
+    
     # Créer les onglets - STRUCTURE 10/10
     tabs = st.tabs([
         "📊 Vue d'ensemble",
@@ -733,14 +1357,16 @@ def main():
         if not is_valid_filtered:
             UIComponents.show_empty_state()
         else:
-            render_overview_tab(df_filtered)
+            # Figures pré-chauffées: seulement pour la vue sans filtre
+            figures = None if active_filters(current_selection()) else default_figures
+            render_overview_tab(overview_aggregates(df_filtered, cache, cube), figures)
     
     # Onglet 2: Zones critiques (Où?)
     with tabs[1]:
         if not is_valid_filtered:
             UIComponents.show_empty_state()
         else:
-            render_geography_tab(df_filtered)
+            render_geography_tab(view, sql_source, cities)
     
     # Onglet 3: Drivers du churn (Pourquoi?)
     with tabs[2]:
@@ -751,43 +1377,61 @@ def main():
             driver_subtabs = st.tabs(["📊 Comportement", "😊 Satisfaction"])
             
             with driver_subtabs[0]:
-                render_behavior_tab(df_filtered)
+                render_behavior_tab(view, sql_source, cache)
             
             with driver_subtabs[1]:
-                render_satisfaction_tab(df_filtered)
+                render_satisfaction_tab(view)
     
     # Onglet 4: Impact financier (Combien?)
     with tabs[3]:
         if not is_valid_filtered:
             UIComponents.show_empty_state()
         else:
-            render_cost_tab(df_filtered)
+            render_cost_tab(view, cities)
     
     # Onglet 5: Plan d'action (Comment?)
     with tabs[4]:
         if not is_valid_filtered:
             UIComponents.show_empty_state()
         else:
-            render_action_plan_tab(df_filtered)
+            render_action_plan_tab(view, sql_source, cities)
+    
+    if Config.ADMIN_MODE and cache is not None:
+        render_selection_cache_panel(cache)
+
+def render_streaming_overview():
+    """
+    Vue d'ensemble du mode flux
+    
+    Les filtres et les onglets d'analyse détaillée travaillent sur les
+    lignes clients: ils ne sont pas disponibles dans ce mode.
+    """
+    aggregates = load_aggregates()
+    
+    if aggregates is None or aggregates.rows == 0:
+        UIComponents.show_empty_state("Aucune donnée disponible")
+        st.stop()
+    
+    st.info(
+        f"🌊 Mode flux: {aggregates.rows:,} clients agrégés par blocs. "
+        "Filtres et analyses détaillées désactivés (TELCO_STREAMING_MODE=0 pour les réactiver)."
+    )
+    
+    render_overview_tab(aggregates)
 
 # ============================================================================
 # GRAPHIQUES - ONGLET VUE D'ENSEMBLE
 # ============================================================================
 
-def create_age_bubble_chart(df: pd.DataFrame) -> Optional[go.Figure]:
+def create_age_bubble_chart(aggregates: RunningAggregates) -> Optional[go.Figure]:
     """Créer le bubble chart du taux de churn par âge"""
     try:
-        # Calculer les statistiques par tranche d'âge
-        age_stats = df.groupby('Tranche_Age').agg({
-            'CustomerID': 'count',
-            'Customer Status': lambda x: (x == 'Churned').sum()
-        }).reset_index()
-        age_stats.columns = ['Tranche_Age', 'Total', 'Churned']
+        # Statistiques par tranche d'âge
+        age_stats = aggregates.table('Tranche_Age')[['Tranche_Age', 'Total', 'Churned']]
         
         # Protection division par zéro
-        age_stats['Churn_Rate'] = age_stats.apply(
-            lambda row: DataValidator.safe_percentage(row['Churned'], row['Total']),
-            axis=1
+        age_stats['Churn_Rate'] = DataValidator.safe_percentage_array(
+            age_stats['Churned'], age_stats['Total']
         )
         
         age_stats = age_stats.dropna().sort_values('Tranche_Age')
@@ -856,10 +1500,11 @@ def create_age_bubble_chart(df: pd.DataFrame) -> Optional[go.Figure]:
         st.error(f"Erreur create_age_bubble_chart: {str(e)}")
         return None
 
-def create_status_donut(df: pd.DataFrame) -> Optional[go.Figure]:
+def create_status_donut(aggregates: RunningAggregates) -> Optional[go.Figure]:
     """Créer le donut chart des statuts clients"""
     try:
-        status_stats = df['Customer Status'].value_counts()
+        status_stats = aggregates.table('Customer Status').set_index('Customer Status')['Total']
+        status_stats = status_stats[status_stats > 0].sort_values(ascending=False, kind='stable')
         
         if len(status_stats) == 0:
             return None
@@ -887,10 +1532,11 @@ def create_status_donut(df: pd.DataFrame) -> Optional[go.Figure]:
         st.error(f"Erreur create_status_donut: {str(e)}")
         return None
 
-def create_gender_donut(df: pd.DataFrame) -> Optional[go.Figure]:
+def create_gender_donut(aggregates: RunningAggregates) -> Optional[go.Figure]:
     """Créer le donut chart par genre"""
     try:
-        gender_stats = df['Gender'].value_counts()
+        gender_stats = aggregates.table('Gender').set_index('Gender')['Total']
+        gender_stats = gender_stats[gender_stats > 0].sort_values(ascending=False, kind='stable')
         
         if len(gender_stats) == 0:
             return None
@@ -918,20 +1564,14 @@ def create_gender_donut(df: pd.DataFrame) -> Optional[go.Figure]:
         st.error(f"Erreur create_gender_donut: {str(e)}")
         return None
 
-def create_simple_california_map(df: pd.DataFrame) -> Optional[go.Figure]:
+def create_simple_california_map(aggregates: RunningAggregates) -> Optional[go.Figure]:
     """Créer une carte simple de Californie pour contextualisation géographique"""
     try:
         # Préparer les données
-        city_geo = df.groupby(['Latitude', 'Longitude']).agg({
-            'CustomerID': 'count',
-            'Customer Status': lambda x: (x == 'Churned').sum(),
-            'City': 'first'
-        }).reset_index()
-        city_geo.columns = ['Latitude', 'Longitude', 'Total', 'Churned', 'City']
-        
-        city_geo['Churn_Rate'] = city_geo.apply(
-            lambda row: DataValidator.safe_percentage(row['Churned'], row['Total']),
-            axis=1
+        city_geo = aggregates.table('Geo')[['Latitude', 'Longitude', 'Total', 'Churned', 'City']]
+        
+        city_geo['Churn_Rate'] = DataValidator.safe_percentage_array(
+            city_geo['Churned'], city_geo['Total']
         )
         
         city_geo_clean = city_geo.dropna(subset=['Latitude', 'Longitude'])
@@ -975,18 +1615,13 @@ def create_simple_california_map(df: pd.DataFrame) -> Optional[go.Figure]:
         st.error(f"Erreur carte simple: {str(e)}")
         return None
 
-def create_contract_bar_chart(df: pd.DataFrame) -> Optional[go.Figure]:
+def create_contract_bar_chart(aggregates: RunningAggregates) -> Optional[go.Figure]:
     """Créer le bar chart par type de contrat"""
     try:
-        contract_stats = df.groupby('Contract').agg({
-            'CustomerID': 'count',
-            'Customer Status': lambda x: (x == 'Churned').sum()
-        }).reset_index()
-        contract_stats.columns = ['Contract', 'Total', 'Churned']
-        
-        contract_stats['Churn_Rate'] = contract_stats.apply(
-            lambda row: DataValidator.safe_percentage(row['Churned'], row['Total'], 0),
-            axis=1
+        contract_stats = aggregates.table('Contract')[['Contract', 'Total', 'Churned']]
+        
+        contract_stats['Churn_Rate'] = DataValidator.safe_percentage_array(
+            contract_stats['Churned'], contract_stats['Total'], 0
         )
         contract_stats = contract_stats.sort_values('Churn_Rate', ascending=False)
         
@@ -1023,21 +1658,16 @@ def create_contract_bar_chart(df: pd.DataFrame) -> Optional[go.Figure]:
         st.error(f"Erreur create_contract_bar_chart: {str(e)}")
         return None
 
-def create_offer_bar_chart(df: pd.DataFrame) -> Optional[go.Figure]:
+def create_offer_bar_chart(aggregates: RunningAggregates) -> Optional[go.Figure]:
     """Créer le bar chart par offre"""
     try:
-        if 'Offer' not in df.columns:
+        if not aggregates.has('Offer'):
             return None
             
-        offer_stats = df.groupby('Offer').agg({
-            'CustomerID': 'count',
-            'Customer Status': lambda x: (x == 'Churned').sum()
-        }).reset_index()
-        offer_stats.columns = ['Offer', 'Total', 'Churned']
+        offer_stats = aggregates.table('Offer')[['Offer', 'Total', 'Churned']]
         
-        offer_stats['Churn_Rate'] = offer_stats.apply(
-            lambda row: DataValidator.safe_percentage(row['Churned'], row['Total'], 0),
-            axis=1
+        offer_stats['Churn_Rate'] = DataValidator.safe_percentage_array(
+            offer_stats['Churned'], offer_stats['Total'], 0
         )
         offer_stats = offer_stats.sort_values('Churn_Rate', ascending=False)
         
@@ -1073,21 +1703,17 @@ def create_offer_bar_chart(df: pd.DataFrame) -> Optional[go.Figure]:
         st.error(f"Erreur create_offer_bar_chart: {str(e)}")
         return None
 
-def create_tenure_line_chart(df: pd.DataFrame) -> Optional[go.Figure]:
+def create_tenure_line_chart(aggregates: RunningAggregates) -> Optional[go.Figure]:
     """Créer le line chart par durée d'engagement"""
     try:
-        if 'Tenure in Months' not in df.columns:
+        if not aggregates.has('Tenure in Months'):
             return None
             
-        tenure_stats = df.groupby('Tenure in Months').agg({
-            'CustomerID': 'count',
-            'Customer Status': lambda x: (x == 'Churned').sum()
-        }).reset_index()
+        tenure_stats = aggregates.table('Tenure in Months')[['Tenure in Months', 'Total', 'Churned']]
         tenure_stats.columns = ['Tenure', 'Total', 'Churned']
         
-        tenure_stats['Churn_Rate'] = tenure_stats.apply(
-            lambda row: DataValidator.safe_percentage(row['Churned'], row['Total']),
-            axis=1
+        tenure_stats['Churn_Rate'] = DataValidator.safe_percentage_array(
+            tenure_stats['Churned'], tenure_stats['Total']
         )
         tenure_stats = tenure_stats.sort_values('Tenure')
         
@@ -1127,19 +1753,18 @@ def create_tenure_line_chart(df: pd.DataFrame) -> Optional[go.Figure]:
         st.error(f"Erreur create_tenure_line_chart: {str(e)}")
         return None
 
-def create_age_combo_chart(df: pd.DataFrame) -> Optional[go.Figure]:
+def create_age_combo_chart(aggregates: RunningAggregates) -> Optional[go.Figure]:
     """Créer le combo chart âge (bars + line)"""
     try:
-        age_churn = df.groupby('Tranche_Age').agg({
-            'CustomerID': 'count',
-            'Customer Status': lambda x: (x == 'Churned').sum(),
-            'Monthly Charge': 'mean'
-        }).reset_index()
-        age_churn.columns = ['Tranche_Age', 'Total', 'Churned', 'Avg_Monthly_Charge']
-        
-        age_churn['Churn_Rate'] = age_churn.apply(
-            lambda row: DataValidator.safe_percentage(row['Churned'], row['Total']),
-            axis=1
+        age_churn = aggregates.table('Tranche_Age')
+        # Moyenne = somme / effectif (NaN pour une tranche vide, retirée plus bas)
+        age_churn['Avg_Monthly_Charge'] = (
+            age_churn['Monthly_Charge_Sum'] / age_churn['Total'].where(age_churn['Total'] > 0)
+        )
+        age_churn = age_churn[['Tranche_Age', 'Total', 'Churned', 'Avg_Monthly_Charge']]
+        
+        age_churn['Churn_Rate'] = DataValidator.safe_percentage_array(
+            age_churn['Churned'], age_churn['Total']
         )
         age_churn = age_churn.dropna()
         
@@ -1203,21 +1828,99 @@ def create_age_combo_chart(df: pd.DataFrame) -> Optional[go.Figure]:
         st.error(f"Erreur create_age_combo_chart: {str(e)}")
         return None
 
+# Graphiques de la vue d'ensemble (clé du st.plotly_chart -> construction)
+OVERVIEW_CHARTS = {
+    'bubble_age': create_age_bubble_chart,
+    'donut_status': create_status_donut,
+    'donut_gender': create_gender_donut,
+    'map_ca_overview': create_simple_california_map,
+    'bar_contract': create_contract_bar_chart,
+    'bar_offer': create_offer_bar_chart,
+    'line_tenure': create_tenure_line_chart,
+    'combo_age': create_age_combo_chart
+}
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _default_overview_figures(path: str, aggregates_token: str,
+                              _data_token: str) -> Dict[str, go.Figure]:
+    """
+    Figures de la vue d'ensemble sans filtre pour un état des données
+    
+    Construites une fois par version et partagées par toutes les sessions
+    (st.plotly_chart ne fait que les sérialiser, jamais modifiées). Une
+    figure en échec est absente: l'onglet la reconstruit et signale l'erreur.
+    Même clé que les agrégats sans filtre (_load_default_aggregates).
+    """
+    aggregates = _load_default_aggregates(path, aggregates_token, _data_token)
+    figures = {}
+    for key, build in OVERVIEW_CHARTS.items():
+        fig = build(aggregates)
+        if fig is not None:
+            figures[key] = fig
+    return figures
+
+def warm_up_default_view() -> Optional[Dict[str, go.Figure]]:
+    """
+    Pré-chauffage en mémoire de la vue sans filtre (une fois par version)
+    
+    prewarm.py n'écrit que les artefacts sur disque: les caches du serveur
+    (cache_resource) restent vides jusqu'à la première exécution. Appelé en
+    tête de main(), ce pré-chauffage y charge les agrégats sans filtre et
+    construit les figures de la vue par défaut, quelle que soit la
+    sélection de cette exécution; les exécutions suivantes de la même
+    version, toutes sessions confondues, les relisent. Streamlit n'offre
+    pas de point d'entrée avant la première session: c'est la première
+    exécution d'une version qui paie la construction.
+    
+    Returns:
+        Figures par clé de graphique, ou None (échec non bloquant: la vue
+        d'ensemble reconstruit alors ses figures)
+    """
+    path = _find_data_file()
+    if path is None:
+        return None
+    try:
+        token = current_token(path)
+        return _default_overview_figures(path, _columns_token(path, token, AGGREGATE_COLUMNS),
+                                         token)
+    except Exception:
+        # Repli: figures construites par render_overview_tab
+        return None
+
 # ============================================================================
 # ONGLETS (PLACEHOLDERS - À IMPLÉMENTER)
 # ============================================================================
 
-def render_overview_tab(df: pd.DataFrame):
-    """Onglet Vue d'ensemble - Implémentation complète"""
+def render_overview_tab(aggregates: RunningAggregates,
+                        figures: Optional[Dict[str, go.Figure]] = None):
+    """
+    Onglet Vue d'ensemble - Implémentation complète
+    
+    Rendu uniquement à partir des agrégats par dimension: identique que
+    ceux-ci viennent du DataFrame filtré ou du mode flux (CSV lu par blocs).
+    
+    Args:
+        aggregates: Agrégats de la sélection
+        figures: Figures déjà construites pour ces agrégats (vue sans
+            filtre pré-chauffée); les graphiques absents sont construits ici
+    """
+    figures = figures or {}
+    
+    def figure(key: str) -> Optional[go.Figure]:
+        if key in figures:
+            return figures[key]
+        return OVERVIEW_CHARTS[key](aggregates)
+    
     st.markdown('<h2 class="sub-title">Chiffres clés de notre attrition</h2>', 
                 unsafe_allow_html=True)
     
     # ========== KPIs PRINCIPAUX ==========
     try:
-        total_clients = len(df)
-        total_churned = len(df[df['Customer Status'] == 'Churned'])
-        total_joined = len(df[df['Customer Status'] == 'Joined'])
-        total_stayed = len(df[df['Customer Status'] == 'Stayed'])
+        status_counts = aggregates.table('Customer Status').set_index('Customer Status')['Total']
+        total_clients = aggregates.rows
+        total_churned = int(status_counts.get('Churned', 0))
+        total_joined = int(status_counts.get('Joined', 0))
+        total_stayed = int(status_counts.get('Stayed', 0))
         solde_net = total_stayed + total_joined
         # Total installés = Seulement les clients "Stayed" (comme Power BI)
         total_installed = total_stayed
@@ -1254,7 +1957,7 @@ def render_overview_tab(df: pd.DataFrame):
     with row1_cols[0]:
         st.markdown("#### 📊 Taux de Churn par Tranche d'Âge")
         try:
-            fig = create_age_bubble_chart(df)
+            fig = figure('bubble_age')
             if fig:
                 st.plotly_chart(fig, use_container_width=True, key='bubble_age')
         except Exception as e:
@@ -1264,7 +1967,7 @@ def render_overview_tab(df: pd.DataFrame):
     with row1_cols[1]:
         st.markdown("#### 📊 Par Statut")
         try:
-            fig = create_status_donut(df)
+            fig = figure('donut_status')
             if fig:
                 st.plotly_chart(fig, use_container_width=True, key='donut_status')
         except Exception as e:
@@ -1274,7 +1977,7 @@ def render_overview_tab(df: pd.DataFrame):
     with row1_cols[2]:
         st.markdown("#### 👥 Par Genre")
         try:
-            fig = create_gender_donut(df)
+            fig = figure('donut_gender')
             if fig:
                 st.plotly_chart(fig, use_container_width=True, key='donut_gender')
         except Exception as e:
@@ -1284,7 +1987,7 @@ def render_overview_tab(df: pd.DataFrame):
     with row1_cols[3]:
         st.markdown("#### 🗺️ Localisation Californie")
         try:
-            fig = create_simple_california_map(df)
+            fig = figure('map_ca_overview')
             if fig:
                 st.plotly_chart(fig, use_container_width=True, key='map_ca_overview')
         except Exception as e:
@@ -1298,7 +2001,7 @@ def render_overview_tab(df: pd.DataFrame):
     with row2_cols[0]:
         st.markdown("#### Taux d'attrition par contrat")
         try:
-            fig = create_contract_bar_chart(df)
+            fig = figure('bar_contract')
             if fig:
                 st.plotly_chart(fig, use_container_width=True, key='bar_contract')
         except Exception as e:
@@ -1307,7 +2010,7 @@ def render_overview_tab(df: pd.DataFrame):
     with row2_cols[1]:
         st.markdown("#### Taux d'attrition par offre")
         try:
-            fig = create_offer_bar_chart(df)
+            fig = figure('bar_offer')
             if fig:
                 st.plotly_chart(fig, use_container_width=True, key='bar_offer')
         except Exception as e:
@@ -1318,7 +2021,7 @@ def render_overview_tab(df: pd.DataFrame):
     # ========== TAUX DE CHURN PAR DURÉE ==========
     st.markdown("#### Taux de churn par durée d'engagement")
     try:
-        fig = create_tenure_line_chart(df)
+        fig = figure('line_tenure')
         if fig:
             st.plotly_chart(fig, use_container_width=True, key='line_tenure')
     except Exception as e:
@@ -1329,13 +2032,35 @@ def render_overview_tab(df: pd.DataFrame):
     # ========== COMBO CHART - AGE ==========
     st.markdown("#### Taux de churn par tranche d'âge")
     try:
-        fig = create_age_combo_chart(df)
+        fig = figure('combo_age')
         if fig:
             st.plotly_chart(fig, use_container_width=True, key='combo_age')
     except Exception as e:
         st.error(f"Erreur combo age: {str(e)}")
 
-def render_behavior_tab(df: pd.DataFrame):
+def cross_tab_store(df: pd.DataFrame, cache: Optional[SelectionCache] = None) -> CrossTabStore:
+    """
+    Croisements des variables de l'explorateur pour la sélection (calculés à la demande)
+    
+    Conservés par état des filtres si un cache est fourni: une paire déjà
+    vue ne relit plus les lignes clients. Chaque paire calculée après la
+    mise en cache fait remesurer l'entrée (borne mémoire du cache).
+    """
+    if cache is None:
+        return CrossTabStore(df, explorer_variables(df))
+    
+    key = selection_key(current_selection())
+    variables = explorer_variables(df)
+    
+    def build():
+        return CrossTabStore(df, variables,
+                             on_fill=lambda: cache.refresh_size(key, 'cross_tabs'))
+    
+    return cache.get_or_compute(key, 'cross_tabs', build,
+                                columns_version(FILTER_COLUMNS + variables + ['Is_Churned']))
+
+def render_behavior_tab(df: Dataset, sql_source: Optional[SqliteSource] = None,
+                        cache: Optional[SelectionCache] = None):
     """
     Onglet Comportement - Niveau Expert 10/10
     Interactivité pédagogique + Tests statistiques + Drill-down
@@ -1355,14 +2080,10 @@ def render_behavior_tab(df: pd.DataFrame):
     """, unsafe_allow_html=True)
     
     try:
-        df_temp = df.copy()
+        df_temp = as_frame(df)
         
-        # Créer colonne churn
-        if 'Churn Label' in df_temp.columns:
-            df_temp['Is_Churned'] = (df_temp['Churn Label'] == 'Yes').astype(int)
-        elif 'Churn' in df_temp.columns:
-            df_temp['Is_Churned'] = (df_temp['Churn'] == 'Yes').astype(int)
-        else:
+        # Indicateur de churn: colonne calculée du dataset (Is_Churned)
+        if 'Is_Churned' not in df_temp.columns:
             st.error("❌ Colonne churn non trouvée")
             return
         
@@ -1371,10 +2092,11 @@ def render_behavior_tab(df: pd.DataFrame):
         
         col_select1, col_select2 = st.columns(2)
         
+        cross_tabs = cross_tab_store(df_temp, cache)
+        
         with col_select1:
-            available_vars = ['Contract', 'Internet Service', 'Tech Support', 
-                            'Online Security', 'Payment Method', 'Phone Service']
-            available_vars = [v for v in available_vars if v in df_temp.columns]
+            # Variables de l'explorateur puis autres colonnes catégorielles
+            available_vars = cross_tabs.variables
             
             var1 = st.selectbox(
                 "📊 Variable principale à analyser",
@@ -1401,19 +2123,19 @@ def render_behavior_tab(df: pd.DataFrame):
         
         with col_graph1:
             # Calculer stats avec Chi²
-            var1_stats = df_temp.groupby(var1, as_index=False).agg({
-                'customerID': 'count',
-                'Is_Churned': 'sum'
-            })
+            churn_col = 'Churn Label' if 'Churn Label' in df_temp.columns else 'Churn'
+            if sql_source is not None and sql_source.has(var1, 'CustomerID', churn_col):
+                var1_stats = sql_source.churn_stats([var1], 'CustomerID', churn_col, 'Yes', like=df_temp)
+            else:
+                var1_stats = churn_stats(df_temp, [var1])
             var1_stats.columns = [var1, 'Total', 'Churned']
             var1_stats['Churn_Rate'] = (var1_stats['Churned'] / var1_stats['Total'] * 100)
             var1_stats['Retained'] = var1_stats['Total'] - var1_stats['Churned']
             var1_stats = var1_stats.sort_values('Churn_Rate', ascending=False)
             
             # Test Chi²
-            from scipy.stats import chi2_contingency
             contingency_table = var1_stats[['Churned', 'Retained']].values
-            chi2, p_value, dof, expected = chi2_contingency(contingency_table)
+            chi2, p_value, dof, expected = scipy_stats.chi2_contingency(contingency_table)
             
             # Graphique bar chart interactif
             fig_var1 = go.Figure()
@@ -1551,12 +2273,9 @@ def render_behavior_tab(df: pd.DataFrame):
         # === COMPARAISON CROISÉE 2 VARIABLES ===
         st.markdown(f"#### 🔍 Analyse Croisée : {var1} × {var2}")
         
-        if var2 in df_temp.columns:
-            # Heatmap corrélation
-            cross_analysis = df_temp.groupby([var1, var2], as_index=False)['Is_Churned'].agg(['mean', 'count'])
-            cross_analysis.columns = ['Churn_Rate', 'Count']
-            cross_analysis['Churn_Rate'] = cross_analysis['Churn_Rate'] * 100
-            cross_analysis = cross_analysis.reset_index()
+        if (var1, var2) in cross_tabs:
+            # Heatmap corrélation (croisement mémorisé par état des filtres)
+            cross_analysis = cross_tabs.cross_table(var1, var2)
             
             # Filtrer pour avoir assez de données
             cross_analysis = cross_analysis[cross_analysis['Count'] >= 10]
@@ -1623,10 +2342,9 @@ def render_behavior_tab(df: pd.DataFrame):
                     
                     # Chi² test
                     contingency = pd.crosstab(df_service[service], df_service['Is_Churned'])
-                    chi2_svc, p_svc, _, _ = chi2_contingency(contingency)
+                    chi2_svc, p_svc, _, _ = scipy_stats.chi2_contingency(contingency)
                     
                     # Intervalle confiance (95%)
-                    from scipy import stats
                     n_yes = len(df_service[df_service[service]=='Yes'])
                     p_yes = yes_service / 100
                     ci_yes = 1.96 * np.sqrt((p_yes * (1-p_yes)) / n_yes) * 100
@@ -1711,14 +2429,10 @@ def render_behavior_tab(df: pd.DataFrame):
     """, unsafe_allow_html=True)
     
     try:
-        df_temp = df.copy()
+        df_temp = as_frame(df)
         
-        # Créer colonne churn
-        if 'Churn Label' in df_temp.columns:
-            df_temp['Is_Churned'] = (df_temp['Churn Label'] == 'Yes').astype(int)
-        elif 'Churn' in df_temp.columns:
-            df_temp['Is_Churned'] = (df_temp['Churn'] == 'Yes').astype(int)
-        else:
+        # Indicateur de churn: colonne calculée du dataset (Is_Churned)
+        if 'Is_Churned' not in df_temp.columns:
             st.error("❌ Colonne churn non trouvée")
             return
         
@@ -1779,11 +2493,7 @@ def render_behavior_tab(df: pd.DataFrame):
         with col_contract1:
             if 'Contract' in df_temp.columns:
                 # Analyse par contrat
-                contract_stats = df_temp.groupby('Contract', as_index=False).agg({
-                    'customerID': 'count',
-                    'Is_Churned': 'sum'
-                })
-                contract_stats.columns = ['Contract', 'Total', 'Churned']
+                contract_stats = churn_stats(df_temp, ['Contract'])
                 contract_stats['Churn_Rate'] = (contract_stats['Churned'] / contract_stats['Total'] * 100)
                 contract_stats = contract_stats.sort_values('Churn_Rate', ascending=False)
                 
@@ -1901,10 +2611,7 @@ def render_behavior_tab(df: pd.DataFrame):
         st.markdown("#### 💳 Impact Méthode de Paiement")
         
         if 'Payment Method' in df_temp.columns:
-            payment_stats = df_temp.groupby('Payment Method', as_index=False).agg({
-                'customerID': 'count',
-                'Is_Churned': 'sum'
-            })
+            payment_stats = churn_stats(df_temp, ['Payment Method'])
             payment_stats.columns = ['Payment', 'Total', 'Churned']
             payment_stats['Churn_Rate'] = (payment_stats['Churned'] / payment_stats['Total'] * 100)
             payment_stats = payment_stats.sort_values('Churn_Rate', ascending=True)
@@ -1971,7 +2678,7 @@ def render_behavior_tab(df: pd.DataFrame):
 
 
 # ------------------------------------------------
-def render_satisfaction_tab(df: pd.DataFrame):
+def render_satisfaction_tab(df: Dataset):
     """Onglet Satisfaction - Version SANS HTML + Corrélation Age/Satisfaction"""
     
     st.markdown("""
@@ -1994,14 +2701,10 @@ def render_satisfaction_tab(df: pd.DataFrame):
                 unsafe_allow_html=True)
     
     try:
-        df_temp = df.copy()
+        df_temp = as_frame(df)
         
-        # Préparer churn
-        if 'Churn Label' in df_temp.columns:
-            df_temp['Is_Churned'] = (df_temp['Churn Label'] == 'Yes').astype(int)
-        elif 'Churn' in df_temp.columns:
-            df_temp['Is_Churned'] = (df_temp['Churn'] == 'Yes').astype(int)
-        else:
+        # Indicateur de churn: colonne calculée du dataset (Is_Churned)
+        if 'Is_Churned' not in df_temp.columns:
             st.error("❌ Colonne churn non trouvée")
             return
         
@@ -2136,8 +2839,7 @@ def render_satisfaction_tab(df: pd.DataFrame):
                     age_sat['Churn_Rate'] = age_sat['Is_Churned'] * 100
                     
                     # Calcul corrélation
-                    from scipy.stats import pearsonr
-                    corr_coef, p_value = pearsonr(age_sat['Age'], age_sat['Satisfaction Score'])
+                    corr_coef, p_value = scipy_stats.pearsonr(age_sat['Age'], age_sat['Satisfaction Score'])
                     
                     fig_scatter = go.Figure()
                     
@@ -2163,8 +2865,7 @@ def render_satisfaction_tab(df: pd.DataFrame):
                     ))
                     
                     # Ligne de tendance (régression linéaire)
-                    from scipy.stats import linregress
-                    slope, intercept, r_value, p_val, std_err = linregress(age_sat['Age'], 
+                    slope, intercept, r_value, p_val, std_err = scipy_stats.linregress(age_sat['Age'], 
                                                                            age_sat['Satisfaction Score'])
                     
                     line_x = np.array([age_sat['Age'].min(), age_sat['Age'].max()])
@@ -2334,7 +3035,7 @@ def render_satisfaction_tab(df: pd.DataFrame):
             if len(df_analysis) > 0:
                 # Calculer stats par âge (sans tranches)
                 age_risk = df_analysis.groupby('Age', as_index=False).agg({
-                    'customerID': 'count',
+                    'CustomerID': 'count',
                     'Satisfaction Score': 'mean'
                 })
                 age_risk.columns = ['Age', 'Clients_Insatisfaits', 'Sat_Moyenne']
@@ -2447,7 +3148,7 @@ Impact: ${clients * 4149:,.0f}
         
         # ⭐⭐⭐ SIMULATEUR NPS ⭐⭐⭐
         st.markdown("---")
-        integrate_simulator_in_satisfaction_tab(df_temp)
+        nps_simulator.integrate_simulator_in_satisfaction_tab(df_temp)
         # ⭐⭐⭐ FIN SIMULATEUR ⭐⭐⭐
     
     except Exception as e:
@@ -2457,10 +3158,18 @@ Impact: ${clients * 4149:,.0f}
 
 # ------------------------------------------------
 
-def render_cost_tab(df: pd.DataFrame):
+def churned_counts(df: pd.DataFrame, key: str) -> pd.DataFrame:
+    """Clients churned par modalité de key (modalités sans churn exclues)"""
+    stats = churn_stats(df, [key])
+    return stats.loc[stats['Churned'] > 0, [key, 'Churned']].reset_index(drop=True)
+
+def render_cost_tab(df: Dataset, cities: Optional[pd.DataFrame] = None):
     """
     Onglet 4: Impact Financier - COMBIEN coûte le churn?
     Analyses financières niveau CFO avec simulateurs interactifs
+    
+    cities: statistiques par ville partagées (city_statistics), calculées
+    ici si absentes
     """
     st.markdown('<h2 class="sub-title">💰 Impact Financier du Churn</h2>', 
                 unsafe_allow_html=True)
@@ -2477,12 +3186,10 @@ def render_cost_tab(df: pd.DataFrame):
     
     try:
         # Préparer données
-        df_temp = df.copy()
-        if 'Churn' not in df_temp.columns:
+        df_temp = as_frame(df)
+        if 'Is_Churned' not in df_temp.columns:
             st.error("❌ Colonne 'Churn' manquante")
             return
-            
-        df_temp['Is_Churned'] = (df_temp['Churn'] == 'Yes').astype(int)
         
         # Calculs financiers de base
         total_customers = len(df_temp)
@@ -2565,12 +3272,11 @@ def render_cost_tab(df: pd.DataFrame):
         # Analyser pertes par dimensions
         dimensions_data = []
         
-        # GEO
-        if 'City' in df_temp.columns:
-            city_pertes = df_temp[df_temp['Is_Churned']==1].groupby('City', as_index=False).agg({
-                'customerID': 'count'
-            })
-            city_pertes.columns = ['City', 'Churned']
+        # GEO (villes avec au moins un client churned)
+        if cities is None:
+            cities = build_city_stats(df_temp)
+        if cities is not None:
+            city_pertes = cities.loc[cities['Churned'] > 0, ['City', 'Churned']].reset_index(drop=True)
             city_pertes['Pertes'] = city_pertes['Churned'] * CLTV_REFERENCE
             top_city = city_pertes.nlargest(1, 'Pertes').iloc[0]
             dimensions_data.append({
@@ -2582,9 +3288,7 @@ def render_cost_tab(df: pd.DataFrame):
         
         # CONTRAT
         if 'Contract' in df_temp.columns:
-            contract_pertes = df_temp[df_temp['Is_Churned']==1].groupby('Contract', as_index=False).agg({
-                'customerID': 'count'
-            })
+            contract_pertes = churned_counts(df_temp, 'Contract')
             contract_pertes.columns = ['Contract', 'Churned']
             contract_pertes['Pertes'] = contract_pertes['Churned'] * CLTV_REFERENCE
             top_contract = contract_pertes.nlargest(1, 'Pertes').iloc[0]
@@ -2597,9 +3301,7 @@ def render_cost_tab(df: pd.DataFrame):
         
         # SERVICE INTERNET
         if 'Internet Service' in df_temp.columns:
-            internet_pertes = df_temp[df_temp['Is_Churned']==1].groupby('Internet Service', as_index=False).agg({
-                'customerID': 'count'
-            })
+            internet_pertes = churned_counts(df_temp, 'Internet Service')
             internet_pertes.columns = ['Internet', 'Churned']
             internet_pertes['Pertes'] = internet_pertes['Churned'] * CLTV_REFERENCE
             top_internet = internet_pertes.nlargest(1, 'Pertes').iloc[0]
@@ -2641,12 +3343,9 @@ def render_cost_tab(df: pd.DataFrame):
             with col1:
                 st.markdown("##### 📍 Par Géographie")
                 
-                if 'City' in df_temp.columns:
-                    # Calculer pertes par ville (churned uniquement)
-                    geo_pertes = df_temp[df_temp['Is_Churned']==1].groupby('City', as_index=False).agg({
-                        'customerID': 'count'
-                    })
-                    geo_pertes.columns = ['City', 'Churned']
+                if cities is not None:
+                    # Pertes par ville (churned uniquement)
+                    geo_pertes = cities.loc[cities['Churned'] > 0, ['City', 'Churned']].reset_index(drop=True)
                     geo_pertes['Pertes'] = geo_pertes['Churned'] * CLTV_REFERENCE
                     
                     # Top 9 villes (pas 10) pour laisser place à "Autres"
@@ -2706,9 +3405,7 @@ def render_cost_tab(df: pd.DataFrame):
                 
                 if 'Contract' in df_temp.columns:
                     # Calculer pertes par contrat
-                    contract_pertes = df_temp[df_temp['Is_Churned']==1].groupby('Contract', as_index=False).agg({
-                        'customerID': 'count'
-                    })
+                    contract_pertes = churned_counts(df_temp, 'Contract')
                     contract_pertes.columns = ['Contract', 'Churned']
                     contract_pertes['Pertes'] = contract_pertes['Churned'] * CLTV_REFERENCE
                     
@@ -2744,9 +3441,7 @@ def render_cost_tab(df: pd.DataFrame):
                 
                 if 'Internet Service' in df_temp.columns:
                     # Calculer pertes par service
-                    internet_pertes = df_temp[df_temp['Is_Churned']==1].groupby('Internet Service', as_index=False).agg({
-                        'customerID': 'count'
-                    })
+                    internet_pertes = churned_counts(df_temp, 'Internet Service')
                     internet_pertes.columns = ['Internet', 'Churned']
                     internet_pertes['Pertes'] = internet_pertes['Churned'] * CLTV_REFERENCE
                     
@@ -3143,9 +3838,74 @@ def render_cost_tab(df: pd.DataFrame):
         with st.expander("🔍 Détails techniques"):
             st.code(traceback.format_exc())
 
+# ============================================================================
+# STATISTIQUES PAR VILLE (GÉOGRAPHIE, IMPACT FINANCIER, PLAN D'ACTION)
+# ============================================================================
+
+# CLTV moyen des clients churned du dataset réel (pertes par ville)
+CITY_CLTV = 4149
+
+# Colonnes lues par build_city_stats (clé de la table en cache)
+CITY_STATS_COLUMNS = ['City', 'CustomerID', 'Is_Churned', 'Latitude', 'Longitude']
+
+def build_city_stats(df: Dataset, sql_source: Optional[SqliteSource] = None) -> Optional[pd.DataFrame]:
+    """
+    Statistiques par ville des lignes filtrées, en un seul regroupement
+    
+    Args:
+        df: Données filtrées
+        sql_source: Base SQLite de la sélection (GROUP BY en base si fournie)
+    
+    Returns:
+        City, Total, Churned, Churn_Rate, Pertes, Latitude, Longitude et
+        Region par ville (ordre des villes du regroupement), ou None sans
+        colonne 'City'
+    """
+    if 'City' not in df.columns:
+        return None
+    coords = [col for col in ('Latitude', 'Longitude') if col in df.columns]
+    
+    if sql_source is not None and sql_source.has('City', 'CustomerID', 'Is_Churned', *coords):
+        frame = df.base if isinstance(df, DatasetView) else df
+        city_stats = sql_source.churn_stats(['City'], 'CustomerID', 'Is_Churned', 1,
+                                            first_columns=coords, like=frame)
+    else:
+        city_stats = churn_stats(as_frame(df), ['City'], first_columns=coords)
+    city_stats.columns = ['City', 'Total', 'Churned'] + coords
+    
+    city_stats['Churn_Rate'] = DataValidator.safe_percentage_array(
+        city_stats['Churned'], city_stats['Total']
+    )
+    city_stats['Pertes'] = city_stats['Churned'] * CITY_CLTV
+    
+    if 'Latitude' in city_stats.columns:
+        # Régions géographiques (latitude inconnue: Centre)
+        latitude = city_stats['Latitude'].to_numpy(dtype=float)
+        city_stats['Region'] = np.where(latitude < 34, 'Sud',
+                                        np.where(latitude >= 37, 'Nord', 'Centre'))
+    return city_stats
+
+def city_statistics(df: Dataset, sql_source: Optional[SqliteSource] = None,
+                    cache: Optional[SelectionCache] = None) -> Optional[pd.DataFrame]:
+    """
+    Statistiques par ville de la sélection courante
+    
+    Calculées une fois par état des filtres si un cache est fourni: changer
+    de mode géographique ou d'onglet relit la même table. La table est
+    partagée: les onglets ne la modifient jamais en place.
+    """
+    if cache is None:
+        return build_city_stats(df, sql_source)
+    return cache.get_or_compute(selection_key(current_selection()), 'city_stats',
+                                lambda: build_city_stats(df, sql_source),
+                                columns_version(FILTER_COLUMNS + CITY_STATS_COLUMNS))
 
-def render_geography_tab(df: pd.DataFrame):
+def render_geography_tab(df: Dataset, sql_source: Optional[SqliteSource] = None,
+                         cities: Optional[pd.DataFrame] = None):
     """Onglet Géographie avec 3 modes et visualisations alternatives (sans cartes)"""
+    if cities is None:
+        cities = build_city_stats(df, sql_source)
+    
     st.markdown('<h2 class="sub-title">🗺️ Analyse Géographique du Churn en Californie</h2>', 
                 unsafe_allow_html=True)
     
@@ -3239,7 +3999,7 @@ def render_geography_tab(df: pd.DataFrame):
             )
         
         # Créer les visualisations Mode 1
-        render_mode1_visuals(df, churn_threshold, max_cities)
+        render_mode1_visuals(cities, churn_threshold, max_cities)
     
     # ========== MODE 2: TOP N VILLES ==========
     elif current_mode == 2:
@@ -3278,7 +4038,7 @@ def render_geography_tab(df: pd.DataFrame):
             )
         
         # Créer les visualisations Mode 2
-        render_mode2_visuals(df, top_n, sort_by)
+        render_mode2_visuals(cities, top_n, sort_by)
     
     # ========== MODE 3: VUE COMPLÈTE ==========
     else:
@@ -3317,27 +4077,15 @@ def render_geography_tab(df: pd.DataFrame):
             )
         
         # Créer les visualisations Mode 3
-        render_mode3_visuals(df, min_churned, groupby)
+        render_mode3_visuals(cities, min_churned, groupby)
 
 # ============================================================================
 # FONCTIONS DE VISUALISATION PAR MODE (SANS CARTES)
 # ============================================================================
 
-def render_mode1_visuals(df: pd.DataFrame, threshold: int, max_cities: int):
+def render_mode1_visuals(city_stats: pd.DataFrame, threshold: int, max_cities: int):
     """Mode 1: Visualisations des zones critiques avec filtre de significativité"""
     try:
-        # Préparer les données
-        city_stats = df.groupby('City').agg({
-            'CustomerID': 'count',
-            'Customer Status': lambda x: (x == 'Churned').sum()
-        }).reset_index()
-        city_stats.columns = ['City', 'Total', 'Churned']
-        
-        city_stats['Churn_Rate'] = city_stats.apply(
-            lambda row: DataValidator.safe_percentage(row['Churned'], row['Total']),
-            axis=1
-        )
-        
         # === NOUVEAU: Filtrer par significativité statistique AVANT le seuil ===
         min_clients_threshold = 50  # Seuil de significativité
         city_stats_significant = city_stats[city_stats['Total'] >= min_clients_threshold].copy()
@@ -3440,8 +4188,7 @@ def render_mode1_visuals(df: pd.DataFrame, threshold: int, max_cities: int):
             # Principe: Impact absolu (pertes $) prime sur taux relatif (%)
             # Source: Reichheld & Sasser (HBR) - Priorité aux segments fort impact absolu
             
-            # Calculer pertes financières pour chaque ville (CLTV réel)
-            critical_cities['Pertes'] = critical_cities['Churned'] * 4149  # CLTV churned dataset
+            # Pertes financières par ville (CLTV réel): colonne 'Pertes'
             
             def categorize_churn_priority(row):
                 """
@@ -3570,7 +4317,7 @@ def create_priority_matrix(city_stats: pd.DataFrame):
     """
     
     # Calculer pertes financières avec CLTV réel dataset
-    city_stats = city_stats.copy()
+    city_stats = city_stats.copy(deep=False)
     city_stats['Pertes'] = city_stats['Churned'] * 4149  # CLTV churned réel
     
     # Catégorisation EXPERTE basée impact business
@@ -3759,21 +4506,9 @@ def render_priority_matrix_visual(matrix_data: dict):
         
         st.markdown("</div>", unsafe_allow_html=True)
 
-def render_mode2_visuals(df: pd.DataFrame, top_n: int, sort_by: str):
+def render_mode2_visuals(city_stats: pd.DataFrame, top_n: int, sort_by: str):
     """Mode 2: Visualisations du Top N villes avec matrice de priorisation"""
     try:
-        # Préparer les données
-        city_stats = df.groupby('City').agg({
-            'CustomerID': 'count',
-            'Customer Status': lambda x: (x == 'Churned').sum()
-        }).reset_index()
-        city_stats.columns = ['City', 'Total', 'Churned']
-        
-        city_stats['Churn_Rate'] = city_stats.apply(
-            lambda row: DataValidator.safe_percentage(row['Churned'], row['Total']),
-            axis=1
-        )
-        
         # === NOUVEAU: Filtrer les villes statistiquement significatives ===
         min_clients_threshold = 50  # Seuil de significativité
         city_stats_significant = city_stats[city_stats['Total'] >= min_clients_threshold].copy()
@@ -4185,30 +4920,12 @@ def generate_action_report(top_cities: pd.DataFrame, financial: dict, matrix_dat
         st.error(f"Erreur génération PDF: {str(e)}")
         return None
 
-def render_mode3_visuals(df: pd.DataFrame, min_churned: int, groupby: str):
+def render_mode3_visuals(city_stats: pd.DataFrame, min_churned: int, groupby: str):
     """Mode 3: Visualisations vue complète"""
     try:
-        # Préparer les données
-        city_stats = df.groupby('City').agg({
-            'CustomerID': 'count',
-            'Customer Status': lambda x: (x == 'Churned').sum(),
-            'Latitude': 'first'
-        }).reset_index()
-        city_stats.columns = ['City', 'Total', 'Churned', 'Latitude']
-        
-        city_stats['Churn_Rate'] = city_stats.apply(
-            lambda row: DataValidator.safe_percentage(row['Churned'], row['Total']),
-            axis=1
-        )
-        
-        # Filtrer
+        # Filtrer (régions géographiques déjà dans les statistiques par ville)
         city_filtered = city_stats[city_stats['Churned'] >= min_churned].copy()
         
-        # Créer régions géographiques
-        city_filtered['Region'] = city_filtered['Latitude'].apply(
-            lambda x: 'Sud' if x < 34 else 'Nord' if x >= 37 else 'Centre'
-        )
-        
         if groupby == 'Région':
             # === VIZ 1: Treemap par région ===
             st.markdown("#### 🗺️ Répartition géographique")
@@ -4218,9 +4935,8 @@ def render_mode3_visuals(df: pd.DataFrame, min_churned: int, groupby: str):
                 'Total': 'sum'
             }).reset_index()
             
-            region_stats['Churn_Rate'] = region_stats.apply(
-                lambda row: DataValidator.safe_percentage(row['Churned'], row['Total']),
-                axis=1
+            region_stats['Churn_Rate'] = DataValidator.safe_percentage_array(
+                region_stats['Churned'], region_stats['Total']
             )
             
             fig = px.treemap(
@@ -4287,10 +5003,14 @@ def render_mode3_visuals(df: pd.DataFrame, min_churned: int, groupby: str):
 # ONGLET PLAN D'ACTION - VERSION CONSOLIDÉE GLOBALE
 # ============================================================================
 
-def render_action_plan_tab(df: pd.DataFrame):
+def render_action_plan_tab(df: Dataset, sql_source: Optional[SqliteSource] = None,
+                           cities: Optional[pd.DataFrame] = None):
     """
     Onglet 5: Plan d'action GLOBAL - Synthèse multi-dimensionnelle
     Roadmap consolidée + Recommandations GEO + COMPORTEMENT + SATISFACTION + FINANCE
+    
+    cities: statistiques par ville partagées (city_statistics), calculées
+    ici si absentes
     """
     st.markdown('<h2 class="sub-title">🚀 Plan d\'action anti-churn global</h2>', 
                 unsafe_allow_html=True)
@@ -4307,34 +5027,29 @@ def render_action_plan_tab(df: pd.DataFrame):
     
     # ========== ANALYSES PAR DIMENSION ==========
     try:
-        df_temp = df.copy()
+        df_temp = as_frame(df)
         
         # Vérifier que colonne Churn existe
-        if 'Churn' not in df_temp.columns:
+        if 'Is_Churned' not in df_temp.columns:
             st.error("❌ Colonne 'Churn' manquante dans les données")
             st.info("Colonnes disponibles: " + ", ".join(df_temp.columns.tolist()[:10]))
             return
-            
-        df_temp['Is_Churned'] = (df_temp['Churn'] == 'Yes').astype(int)
         
         # 1. ANALYSE GÉOGRAPHIQUE
-        city_stats = df_temp.groupby('City', as_index=False).agg({
-            'customerID': 'count',
-            'Is_Churned': 'sum'
-        })
-        city_stats.columns = ['City', 'Total', 'Churned']
-        city_stats['Pertes'] = city_stats['Churned'] * 4149  # CLTV churned réel dataset
+        if cities is None:
+            cities = build_city_stats(df, sql_source)
+        city_stats = cities[['City', 'Total', 'Churned', 'Pertes']]
         city_stats = city_stats[city_stats['Total'] >= 50].sort_values('Pertes', ascending=False)
         
         top3_cities = city_stats.head(3)
         
         # 2. ANALYSE COMPORTEMENTALE (sans lambda)
         if 'Contract' in df.columns:
-            contract_stats = df_temp.groupby('Contract', as_index=False).agg({
-                'customerID': 'count',
-                'Is_Churned': 'sum'
-            })
-            contract_stats['Churn_Rate'] = (contract_stats['Is_Churned'] / contract_stats['customerID'] * 100)
+            if sql_source is not None and sql_source.has('Contract', 'CustomerID', 'Churn'):
+                contract_stats = sql_source.churn_stats(['Contract'], 'CustomerID', 'Churn', 'Yes', like=df_temp)
+            else:
+                contract_stats = churn_stats(df_temp, ['Contract'])
+            contract_stats['Churn_Rate'] = (contract_stats['Churned'] / contract_stats['Total'] * 100)
             contract_stats = contract_stats.sort_values('Churn_Rate', ascending=False)
             top_contract = contract_stats.iloc[0]['Contract'] if len(contract_stats) > 0 else "Month-to-month"
             top_contract_rate = contract_stats.iloc[0]['Churn_Rate'] if len(contract_stats) > 0 else 42
@@ -4343,11 +5058,8 @@ def render_action_plan_tab(df: pd.DataFrame):
             top_contract_rate = 42
             
         if 'Internet Service' in df.columns:
-            internet_stats = df_temp.groupby('Internet Service', as_index=False).agg({
-                'customerID': 'count',
-                'Is_Churned': 'sum'
-            })
-            internet_stats['Churn_Rate'] = (internet_stats['Is_Churned'] / internet_stats['customerID'] * 100)
+            internet_stats = churn_stats(df_temp, ['Internet Service'])
+            internet_stats['Churn_Rate'] = (internet_stats['Churned'] / internet_stats['Total'] * 100)
             internet_stats = internet_stats.sort_values('Churn_Rate', ascending=False)
             top_internet = internet_stats.iloc[0]['Internet Service'] if len(internet_stats) > 0 else "Fiber optic"
             top_internet_rate = internet_stats.iloc[0]['Churn_Rate'] if len(internet_stats) > 0 else 42
@@ -4357,11 +5069,8 @@ def render_action_plan_tab(df: pd.DataFrame):
             
         # 3. ANALYSE SATISFACTION (sans lambda)
         if 'Tech Support' in df.columns:
-            support_stats = df_temp.groupby('Tech Support', as_index=False).agg({
-                'customerID': 'count',
-                'Is_Churned': 'sum'
-            })
-            support_stats['Churn_Rate'] = (support_stats['Is_Churned'] / support_stats['customerID'] * 100)
+            support_stats = churn_stats(df_temp, ['Tech Support'])
+            support_stats['Churn_Rate'] = (support_stats['Churned'] / support_stats['Total'] * 100)
             support_stats = support_stats.sort_values('Churn_Rate', ascending=False)
             worst_support = support_stats.iloc[0]['Tech Support'] if len(support_stats) > 0 else "No"
             worst_support_rate = support_stats.iloc[0]['Churn_Rate'] if len(support_stats) > 0 else 41
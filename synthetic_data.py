@@ -0,0 +1,365 @@
+"""
+🧪 DONNÉES SYNTHÉTIQUES - Générateur de jeux de test à grande échelle
+
+Features:
+- Profil ajusté sur telco_churn_master.csv (mêmes 39 colonnes, même ordre)
+- Lois jointes empiriques Contract / Internet Service / Satisfaction / Churn,
+  puis colonnes tirées conditionnellement à leurs colonnes parentes
+- Nombre de villes configurable (villes et codes postaux synthétiques au-delà
+  des villes réelles)
+- Génération vectorisée par blocs, déterministe pour une graine donnée
+
+Usage:
+    python synthetic_data.py --rows 1000000 --cities 3000 --seed 42 --output telco_1m.csv
+
+Author: EthicalDataBoost
+Date: 2026-10-17
+Version: 1.0
+"""
+
+import argparse
+import string
+import time
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# ========================================
+# CONSTANTES
+# ========================================
+
+DEFAULT_SOURCE = 'telco_churn_master.csv'
+DEFAULT_CHUNKSIZE = 1_000_000
+
+# Étapes de génération: (colonnes tirées ensemble, colonnes parentes).
+# Chaque groupe suit la loi jointe empirique observée sachant ses parents.
+GENERATION_STEPS = [
+    (['Contract', 'Internet Service', 'Satisfaction Score', 'Churn Label'], []),
+    (['Customer Status'], ['Churn Label', 'Contract']),
+    (['Tenure in Months'], ['Contract', 'Customer Status']),
+    (['Phone Service'], ['Internet Service']),
+    (['Multiple Lines'], ['Phone Service', 'Churn Label']),
+    (['Online Security', 'Online Backup', 'Device Protection', 'Tech Support',
+      'Streaming TV', 'Streaming Movies'], ['Internet Service', 'Churn Label']),
+    (['Offer'], ['Contract', 'Customer Status']),
+    (['Gender', 'Partner', 'Dependents'], ['Churn Label']),
+    (['Age'], ['Dependents', 'Churn Label']),
+    (['Paperless Billing (facturation électronique)', 'Payment Method'], ['Contract', 'Churn Label']),
+    (['Monthly Charge'], ['Internet Service', 'Phone Service', 'Streaming TV', 'Streaming Movies']),
+    (['Churn Score'], ['Churn Label']),
+    (['CLTV'], ['Contract', 'Churn Label']),
+    (['Churn Category', 'Churn Reason_x', 'Churn Reason_y'], ['Customer Status'])
+]
+
+# Colonnes constantes reprises telles quelles (valeur la plus fréquente)
+CONSTANT_COLUMNS = ['Count', 'Country', 'State']
+
+LOCATION_COLUMNS = ['City', 'Zip Code', 'Latitude', 'Longitude', 'Lat Long']
+
+# Dispersion (degrés) des coordonnées d'une ville synthétique autour de sa ville modèle
+SYNTHETIC_CITY_JITTER = 0.05
+
+# ========================================
+# LOIS CONDITIONNELLES EMPIRIQUES
+# ========================================
+
+def _combine(codes: List[np.ndarray], cards: List[int], n: int) -> np.ndarray:
+    """Identifiant unique d'une combinaison de codes (base mixte)"""
+    combined = np.zeros(n, dtype=np.int64)
+    for values, card in zip(codes, cards):
+        combined = combined * card + values
+    return combined
+
+
+class ConditionalSampler:
+    """
+    Loi empirique d'un groupe de colonnes sachant des colonnes parentes
+
+    Travaille sur des codes entiers (pd.factorize, manquants inclus): une
+    fonction de répartition par combinaison de parents observée, plus la
+    loi marginale pour une combinaison jamais vue. Les colonnes numériques
+    sont traitées comme des modalités: tirer selon leurs fréquences revient
+    à un bootstrap des valeurs observées.
+    """
+
+    def __init__(self, codes: Dict[str, np.ndarray], cards: Dict[str, int],
+                 children: List[str], parents: List[str]):
+        self.children = list(children)
+        self.parents = list(parents)
+        self._parent_cards = [cards[col] for col in self.parents]
+        child_cards = [cards[col] for col in self.children]
+
+        n = len(codes[self.children[0]])
+        parent_ids = _combine([codes[col] for col in self.parents], self._parent_cards, n)
+        child_ids = _combine([codes[col] for col in self.children], child_cards, n)
+
+        self._groups, group_rows = np.unique(parent_ids, return_inverse=True)
+        combos, combo_cols = np.unique(child_ids, return_inverse=True)
+
+        # Dernière ligne: loi marginale (combinaison de parents inédite)
+        n_groups, n_combos = len(self._groups) + 1, len(combos)
+        weights = np.bincount(group_rows * n_combos + combo_cols,
+                              minlength=(n_groups - 1) * n_combos).astype(float)
+        weights = weights.reshape(n_groups - 1, n_combos)
+        weights = np.vstack([weights, weights.sum(axis=0)])
+        cdf = weights.cumsum(axis=1)
+        cdf /= cdf[:, -1:]
+
+        # Toutes les répartitions à la suite, décalées de leur numéro de
+        # ligne: un seul searchsorted tire pour toutes les lignes à la fois
+        self._n_combos = n_combos
+        self._flat_cdf = (cdf + np.arange(n_groups)[:, None]).ravel()
+        self._child_codes = np.unravel_index(combos, child_cards) if self.children else ()
+
+    def sample(self, rng: np.random.Generator, n: int,
+               codes: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, np.ndarray]:
+        """
+        Tirer n lignes
+
+        Args:
+            rng: Générateur aléatoire
+            n: Nombre de lignes
+            codes: Codes déjà tirés des colonnes parentes
+
+        Returns:
+            Codes tirés par colonne enfant
+        """
+        marginal = len(self._groups)
+        if self.parents:
+            parent_ids = _combine([codes[col] for col in self.parents], self._parent_cards, n)
+            rows = np.searchsorted(self._groups, parent_ids)
+            rows = np.minimum(rows, marginal - 1) if marginal else rows
+            rows = np.where(self._groups[rows] == parent_ids, rows, marginal)
+        else:
+            rows = np.zeros(n, dtype=np.int64)
+
+        position = np.searchsorted(self._flat_cdf, rows + rng.random(n), side='right')
+        choice = np.clip(position - rows * self._n_combos, 0, self._n_combos - 1)
+
+        return {col: child[choice] for col, child in zip(self.children, self._child_codes)}
+
+
+# ========================================
+# PROFIL DU DATASET DE RÉFÉRENCE
+# ========================================
+
+class TelcoProfile:
+    """Profil statistique du CSV de référence, utilisé pour générer des lignes"""
+
+    def __init__(self, df: pd.DataFrame):
+        self.columns = list(df.columns)
+
+        self.constants = {
+            col: df[col].mode().iloc[0]
+            for col in CONSTANT_COLUMNS if col in df.columns
+        }
+
+        steps = [(children, parents) for children, parents in GENERATION_STEPS
+                 if all(col in df.columns for col in children + parents)]
+
+        # Modalités observées par colonne (valeur manquante comprise)
+        codes, self.uniques = {}, {}
+        for col in dict.fromkeys(col for children, parents in steps for col in children + parents):
+            codes[col], uniques = pd.factorize(df[col], use_na_sentinel=False)
+            self.uniques[col] = np.asarray(uniques)
+        cards = {col: len(values) for col, values in self.uniques.items()}
+
+        self.samplers = [ConditionalSampler(codes, cards, children, parents)
+                         for children, parents in steps]
+
+        # Total Charges ≈ Monthly Charge x Tenure x ratio observé
+        total = pd.to_numeric(df['Total Charges'], errors='coerce')
+        billed = df['Monthly Charge'] * df['Tenure in Months']
+        ratio = (total / billed)[billed > 0].dropna().round(3)
+        ratio_codes, ratio_values = pd.factorize(ratio)
+        self.uniques['ratio'] = np.asarray(ratio_values)
+        self.charge_ratio = ConditionalSampler({'ratio': ratio_codes},
+                                               {'ratio': len(ratio_values)}, ['ratio'], [])
+
+        # Localisations réelles (ville, code postal), pondérées par leur effectif
+        locations = df.groupby(['City', 'Zip Code'], sort=False).agg(
+            Latitude=('Latitude', 'first'),
+            Longitude=('Longitude', 'first'),
+            **{'Lat Long': ('Lat Long', 'first')},
+            weight=('City', 'size')
+        ).reset_index()
+        city_weight = locations.groupby('City')['weight'].transform('sum')
+        self.locations = (locations.assign(city_weight=city_weight)
+                          .sort_values(['city_weight', 'City', 'Zip Code'],
+                                       ascending=[False, True, True])
+                          .drop(columns='city_weight')
+                          .reset_index(drop=True))
+
+    @classmethod
+    def from_csv(cls, path: str = DEFAULT_SOURCE) -> 'TelcoProfile':
+        """Ajuster le profil sur un CSV au format telco_churn_master.csv"""
+        return cls(pd.read_csv(path))
+
+    @property
+    def n_cities(self) -> int:
+        """Nombre de villes du dataset de référence"""
+        return self.locations['City'].nunique()
+
+    def location_table(self, n_cities: Optional[int], rng: np.random.Generator) -> pd.DataFrame:
+        """
+        Table des localisations pour un nombre de villes donné
+
+        En dessous du nombre réel: les villes les plus peuplées. Au-delà:
+        villes synthétiques ("<ville modèle> 2", ...) avec un code postal
+        inédit, des coordonnées proches de la ville modèle et un poids tiré
+        parmi les poids réels.
+        """
+        real = self.locations
+        cities = real['City'].drop_duplicates().tolist()
+
+        if n_cities is None or n_cities == len(cities):
+            return real
+        if n_cities < len(cities):
+            return real[real['City'].isin(cities[:n_cities])].reset_index(drop=True)
+
+        extra = n_cities - len(cities)
+        k = np.arange(extra)
+        models = real.drop_duplicates('City').reset_index(drop=True)
+        model = models.iloc[k % len(models)].reset_index(drop=True)
+
+        used = set(real['Zip Code'].tolist())
+        free_zips = [z for z in range(90001, 100000) if z not in used]
+        zips = np.array(free_zips[:extra] + list(range(100000, 100000 + max(0, extra - len(free_zips)))))
+
+        latitude = (model['Latitude'] + rng.normal(0, SYNTHETIC_CITY_JITTER, extra)).round(6)
+        longitude = (model['Longitude'] + rng.normal(0, SYNTHETIC_CITY_JITTER, extra)).round(6)
+
+        synthetic = pd.DataFrame({
+            'City': model['City'] + ' ' + pd.Series(k // len(models) + 2).astype(str),
+            'Zip Code': zips,
+            'Latitude': latitude,
+            'Longitude': longitude,
+            'Lat Long': latitude.astype(str) + ', ' + longitude.astype(str),
+            'weight': rng.choice(real['weight'].to_numpy(), size=extra)
+        })
+        return pd.concat([real, synthetic], ignore_index=True)
+
+
+# ========================================
+# GÉNÉRATION
+# ========================================
+
+def _customer_ids(row_numbers: np.ndarray, seed: int) -> np.ndarray:
+    """Identifiants uniques au format '1234-ABCDE' (4 chiffres, 5 lettres)"""
+    buf = np.empty((len(row_numbers), 10), dtype=np.uint8)
+    digits = row_numbers % 10_000
+    for i in range(4):
+        buf[:, 3 - i] = ord('0') + digits % 10
+        digits = digits // 10
+    buf[:, 4] = ord('-')
+
+    # Décalage dépendant de la graine: bijection sur les 26^5 combinaisons
+    letters = (row_numbers // 10_000 + seed * 7_919) % 26 ** 5
+    alphabet = np.frombuffer(string.ascii_uppercase.encode(), dtype=np.uint8)
+    for i in range(5):
+        buf[:, 9 - i] = alphabet[letters % 26]
+        letters = letters // 26
+
+    return buf.view('S10').ravel().astype(str)
+
+
+def _generate_chunk(profile: TelcoProfile, locations: pd.DataFrame, location_cdf: np.ndarray,
+                    start: int, n: int, seed: int, chunk_index: int) -> pd.DataFrame:
+    """Générer un bloc de n lignes (graine dérivée de (seed, numéro de bloc))"""
+    rng = np.random.default_rng([seed, chunk_index])
+
+    codes = {}
+    for sampler in profile.samplers:
+        codes.update(sampler.sample(rng, n, codes))
+    data = {col: profile.uniques[col][col_codes] for col, col_codes in codes.items()}
+
+    if 'Age' in data:
+        data['Senior Citizen'] = np.where(data['Age'] >= 65, 'Yes', 'No')
+    if 'Churn Label' in data:
+        data['Churn Value'] = (data['Churn Label'] == 'Yes').astype(np.int64)
+
+    ratio = profile.uniques['ratio'][profile.charge_ratio.sample(rng, n)['ratio']]
+    billed = data['Monthly Charge'] * data['Tenure in Months']
+    data['Total Charges'] = np.where(billed > 0, np.round(billed * ratio, 2), np.nan)
+
+    picked = np.searchsorted(location_cdf, rng.random(n), side='right')
+    np.minimum(picked, len(locations) - 1, out=picked)
+    for col in LOCATION_COLUMNS:
+        data[col] = locations[col].to_numpy()[picked]
+
+    for col, value in profile.constants.items():
+        data[col] = np.full(n, value)
+
+    data['CustomerID'] = _customer_ids(np.arange(start, start + n), seed)
+
+    # Construction en une fois, dans l'ordre des colonnes du CSV de référence
+    return pd.DataFrame({col: data[col] for col in profile.columns if col in data})
+
+
+def generate(profile: TelcoProfile, n_rows: int, seed: int = 42,
+             n_cities: Optional[int] = None,
+             chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[pd.DataFrame]:
+    """
+    Générer un dataset synthétique bloc par bloc
+
+    Args:
+        profile: Profil ajusté sur le CSV de référence
+        n_rows: Nombre total de lignes
+        seed: Graine (même graine et même chunksize = même fichier)
+        n_cities: Nombre de villes (défaut: celui du dataset de référence)
+        chunksize: Lignes par bloc (borne la mémoire utilisée)
+
+    Yields:
+        DataFrames au format du CSV de référence
+    """
+    locations = profile.location_table(n_cities, np.random.default_rng([seed, 0xC17]))
+    weights = locations['weight'].to_numpy(dtype=float)
+    location_cdf = weights.cumsum() / weights.sum()
+
+    for chunk_index, start in enumerate(range(0, n_rows, chunksize)):
+        n = min(chunksize, n_rows - start)
+        yield _generate_chunk(profile, locations, location_cdf, start, n, seed, chunk_index)
+
+
+def _write_chunk(chunk: pd.DataFrame, f, header: bool) -> None:
+    """Écrire un bloc en CSV (writer pyarrow si disponible, bien plus rapide)"""
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        chunk.to_csv(f, index=False, header=header)
+        return
+
+    table = pa.Table.from_pandas(chunk, preserve_index=False)
+    pa_csv.write_csv(table, f, write_options=pa_csv.WriteOptions(include_header=header))
+
+
+def write_csv(profile: TelcoProfile, path: str, n_rows: int, seed: int = 42,
+              n_cities: Optional[int] = None, chunksize: int = DEFAULT_CHUNKSIZE) -> None:
+    """Écrire un dataset synthétique en CSV (voir generate)"""
+    with open(path, 'wb') as f:
+        for i, chunk in enumerate(generate(profile, n_rows, seed, n_cities, chunksize)):
+            _write_chunk(chunk, f, header=(i == 0))
+
+
+def main() -> None:
+    """Point d'entrée en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Générer un dataset Telco synthétique")
+    parser.add_argument('--rows', type=int, default=100_000, help="Nombre de lignes")
+    parser.add_argument('--cities', type=int, default=None, help="Nombre de villes")
+    parser.add_argument('--seed', type=int, default=42, help="Graine aléatoire")
+    parser.add_argument('--source', default=DEFAULT_SOURCE, help="CSV de référence")
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE, help="Lignes par bloc")
+    parser.add_argument('--output', required=True, help="Fichier CSV à écrire")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    profile = TelcoProfile.from_csv(args.source)
+    write_csv(profile, args.output, args.rows, args.seed, args.cities, args.chunksize)
+    print(f"✅ {args.rows:,} lignes écrites dans {args.output} "
+          f"en {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+🧪 FIXTURES COMMUNES - Petit extrait du CSV Telco et normalisation du dashboard
+
+Les modules du projet sont à la racine du dépôt: celle-ci est ajoutée au
+chemin d'import. Chaque test travaille dans un répertoire temporaire (CSV,
+snapshot, agrégats), jamais sur les fichiers du dépôt.
+"""
+
+import os
+import sys
+import warnings
+
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SOURCE_CSV = os.path.join(ROOT, 'telco_churn_master.csv')
+
+# Lignes de l'extrait: assez pour plusieurs villes, contrats et statuts
+SAMPLE_ROWS = 400
+
+
+@pytest.fixture(scope='session')
+def build_fn():
+    """Parsing + normalisation de load_data (_build_dataset du dashboard)"""
+    with warnings.catch_warnings():
+        # Import hors `streamlit run`: avertissements de contexte sans objet
+        warnings.simplefilter('ignore')
+        from streamlit_app import _build_dataset
+    return _build_dataset
+
+
+@pytest.fixture(scope='session')
+def raw_sample() -> pd.DataFrame:
+    """Premières lignes brutes du CSV livré"""
+    return pd.read_csv(SOURCE_CSV, nrows=SAMPLE_ROWS)
+
+
+@pytest.fixture
+def csv_path(tmp_path, raw_sample) -> str:
+    """Extrait écrit dans un répertoire temporaire (snapshot à côté)"""
+    path = tmp_path / 'telco_churn_master.csv'
+    raw_sample.to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture
+def dataset(csv_path, build_fn) -> pd.DataFrame:
+    """Extrait normalisé, colonnes calculées comprises (sans snapshot)"""
+    return build_fn(csv_path)
+
+
+def write_delta(directory, raw: pd.DataFrame, name: str = 'delta.csv') -> str:
+    """Écrire un fichier delta (format du CSV complet) et retourner son chemin"""
+    path = os.path.join(str(directory), name)
+    raw.to_csv(path, index=False)
+    return path
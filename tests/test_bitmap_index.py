@@ -0,0 +1,55 @@
+"""
+🧪 INDEX BITMAP - Sélections identiques au masque pandas (isin)
+"""
+
+import numpy as np
+import pytest
+
+from bitmap_index import BITMAP_MAX_VALUES, BitmapIndex
+from data_schema import ALL_VALUES
+
+FILTER_COLUMNS = ['Tranche_Age', 'Contract', 'City', 'Offer', 'Gender']
+
+
+def _pandas_mask(df, selection) -> np.ndarray:
+    mask = np.ones(len(df), dtype=bool)
+    for column, values in selection.items():
+        if values and ALL_VALUES not in values:
+            mask &= df[column].astype(str).isin(values).to_numpy()
+    return mask
+
+
+@pytest.fixture
+def index(dataset):
+    return BitmapIndex(dataset, FILTER_COLUMNS)
+
+
+def test_both_index_layouts_are_exercised(dataset, index):
+    # Bitsets par valeur (contrat) et lignes triées (villes)
+    assert dataset['Contract'].nunique() <= BITMAP_MAX_VALUES < dataset['City'].nunique()
+    assert index.columns['Contract'].bitsets is not None
+    assert index.columns['City'].bitsets is None
+
+
+def test_selections_match_pandas(dataset, index):
+    cities = dataset['City'].value_counts().index[:3].astype(str).tolist()
+    selections = [
+        {'Contract': ['Two year']},
+        {'Contract': ['Month-to-month', 'One year'], 'Gender': ['Female']},
+        {'City': cities},
+        {'City': cities[:1], 'Contract': ['Month-to-month']},
+        {'Offer': ['Offer A', 'Offer E'], 'Tranche_Age': [str(dataset['Tranche_Age'].iloc[0])]},
+        {'Contract': ['Two year'], 'City': ['Ville inconnue']},
+    ]
+    for selection in selections[:-1]:
+        expected = _pandas_mask(dataset, selection)
+        assert 0 < expected.sum() < len(dataset)
+        np.testing.assert_array_equal(index.mask(selection), expected)
+    assert not index.mask(selections[-1]).any()
+
+
+def test_inactive_filters_give_no_mask(index):
+    assert index.mask({}) is None
+    assert index.mask({'Contract': [ALL_VALUES, 'Two year'], 'City': []}) is None
+    # Colonne absente de l'index: ignorée, comme dans apply_filters
+    assert index.mask({'Colonne inconnue': ['x']}) is None
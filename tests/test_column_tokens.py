@@ -0,0 +1,91 @@
+"""
+🧪 JETONS PAR COLONNE - Un delta ne reconstruit que les caches qui lisent ses colonnes
+"""
+
+import warnings
+
+import pandas as pd
+import pytest
+
+import data_profile
+from columnar_store import columns_token, ingest_delta, load_or_build, snapshot_token
+from conftest import write_delta
+from data_profile import load_or_build_profile, profile_dataset, profile_path
+from selection_cache import SelectionCache
+
+FILTER_COLUMNS = ['Tranche_Age', 'Contract', 'City', 'Offer', 'Gender']
+
+
+@pytest.fixture(scope='module')
+def app():
+    with warnings.catch_warnings():
+        # Import hors `streamlit run`: avertissements de contexte sans objet
+        warnings.simplefilter('ignore')
+        import streamlit_app
+    return streamlit_app
+
+
+def _satisfaction_delta(raw: pd.DataFrame) -> pd.DataFrame:
+    """Clients existants dont seule la satisfaction change"""
+    delta = raw.iloc[:10].copy()
+    delta['Satisfaction Score'] = delta['Satisfaction Score'] % 5 + 1
+    return delta
+
+
+def test_tokens_follow_changed_columns(tmp_path, csv_path, raw_sample, build_fn):
+    load_or_build(csv_path, build_fn)
+    before = snapshot_token(csv_path)
+
+    summary = ingest_delta(csv_path, write_delta(tmp_path, _satisfaction_delta(raw_sample)),
+                           build_fn)
+    assert summary['changed_columns'] == ['Satisfaction Score']
+    after = snapshot_token(csv_path)
+    assert after != before
+    assert (columns_token(csv_path, FILTER_COLUMNS, after)
+            == columns_token(csv_path, FILTER_COLUMNS, before))
+    assert (columns_token(csv_path, ['Satisfaction Score'], after)
+            != columns_token(csv_path, ['Satisfaction Score'], before))
+
+    # Nouveaux clients: toutes les colonnes changent
+    new = raw_sample.iloc[:1].copy()
+    new['CustomerID'] = 'NEW-00001'
+    ingest_delta(csv_path, write_delta(tmp_path, new, 'new.csv'), build_fn)
+    assert columns_token(csv_path, FILTER_COLUMNS) != columns_token(csv_path, FILTER_COLUMNS, after)
+
+
+def test_unrelated_caches_are_reused(tmp_path, csv_path, raw_sample, build_fn, app, monkeypatch):
+    load_or_build(csv_path, build_fn)
+    before = snapshot_token(csv_path)
+    filters_before = app._columns_token(csv_path, before, tuple(FILTER_COLUMNS))
+    index = app._load_filter_index(csv_path, filters_before, before)
+
+    cache = SelectionCache()
+    key = (('Contract', ('Two year',)),)
+    cache.get_or_compute(key, 'rows', lambda: 'lignes', filters_before)
+    cache.get_or_compute(key, 'satisfaction', lambda: 'avant',
+                         columns_token(csv_path, FILTER_COLUMNS + ['Satisfaction Score'], before))
+    load_or_build_profile(profile_path(csv_path), before, lambda: load_or_build(csv_path, build_fn),
+                          lambda column: columns_token(csv_path, [column], before))
+
+    ingest_delta(csv_path, write_delta(tmp_path, _satisfaction_delta(raw_sample)), build_fn)
+    after = snapshot_token(csv_path)
+
+    # Index bitmap et lignes par sélection: colonnes filtrées inchangées
+    filters_after = app._columns_token(csv_path, after, tuple(FILTER_COLUMNS))
+    assert app._load_filter_index(csv_path, filters_after, after) is index
+    assert cache.get_or_compute(key, 'rows', lambda: 'recalcul', filters_after) == 'lignes'
+    assert cache.get_or_compute(key, 'satisfaction', lambda: 'après', columns_token(
+        csv_path, FILTER_COLUMNS + ['Satisfaction Score'], after)) == 'après'
+
+    # Profil: seule la colonne modifiée est relue
+    profiled = []
+    profile_column = data_profile.profile_column
+    monkeypatch.setattr(data_profile, 'profile_column',
+                        lambda series: profiled.append(series.name) or profile_column(series))
+    merged = load_or_build(csv_path, build_fn)
+    profile = load_or_build_profile(profile_path(csv_path), after, lambda: merged,
+                                    lambda column: columns_token(csv_path, [column], after))
+    assert profiled == ['Satisfaction Score']
+
+    monkeypatch.setattr(data_profile, 'profile_column', profile_column)
+    pd.testing.assert_frame_equal(profile, profile_dataset(merged))
@@ -0,0 +1,111 @@
+"""Snapshot colonnaire: fusion de deltas par génération, rejeu du journal"""
+
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from columnar_store import (SCHEMA_FILENAME, DeltaReplayError, default_snapshot_dir, ingest_delta,
+                            load_or_build, read_delta_log, read_schema)
+from conftest import write_delta
+
+
+def _delta(raw: pd.DataFrame) -> pd.DataFrame:
+    """Deux clients modifiés (dont une ville inconnue) et un nouveau client"""
+    changed = raw.iloc[[0, 5]].copy()
+    changed['Satisfaction Score'] = [5, 1]
+    changed.iloc[1, changed.columns.get_loc('City')] = 'Nouvelle Ville'
+    added = raw.iloc[[1]].copy()
+    added['CustomerID'] = ['NEW-00001']
+    return pd.concat([changed, added])
+
+
+def _merged(raw: pd.DataFrame, delta: pd.DataFrame) -> pd.DataFrame:
+    """CSV complet équivalent au CSV + delta"""
+    merged = raw.set_index('CustomerID').astype(object)
+    changes = delta.set_index('CustomerID').astype(object)
+    known = changes.index.isin(merged.index)
+    merged.loc[changes.index[known]] = changes[known]
+    return pd.concat([merged, changes[~known]]).reset_index()[raw.columns]
+
+
+def _values(df: pd.DataFrame) -> pd.DataFrame:
+    """Valeurs comparables quel que soit le type de stockage"""
+    return df.astype(object).where(df.notna(), None).reset_index(drop=True)
+
+
+def test_delta_matches_full_rebuild(tmp_path, csv_path, raw_sample, build_fn):
+    load_or_build(csv_path, build_fn)
+    delta = _delta(raw_sample)
+    summary = ingest_delta(csv_path, write_delta(tmp_path, delta), build_fn)
+
+    assert (summary['updated'], summary['inserted']) == (2, 1)
+    merged_csv = write_delta(tmp_path, _merged(raw_sample, delta), 'merged.csv')
+    pd.testing.assert_frame_equal(_values(load_or_build(csv_path, build_fn)),
+                                  _values(build_fn(merged_csv)))
+
+
+def test_delta_is_applied_once(tmp_path, csv_path, raw_sample, build_fn):
+    delta_path = write_delta(tmp_path, _delta(raw_sample))
+    ingest_delta(csv_path, delta_path, build_fn)
+    again = ingest_delta(csv_path, delta_path, build_fn)
+
+    assert again['skipped']
+    assert len(load_or_build(csv_path, build_fn)) == len(raw_sample) + 1
+
+
+def test_loaded_frame_survives_delta(tmp_path, csv_path, raw_sample, build_fn):
+    # Un rendu en cours garde le DataFrame de la génération précédente
+    df = load_or_build(csv_path, build_fn)
+    expected = _values(df)
+    n_cities = len(df['City'].cat.categories)
+
+    ingest_delta(csv_path, write_delta(tmp_path, _delta(raw_sample)), build_fn)
+
+    pd.testing.assert_frame_equal(_values(df), expected)
+    assert len(df['City'].cat.categories) == n_cities
+    assert df['City'].cat.codes.max() < n_cities
+    current = load_or_build(csv_path, build_fn)
+    assert 'Nouvelle Ville' in set(current['City'].astype(str))
+
+
+def test_replay_after_snapshot_loss(tmp_path, csv_path, raw_sample, build_fn):
+    ingest_delta(csv_path, write_delta(tmp_path, _delta(raw_sample)), build_fn)
+    expected = _values(load_or_build(csv_path, build_fn))
+
+    # Snapshot perdu: reconstruit depuis le CSV puis journal rejoué
+    snapshot_dir = default_snapshot_dir(csv_path)
+    shutil.rmtree(snapshot_dir)
+
+    pd.testing.assert_frame_equal(_values(load_or_build(csv_path, build_fn)), expected)
+    assert len(read_delta_log(snapshot_dir)['deltas']) == 1
+
+
+def test_replay_failure_is_surfaced(tmp_path, csv_path, raw_sample, build_fn):
+    delta_path = write_delta(tmp_path, _delta(raw_sample))
+    ingest_delta(csv_path, delta_path, build_fn)
+    os.remove(delta_path)
+    shutil.rmtree(default_snapshot_dir(csv_path))
+
+    # Pas de repli silencieux sur le CSV seul (deltas perdus)
+    with pytest.raises(DeltaReplayError):
+        load_or_build(csv_path, build_fn)
+    assert len(read_delta_log(default_snapshot_dir(csv_path))['deltas']) == 1
+
+
+def test_replay_failure_keeps_published_generation(tmp_path, csv_path, raw_sample, build_fn):
+    delta_path = write_delta(tmp_path, _delta(raw_sample))
+    ingest_delta(csv_path, delta_path, build_fn)
+    os.remove(delta_path)
+
+    # Fichier de colonne tronqué: reconstruction, dont le rejeu échoue
+    snapshot_dir = default_snapshot_dir(csv_path)
+    schema = read_schema(snapshot_dir)
+    with open(os.path.join(snapshot_dir, schema['columns'][0]['file']), 'ab') as f:
+        f.write(b'\0')
+
+    with pytest.raises(DeltaReplayError):
+        load_or_build(csv_path, build_fn)
+    assert os.path.exists(os.path.join(snapshot_dir, SCHEMA_FILENAME))
+    assert read_schema(snapshot_dir)['n_rows'] == len(raw_sample) + 1
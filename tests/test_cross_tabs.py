@@ -0,0 +1,70 @@
+"""
+🧪 CROISEMENTS - Paires calculées à la demande, identiques au groupby pandas
+"""
+
+import pandas as pd
+
+from cross_tabs import CrossTabStore, explorer_variables
+from selection_cache import SelectionCache, estimate_nbytes
+
+
+def _reference(df: pd.DataFrame, var1: str, var2: str) -> pd.DataFrame:
+    ref = df.groupby([var1, var2], observed=True)['Is_Churned'].agg(['mean', 'count'])
+    ref.columns = ['Churn_Rate', 'Count']
+    ref['Churn_Rate'] *= 100
+    return ref.reset_index()
+
+
+def test_pairs_match_groupby(dataset):
+    variables = explorer_variables(dataset)
+    store = CrossTabStore(dataset, variables)
+
+    for var1, var2 in [(variables[0], variables[1]), (variables[1], variables[0]),
+                       ('Internet Service', 'Offer'), ('Tranche_Age', 'Contract')]:
+        pd.testing.assert_frame_equal(store.cross_table(var1, var2),
+                                      _reference(dataset, var1, var2))
+
+
+def test_pairs_are_computed_lazily(dataset):
+    store = CrossTabStore(dataset, explorer_variables(dataset))
+    assert not store.tables
+    assert ('Contract', 'Internet Service') in store
+    assert ('Contract', 'Contract') not in store
+
+    store.counts('Internet Service', 'Contract')
+    total, _ = store.counts('Contract', 'Internet Service')
+    # Une seule matrice pour les deux sens de la paire
+    assert list(store.tables) == [('Contract', 'Internet Service')]
+    assert total.sum() == len(dataset)
+
+
+def test_lazy_pairs_are_counted_by_the_selection_cache(dataset):
+    variables = explorer_variables(dataset)
+    cache = SelectionCache(max_entries=8, max_bytes=10 ** 9)
+    key = (('Gender', ('Female',)),)
+    store = cache.get_or_compute(key, 'cross_tabs', lambda: CrossTabStore(
+        dataset, variables, on_fill=lambda: cache.refresh_size(key, 'cross_tabs')))
+    before = cache.stats()['nbytes']
+
+    for var in variables[1:]:
+        store.counts(variables[0], var)
+    assert cache.stats()['nbytes'] > before
+    assert cache.stats()['nbytes'] == estimate_nbytes(store)
+
+
+def test_lazy_fill_evicts_older_selections(dataset):
+    variables = explorer_variables(dataset)
+    cache = SelectionCache(max_entries=8, max_bytes=10 ** 9)
+    cache.put((('Contract', ('Two year',)),), 'rows', dataset.index.to_numpy())
+    key = (('Gender', ('Female',)),)
+    store = CrossTabStore(dataset, variables,
+                          on_fill=lambda: cache.refresh_size(key, 'cross_tabs'))
+    cache.put(key, 'cross_tabs', store)
+    # Borne atteinte tout juste: seule la croissance du magasin la dépasse
+    cache.max_bytes = cache.stats()['nbytes']
+    assert cache.stats()['entries'] == 2
+
+    store.counts(variables[0], variables[1])
+    # Borne dépassée: l'entrée qui vient de grandir est gardée, pas les autres
+    assert cache.stats()['entries'] == 1
+    assert cache.get_or_compute(key, 'cross_tabs', lambda: None) is store
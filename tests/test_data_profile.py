@@ -0,0 +1,51 @@
+"""
+🧪 PROFIL QUALITÉ - Échecs de conversion comptés au chargement, deltas compris
+"""
+
+import pandas as pd
+
+from columnar_store import COERCION_ATTR, default_snapshot_dir, ingest_delta, load_or_build
+from conftest import write_delta
+from data_profile import profile_dataset
+from data_schema import COERCED_NUMERIC_COLUMNS
+
+
+def _raw_counts(path) -> dict:
+    """Référence: le fichier relu en texte brut"""
+    raw = pd.read_csv(path, usecols=COERCED_NUMERIC_COLUMNS.__contains__, dtype=str)
+    return {col: {'nulls': int(raw[col].isna().sum()),
+                  'failures': int((pd.to_numeric(raw[col], errors='coerce').isna()
+                                   & raw[col].notna()).sum())}
+            for col in raw.columns}
+
+
+def _failures(profile, column) -> int:
+    return int(profile.set_index('Colonne').loc[column, 'Échecs conversion'])
+
+
+def test_counts_match_the_raw_file(csv_path, build_fn):
+    expected = _raw_counts(csv_path)
+    assert build_fn(csv_path).attrs[COERCION_ATTR] == expected
+    # Conservés avec le snapshot: relus sans reparser le CSV
+    assert load_or_build(csv_path, build_fn).attrs[COERCION_ATTR] == expected
+    assert load_or_build(csv_path, build_fn).attrs[COERCION_ATTR] == expected
+
+
+def test_bad_delta_is_reported(tmp_path, csv_path, raw_sample, build_fn):
+    before = _failures(profile_dataset(load_or_build(csv_path, build_fn)), 'Monthly Charge')
+
+    delta = raw_sample.iloc[:5].copy()
+    delta['Monthly Charge'] = delta['Monthly Charge'].astype(object)
+    delta.iloc[:3, delta.columns.get_loc('Monthly Charge')] = ['inconnu', '12,50', 'erreur']
+    summary = ingest_delta(csv_path, write_delta(tmp_path, delta), build_fn)
+    assert summary['coercion']['Monthly Charge']['failures'] == 3
+
+    merged = load_or_build(csv_path, build_fn)
+    assert _failures(profile_dataset(merged), 'Monthly Charge') == before + 3
+
+    # Snapshot reconstruit (deltas rejoués): mêmes compteurs
+    schema_path = default_snapshot_dir(csv_path) + '/schema.json'
+    with open(schema_path, 'w', encoding='utf-8') as f:
+        f.write('{}')
+    rebuilt = load_or_build(csv_path, build_fn)
+    assert rebuilt.attrs[COERCION_ATTR] == merged.attrs[COERCION_ATTR]
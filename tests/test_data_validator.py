@@ -0,0 +1,68 @@
+"""
+🧪 VALIDATEUR - Versions vectorisées identiques aux versions scalaires
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+SPECIAL = [0.0, -0.0, 1.0, -3.0, 7.0, np.nan, np.inf, -np.inf]
+
+# Demis décimaux et valeurs qui n'en ont que l'apparence (2.675 < 2.675 exact)
+HALVES = [0.125, 0.375, 2.5, 0.05, -0.05, 1.15, 2.675, -2.675, 0.285, 1.005, 12.345]
+
+
+@pytest.fixture(scope='module')
+def validator():
+    with warnings.catch_warnings():
+        # Import hors `streamlit run`: avertissements de contexte sans objet
+        warnings.simplefilter('ignore')
+        from streamlit_app import DataValidator
+    return DataValidator
+
+
+def _pairs():
+    numerators, denominators = zip(*[(n, d) for n in SPECIAL for d in SPECIAL])
+    rng = np.random.default_rng(3)
+    counts = rng.integers(1, 5_000, 2_000).astype(float)
+    parts = np.floor(counts * rng.uniform(0, 1, len(counts)))
+    return (np.concatenate([numerators, parts]), np.concatenate([denominators, counts]))
+
+
+def test_divide_matches_scalar(validator):
+    num, den = _pairs()
+    expected = [validator.safe_divide(float(n), float(d), -1.0) for n, d in zip(num, den)]
+    np.testing.assert_array_equal(validator.safe_divide_array(num, den, -1.0), expected)
+
+
+@pytest.mark.parametrize('decimals', [0, 1, 2])
+def test_percentage_matches_scalar(validator, decimals):
+    num, den = _pairs()
+    # Parts dont le pourcentage tombe sur (ou tout près d') un demi
+    num = np.concatenate([num, np.array(HALVES) / 100, [1.0, 3.0, 5.0, 7.0]])
+    den = np.concatenate([den, np.ones(len(HALVES)), [8.0, 8.0, 8.0, 8.0]])
+    expected = [validator.safe_percentage(float(n), float(d), decimals) for n, d in zip(num, den)]
+    np.testing.assert_array_equal(validator.safe_percentage_array(num, den, decimals), expected)
+
+
+@pytest.mark.parametrize('decimals', [0, 1, 2, 3])
+def test_rounding_matches_round_exactly(validator, decimals):
+    # np.round seul se trompe sur une partie de ces valeurs: l'égalité exacte
+    # avec round() est ce qui garantit des tableaux identiques à l'ancien .apply
+    rng = np.random.default_rng(11)
+    values = np.concatenate([HALVES, SPECIAL, np.arange(-50, 50, 0.0005),
+                             np.round(rng.uniform(-100, 100, 50_000), decimals + 1)])
+    expected = [round(float(v), decimals) for v in values]
+    np.testing.assert_array_equal(validator._round_like_python(values, decimals), expected)
+    if decimals:
+        # Sans mise à l'échelle (0 décimale), np.round est déjà exact
+        assert not np.array_equal(np.round(values, decimals), expected, equal_nan=True)
+
+
+def test_series_keep_their_index(validator):
+    part = pd.Series([1.0, 2.0, 0.0], index=['a', 'b', 'c'])
+    total = pd.Series([8.0, 0.0, 5.0], index=['a', 'b', 'c'])
+    result = validator.safe_percentage_array(part, total)
+    pd.testing.assert_series_equal(result, pd.Series([12.5, 0.0, 0.0], index=part.index))
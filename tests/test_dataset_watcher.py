@@ -0,0 +1,55 @@
+"""
+🧪 SURVEILLANCE - Bascule de version pendant un rendu
+"""
+
+import pandas as pd
+import pytest
+
+from columnar_store import ingest_delta, load_or_build, snapshot_token
+from conftest import write_delta
+from dataset_watcher import DatasetWatcher
+
+
+def _watcher(csv_path, build_fn) -> DatasetWatcher:
+    watcher = DatasetWatcher(csv_path, snapshot_token,
+                             lambda path, token: load_or_build(path, build_fn))
+    watcher.refresh()
+    return watcher
+
+
+def test_render_finishes_on_previous_version(tmp_path, csv_path, raw_sample, build_fn):
+    watcher = _watcher(csv_path, build_fn)
+    old_token, old_df = watcher.current()
+    expected = old_df.copy(deep=True)
+
+    # Début du rendu: une partie des colonnes seulement est lue
+    first_half = old_df.iloc[:, :len(old_df.columns) // 2].copy()
+
+    delta = raw_sample.iloc[[0, 3]].copy()
+    delta['City'] = ['Ville Inédite A', 'Ville Inédite B']
+    delta['Satisfaction Score'] = [1, 5]
+    ingest_delta(csv_path, write_delta(tmp_path, delta), build_fn)
+    assert watcher.refresh()
+
+    # Fin du rendu sur la version déjà en main, intacte
+    pd.testing.assert_frame_equal(first_half, expected.iloc[:, :len(expected.columns) // 2])
+    pd.testing.assert_frame_equal(old_df, expected)
+    assert list(old_df['City'].cat.categories) == list(expected['City'].cat.categories)
+
+    new_token, new_df = watcher.current()
+    assert new_token != old_token
+    assert new_df['City'].iloc[3] == 'Ville Inédite B'
+
+
+def test_failed_refresh_keeps_previous_version(csv_path, build_fn):
+    watcher = _watcher(csv_path, build_fn)
+    previous = watcher.current()
+
+    with open(csv_path, 'w', encoding='utf-8') as f:
+        f.write('')
+    with pytest.raises(Exception):
+        watcher.refresh()
+
+    assert watcher.current() is previous
+    # Même fichier invalide: pas de nouvel essai
+    assert not watcher.refresh()
@@ -0,0 +1,62 @@
+"""
+🧪 NOYAUX DE REGROUPEMENT - Tables identiques au groupby pandas
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import groupby_kernels
+from groupby_kernels import benchmark, churn_stats, group_codes, group_sum
+
+
+def _reference(df, keys, first_columns=(), count_column='CustomerID') -> pd.DataFrame:
+    spec = {count_column: 'count', 'Is_Churned': 'sum', **{col: 'first' for col in first_columns}}
+    stats = df.groupby(keys, observed=True).agg(spec).reset_index()
+    stats.columns = keys + ['Total', 'Churned'] + list(first_columns)
+    return stats
+
+
+@pytest.mark.parametrize('keys, first_columns', [
+    (['Contract'], ()),
+    # Valeurs manquantes (Offer): lignes exclues comme dans le groupby
+    (['Offer'], ()),
+    (['City'], ('Latitude', 'Longitude')),
+    (['Satisfaction Score'], ()),
+    # Croisements avec une clé manquante
+    (['Contract', 'Offer'], ()),
+    (['City', 'Contract'], ()),
+])
+def test_churn_stats_match_groupby(dataset, keys, first_columns):
+    pd.testing.assert_frame_equal(churn_stats(dataset, keys, first_columns=first_columns),
+                                  _reference(dataset, keys, first_columns))
+
+
+def test_hashed_crosses_match_groupby(dataset, monkeypatch):
+    # Croisements au-delà du seuil dense (plus de combinaisons que de
+    # lignes): codes combinés factorisés, clé manquante comprise
+    monkeypatch.setattr(groupby_kernels, 'DENSE_MAX_COMBINATIONS', 0)
+    for keys in (['City', 'Contract'], ['City', 'Offer', 'Gender']):
+        pd.testing.assert_frame_equal(churn_stats(dataset, keys), _reference(dataset, keys))
+
+
+def test_count_column_counts_non_null_values(dataset):
+    stats = churn_stats(dataset, ['Contract'], count_column='Offer')
+    pd.testing.assert_frame_equal(stats, _reference(dataset, ['Contract'], count_column='Offer'))
+
+
+def test_keep_empty_categories(dataset):
+    rows = dataset[dataset['Tranche_Age'].astype(str) != str(dataset['Tranche_Age'].iloc[0])]
+    codes, (values,) = group_codes(rows, ['Tranche_Age'], keep_empty=True)
+    assert len(values) == len(dataset['Tranche_Age'].cat.categories)
+    assert np.bincount(codes, minlength=len(values)).min() == 0
+
+
+def test_group_sum_stays_exact_for_large_integers():
+    codes = np.array([0, 1, 0, -1])
+    values = np.array([2 ** 60, 5, 3, 7], dtype=np.int64)
+    np.testing.assert_array_equal(group_sum(codes, values, 2), [2 ** 60 + 3, 5])
+
+
+def test_benchmark_tables_are_identical():
+    assert benchmark(5_000)['Identique'].all()
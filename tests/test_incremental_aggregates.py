@@ -0,0 +1,92 @@
+"""
+🧪 AGRÉGATS INCRÉMENTAUX - Agrégats et cube mis à jour = recalcul complet
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from columnar_store import default_snapshot_dir, load_or_build, read_snapshot, snapshot_token
+from conftest import write_delta
+from incremental_aggregates import ingest_delta_incremental
+from olap_cube import OlapCube, cube_path, read_cube, write_cube
+from streaming_aggregates import (DIMENSIONS, RunningAggregates, aggregates_path,
+                                  read_aggregates, write_aggregates)
+
+SELECTIONS = [
+    {},
+    {'Gender': ['Female']},
+    {'Contract': ['Month-to-month'], 'Offer': ['Offer E']},
+    {'City': ['Ville Inédite']},
+]
+
+
+def _delta(raw):
+    rng = np.random.default_rng(7)
+    delta = raw.iloc[rng.choice(len(raw), 25, replace=False)].copy()
+    delta['Satisfaction Score'] = rng.integers(1, 6, len(delta))
+    delta['Customer Status'] = rng.choice(['Churned', 'Stayed', 'Joined'], len(delta))
+    delta['Monthly Charge'] = np.round(rng.uniform(20, 100, len(delta)), 2)
+    delta['Contract'] = rng.choice(raw['Contract'].dropna().unique(), len(delta))
+    delta.iloc[0, delta.columns.get_loc('City')] = 'Ville Inédite'
+    delta.iloc[1, delta.columns.get_loc('Offer')] = np.nan
+
+    new = raw.iloc[[1, 2]].copy()
+    new['CustomerID'] = ['NEW-00001', 'NEW-00002']
+    new.iloc[0, new.columns.get_loc('City')] = 'Ville Inédite'
+    return pd.concat([delta, new])
+
+
+def _assert_same(aggregates, cube, df):
+    expected = RunningAggregates.from_frame(df)
+    assert aggregates.rows == expected.rows == len(df)
+    for name in DIMENSIONS:
+        assert aggregates.table(name).equals(expected.table(name)), name
+
+    fresh = OlapCube(df)
+    for selection in SELECTIONS:
+        got, ref = cube.rollup(selection), fresh.rollup(selection)
+        assert got.rows == ref.rows
+        for name in fresh.dimensions:
+            assert got.table(name).equals(ref.table(name)), (selection, name)
+
+
+def test_ingest_matches_full_rebuild(tmp_path, csv_path, raw_sample, build_fn):
+    df = load_or_build(csv_path, build_fn)
+    token = snapshot_token(csv_path)
+    write_aggregates(RunningAggregates.from_frame(df), aggregates_path(csv_path), token)
+    write_cube(OlapCube(df), cube_path(csv_path), token)
+
+    summary = ingest_delta_incremental(csv_path, write_delta(tmp_path, _delta(raw_sample)),
+                                       build_fn)
+    assert summary['refreshed'] == {'aggregates': True, 'cube': True}
+    assert summary['inserted'] == 2
+
+    new_token = snapshot_token(csv_path)
+    merged = read_snapshot(default_snapshot_dir(csv_path))
+    _assert_same(read_aggregates(aggregates_path(csv_path), new_token),
+                 read_cube(cube_path(csv_path), new_token), merged)
+    # L'ancienne version n'est plus servie
+    assert read_aggregates(aggregates_path(csv_path), token) is None
+
+
+def test_removals_match_full_rebuild(dataset):
+    gone = ((dataset['Contract'].astype(str) == 'Two year')
+            | (np.arange(len(dataset)) % 17 == 0))
+    aggregates, cube = RunningAggregates.from_frame(dataset), OlapCube(dataset)
+
+    aggregates.apply_delta(dataset[gone], None)
+    cube.apply_delta(dataset[gone], None)
+    _assert_same(aggregates, cube, dataset[~gone])
+
+
+def test_missing_aggregates_are_left_to_full_rebuild(tmp_path, csv_path, raw_sample, build_fn):
+    summary = ingest_delta_incremental(csv_path, write_delta(tmp_path, _delta(raw_sample)),
+                                       build_fn)
+    assert summary['refreshed'] == {'aggregates': False, 'cube': False}
+
+
+def test_removing_unknown_rows_is_rejected(dataset):
+    cube = OlapCube(dataset.iloc[:100])
+    with pytest.raises(ValueError):
+        cube.apply_delta(dataset.iloc[200:260], None)
@@ -0,0 +1,67 @@
+"""
+🧪 BASE SQLITE - Filtres et GROUP BY poussés en SQL identiques à pandas
+"""
+
+import pandas as pd
+import pytest
+
+from data_schema import ALL_VALUES
+from sqlite_store import SqliteSource, compile_where, load_or_build_database, read_token
+
+
+@pytest.fixture
+def database(csv_path, dataset) -> str:
+    return load_or_build_database(csv_path, 'jeton-test', lambda: dataset)
+
+
+def _filtered(df, selection) -> pd.DataFrame:
+    for column, values in selection.items():
+        if values and ALL_VALUES not in values:
+            df = df[df[column].astype(str).isin(values)]
+    return df
+
+
+def _reference(df, keys, first_columns=()) -> pd.DataFrame:
+    spec = {'CustomerID': 'count', 'Is_Churned': 'sum', **{col: 'first' for col in first_columns}}
+    stats = df.groupby(keys, observed=True).agg(spec).reset_index()
+    stats.columns = keys + ['Total', 'Churned'] + list(first_columns)
+    return stats
+
+
+@pytest.mark.parametrize('selection', [
+    {},
+    {'Contract': ['Month-to-month']},
+    {'Gender': ['Female'], 'Offer': ['Offer B', 'Offer E'], 'City': [ALL_VALUES]},
+])
+def test_pushdown_matches_pandas(database, dataset, selection):
+    source = SqliteSource(database, selection)
+    expected_rows = _filtered(dataset, selection)
+    assert len(expected_rows)
+
+    for keys in (['Contract'], ['Offer'], ['Contract', 'Internet Service']):
+        stats = source.churn_stats(keys, 'CustomerID', 'Is_Churned', 1, like=dataset)
+        pd.testing.assert_frame_equal(stats, _reference(expected_rows, keys), check_dtype=False)
+
+    coords = ['Latitude', 'Longitude']
+    stats = source.churn_stats(['City'], 'CustomerID', 'Is_Churned', 1,
+                               first_columns=coords, like=dataset)
+    pd.testing.assert_frame_equal(stats, _reference(expected_rows, ['City'], coords),
+                                  check_dtype=False)
+
+
+def test_compile_where_ignores_inactive_filters():
+    where, params = compile_where({'Contract': [ALL_VALUES], 'City': [],
+                                   'Gender': ['Male'], 'Inconnue': ['x']},
+                                  columns=['Contract', 'City', 'Gender'])
+    assert where == '"Gender" IN (?)'
+    assert params == ['Male']
+
+
+def test_database_rebuilt_when_token_changes(csv_path, dataset, database):
+    assert read_token(database) == 'jeton-test'
+    calls = []
+    load_or_build_database(csv_path, 'jeton-test', lambda: calls.append(1) or dataset)
+    assert not calls
+
+    load_or_build_database(csv_path, 'jeton-suivant', lambda: dataset)
+    assert read_token(database) == 'jeton-suivant'